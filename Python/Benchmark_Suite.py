@@ -0,0 +1,638 @@
+"""
+Pipeline Benchmark Suite
+========================
+
+Synthetic data generation and scaling benchmarks for the football data tools.
+
+Author: Nazar Petrashchuk
+Created for: Football Analytics Portfolio Project
+
+Purpose:
+The shipped data covers six EPL seasons (about 2,300 matches), far too little to
+see how the pipeline scales. This suite generates seeded leagues in the real
+football-data.co.uk odds and Understat per-game schemas, runs the merger, the
+missing data finder and the match finder on them, and times every stage at
+increasing sizes.
+
+Features:
+- Seeded generator with controllable league count, seasons, team-name noise,
+  date drift and missing rates
+- Odds files in the real per-season layouts (2-digit years, 2019+ column names)
+- Per-stage timings, row counts and optional peak memory for all three tools
+- Scaling exponents between sizes to expose super-linear stages
+"""
+
+import pandas as pd
+import numpy as np
+import os
+import contextlib
+import math
+import tempfile
+from typing import Dict, List, Optional
+
+from Data_Merger import FootballDataMerger
+from Found_Missing_Mathes import UnderstatMatchFinder
+from Missing_Matches import UnderstatDataFinder
+from Pipeline_Metrics import PipelineMetrics
+
+
+class SyntheticLeagueGenerator:
+    """
+    Generates reproducible odds and Understat files for benchmarking.
+
+    Every competition is a double round robin of teams_per_league teams, one
+    round per week from early August. The same seed always produces the same
+    files. Understat rows are derived from the odds fixtures and then degraded:
+    some teams get a different Understat name, some matches are moved by a day
+    or two, and some are left out entirely.
+    """
+
+    PLACES = [
+        'Ashford', 'Barnsdale', 'Bramley', 'Carlton', 'Dunmore', 'Eastwick', 'Fairford',
+        'Glenfield', 'Hartley', 'Ilford', 'Kingsbury', 'Langdon', 'Marston', 'Newbury',
+        'Oakham', 'Penrith', 'Redcliffe', 'Selby', 'Thornbury', 'Upton', 'Wexford',
+        'Whitby', 'Yarmouth', 'Alston', 'Bexley', 'Crawley', 'Denton', 'Elmsworth',
+        'Farnham', 'Grantham', 'Hexham', 'Kendal', 'Ludlow', 'Malton', 'Norton',
+        'Otley', 'Pickering', 'Ripon', 'Stamford', 'Tadcaster'
+    ]
+    PREFIXES = ['', 'North ', 'South ', 'East ', 'West ', 'Upper ', 'Lower ', 'Old ', 'New ']
+
+    # Suffixes Understat adds to noisy team names (the finder normalizes these away)
+    NAME_SUFFIXES = ['City', 'United', 'Town', 'FC']
+
+    # Understat date drift in days and its distribution (±2 exceeds the default tolerance)
+    DRIFT_DAYS = np.array([-2, -1, 1, 2])
+    DRIFT_WEIGHTS = np.array([0.1, 0.4, 0.4, 0.1])
+
+    def __init__(self, seed: int = 42, leagues: int = 1, seasons: int = 6, teams_per_league: int = 20,
+                 name_noise: float = 0.1, date_drift: float = 0.1, missing_rate: float = 0.05,
+                 first_season: int = 2014, league_names: Optional[List[str]] = None):
+        """
+        Initialize the generator.
+
+        Args:
+            seed: Random seed; equal settings and seeds give identical files
+            leagues: Number of competitions, each with its own teams
+            seasons: Number of consecutive seasons per competition
+            teams_per_league: Even number of teams per competition (4-24)
+            name_noise: Share of teams whose Understat name carries a suffix
+            date_drift: Share of Understat matches moved by 1-2 days
+            missing_rate: Share of matches left out of the Understat file
+            first_season: Start year of the first season
+            league_names: Understat league names assigned to competitions in turn;
+                defaults to ['EPL'] so every competition feeds the EPL merger
+        """
+        if leagues < 1:
+            raise ValueError(f"leagues must be at least 1, got {leagues}")
+        if teams_per_league % 2 or not 4 <= teams_per_league <= 24:
+            raise ValueError(f"teams_per_league must be even and between 4 and 24, got {teams_per_league}")
+        if seasons < 1 or first_season + seasons > 2030:
+            # The merger treats dates after 2030 as 2-digit years parsed into the wrong century
+            raise ValueError(f"seasons must be at least 1 and end before 2030, got {seasons} from {first_season}")
+        for name, rate in (('name_noise', name_noise), ('date_drift', date_drift), ('missing_rate', missing_rate)):
+            if not 0.0 <= rate <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1, got {rate}")
+
+        self.league_names = league_names or ['EPL']
+        unknown = [league for league in self.league_names if league not in FootballDataMerger.LEAGUE_DIVISIONS]
+        if unknown:
+            raise ValueError(f"No division code known for leagues: {unknown}")
+
+        self.seed = seed
+        self.leagues = leagues
+        self.seasons = seasons
+        self.teams_per_league = teams_per_league
+        self.name_noise = name_noise
+        self.date_drift = date_drift
+        self.missing_rate = missing_rate
+        self.first_season = first_season
+
+    @classmethod
+    def for_match_count(cls, matches: int, seasons: int = 6, teams_per_league: int = 20,
+                        **settings) -> 'SyntheticLeagueGenerator':
+        """
+        Create a generator sized to produce at least the given number of matches.
+
+        Args:
+            matches: Target number of matches
+            seasons: Number of seasons per competition
+            teams_per_league: Teams per competition
+            **settings: Other generator settings (seed, noise and rates)
+
+        Returns:
+            Generator with enough competitions to reach the target
+        """
+        matches_per_league = seasons * teams_per_league * (teams_per_league - 1)
+        leagues = max(1, math.ceil(matches / matches_per_league))
+        return cls(leagues=leagues, seasons=seasons, teams_per_league=teams_per_league, **settings)
+
+    @property
+    def match_count(self) -> int:
+        """Number of matches in the generated odds files."""
+        return self.leagues * self.seasons * self.teams_per_league * (self.teams_per_league - 1)
+
+    def team_names(self) -> List[str]:
+        """
+        Build unique odds team names for all competitions.
+
+        Returns:
+            leagues * teams_per_league names; competition c owns the slice
+            [c * teams_per_league, (c + 1) * teams_per_league)
+        """
+        names = []
+        variants = len(self.PLACES) * len(self.PREFIXES)
+
+        for team in range(self.leagues * self.teams_per_league):
+            place = self.PLACES[team % len(self.PLACES)]
+            prefix = self.PREFIXES[(team // len(self.PLACES)) % len(self.PREFIXES)]
+            name = f"{prefix}{place}"
+            if team >= variants:
+                name += f" {team // variants + 1}"
+            names.append(name)
+
+        return names
+
+    def _round_robin(self) -> np.ndarray:
+        """
+        Build a double round robin schedule with the circle method.
+
+        Returns:
+            Array of shape (rounds, matches per round, 2) with home/away team positions
+        """
+        teams = self.teams_per_league
+        rotation = list(range(teams))
+        first_half = []
+
+        for _ in range(teams - 1):
+            pairs = [(rotation[i], rotation[teams - 1 - i]) for i in range(teams // 2)]
+            first_half.append(pairs)
+            # Keep the first team fixed and rotate the others
+            rotation = [rotation[0]] + [rotation[-1]] + rotation[1:-1]
+
+        # Alternate home advantage between rounds, then mirror for the second half
+        first_half = [[(a, b) if round_number % 2 == 0 else (b, a) for a, b in pairs]
+                      for round_number, pairs in enumerate(first_half)]
+        second_half = [[(b, a) for a, b in pairs] for pairs in first_half]
+
+        return np.array(first_half + second_half)
+
+    def _generate_fixtures(self, rng: np.random.Generator) -> pd.DataFrame:
+        """
+        Generate all fixtures with results and match statistics.
+
+        Args:
+            rng: Random generator
+
+        Returns:
+            One row per match with dates, team positions and full-time statistics
+        """
+        schedule = self._round_robin()
+        rounds, per_round, _ = schedule.shape
+        teams = self.teams_per_league
+
+        frames = []
+        for season_offset in range(self.seasons):
+            year = self.first_season + season_offset
+            season_start = pd.Timestamp(year=year, month=8, day=8)
+
+            # Broadcast one schedule over every competition of the season
+            league_index = np.repeat(np.arange(self.leagues), rounds * per_round)
+            round_index = np.tile(np.repeat(np.arange(rounds), per_round), self.leagues)
+            pairs = np.tile(schedule.reshape(-1, 2), (self.leagues, 1))
+
+            # Rounds are a week apart; matches spread over Saturday to Monday
+            day_offsets = round_index * 7 + rng.integers(0, 3, size=len(round_index))
+
+            frames.append(pd.DataFrame({
+                'year': year,
+                'league_index': league_index,
+                'date': season_start + pd.to_timedelta(day_offsets, unit='D'),
+                'home': league_index * teams + pairs[:, 0],
+                'away': league_index * teams + pairs[:, 1]
+            }))
+
+        fixtures = pd.concat(frames, ignore_index=True)
+        size = len(fixtures)
+
+        fixtures['FTHG'] = rng.poisson(1.55, size)
+        fixtures['FTAG'] = rng.poisson(1.2, size)
+        fixtures['HTHG'] = rng.binomial(fixtures['FTHG'], 0.45)
+        fixtures['HTAG'] = rng.binomial(fixtures['FTAG'], 0.45)
+        fixtures['HS'] = rng.integers(4, 25, size)
+        fixtures['AS'] = rng.integers(3, 21, size)
+        fixtures['HST'] = rng.binomial(fixtures['HS'], 0.35)
+        fixtures['AST'] = rng.binomial(fixtures['AS'], 0.35)
+        fixtures['home_xG'] = np.round(rng.gamma(2.6, 0.58, size), 6)
+        fixtures['away_xG'] = np.round(rng.gamma(2.2, 0.56, size), 6)
+        fixtures['home_xpts'] = np.round(rng.uniform(0.0, 3.0, size), 4)
+        fixtures['away_xpts'] = np.round(rng.uniform(0.0, 3.0, size), 4)
+
+        return fixtures
+
+    @staticmethod
+    def _results(home_goals: pd.Series, away_goals: pd.Series) -> np.ndarray:
+        """Full-time result letters (H/D/A) from the goals."""
+        return np.select([home_goals > away_goals, home_goals < away_goals], ['H', 'A'], 'D')
+
+    def _odds_frame(self, season_fixtures: pd.DataFrame, names: np.ndarray,
+                    rng: np.random.Generator) -> pd.DataFrame:
+        """
+        Build one season's odds file in the football-data.co.uk layout of that season.
+
+        Args:
+            season_fixtures: Fixtures of a single season, sorted by date
+            names: Odds team names by team position
+            rng: Random generator
+
+        Returns:
+            DataFrame with the season's columns in file order
+        """
+        year = int(season_fixtures['year'].iloc[0])
+        size = len(season_fixtures)
+        divisions = np.array([FootballDataMerger.LEAGUE_DIVISIONS[self.league_names[league % len(self.league_names)]]
+                              for league in range(self.leagues)])
+
+        # Real files alternate 2-digit and 4-digit years before 2017
+        date_format = '%d/%m/%y' if year < 2017 and year % 2 == 0 else '%d/%m/%Y'
+
+        odds = pd.DataFrame({'Div': divisions[season_fixtures['league_index'].to_numpy()],
+                             'Date': season_fixtures['date'].dt.strftime(date_format)})
+        if year >= 2019:
+            odds['Time'] = np.where(rng.random(size) < 0.5, '15:00', '17:30')
+
+        odds['HomeTeam'] = names[season_fixtures['home'].to_numpy()]
+        odds['AwayTeam'] = names[season_fixtures['away'].to_numpy()]
+        for column in ('FTHG', 'FTAG'):
+            odds[column] = season_fixtures[column].to_numpy()
+        odds['FTR'] = self._results(season_fixtures['FTHG'], season_fixtures['FTAG'])
+        for column in ('HTHG', 'HTAG'):
+            odds[column] = season_fixtures[column].to_numpy()
+        odds['HTR'] = self._results(season_fixtures['HTHG'], season_fixtures['HTAG'])
+        odds['Referee'] = 'A Referee'
+        for column in ('HS', 'AS', 'HST', 'AST'):
+            odds[column] = season_fixtures[column].to_numpy()
+
+        # Bookmaker odds around a fair 1X2 book with a small margin
+        home_probability = rng.uniform(0.15, 0.75, size)
+        draw_probability = rng.uniform(0.18, 0.3, size)
+        away_probability = np.clip(1.0 - home_probability - draw_probability, 0.05, None)
+        over_probability = rng.uniform(0.35, 0.7, size)
+
+        average_prefix, over_under = ('Avg', ('Avg>2.5', 'Avg<2.5')) if year >= 2019 else ('BbAv', ('BbAv>2.5', 'BbAv<2.5'))
+        for prefix, margin in (('B365', 1.05), (average_prefix, 1.06)):
+            odds[f'{prefix}H'] = np.round(1.0 / (home_probability * margin), 2)
+            odds[f'{prefix}D'] = np.round(1.0 / (draw_probability * margin), 2)
+            odds[f'{prefix}A'] = np.round(1.0 / (away_probability * margin), 2)
+        odds[over_under[0]] = np.round(1.0 / (over_probability * 1.06), 2)
+        odds[over_under[1]] = np.round(1.0 / ((1.0 - over_probability) * 1.06), 2)
+
+        return odds
+
+    def _understat_frame(self, fixtures: pd.DataFrame, understat_names: np.ndarray,
+                         rng: np.random.Generator) -> pd.DataFrame:
+        """
+        Build the Understat per-game file: one row per team and match.
+
+        Args:
+            fixtures: All fixtures
+            understat_names: Understat team names by team position
+            rng: Random generator
+
+        Returns:
+            DataFrame in the Understat per-game column layout
+        """
+        kept = fixtures[rng.random(len(fixtures)) >= self.missing_rate].reset_index(drop=True)
+
+        drifted = rng.random(len(kept)) < self.date_drift
+        drift = np.where(drifted, rng.choice(self.DRIFT_DAYS, size=len(kept), p=self.DRIFT_WEIGHTS), 0)
+        match_dates = kept['date'] + pd.to_timedelta(drift, unit='D')
+
+        league_names = np.array([self.league_names[league % len(self.league_names)] for league in range(self.leagues)])
+
+        sides = []
+        for side, own, other in (('h', 'home', 'away'), ('a', 'away', 'home')):
+            scored = kept['FTHG' if side == 'h' else 'FTAG'].to_numpy()
+            missed = kept['FTAG' if side == 'h' else 'FTHG'].to_numpy()
+            xg = kept[f'{own}_xG'].to_numpy()
+            xga = kept[f'{other}_xG'].to_numpy()
+            wins = (scored > missed).astype(int)
+            draws = (scored == missed).astype(int)
+
+            sides.append(pd.DataFrame({
+                'match': np.arange(len(kept)),
+                'league': league_names[kept['league_index'].to_numpy()],
+                'year': kept['year'].to_numpy(),
+                'h_a': side,
+                'xG': xg,
+                'xGA': xga,
+                'npxG': np.round(xg * 0.92, 6),
+                'npxGA': np.round(xga * 0.92, 6),
+                'ppda_coef': np.round(rng.uniform(5.0, 20.0, len(kept)), 4),
+                'ppda_att': rng.integers(150, 400, len(kept)),
+                'ppda_def': rng.integers(10, 40, len(kept)),
+                'oppda_coef': np.round(rng.uniform(5.0, 20.0, len(kept)), 4),
+                'oppda_att': rng.integers(150, 400, len(kept)),
+                'oppda_def': rng.integers(10, 40, len(kept)),
+                'deep': rng.integers(0, 20, len(kept)),
+                'deep_allowed': rng.integers(0, 20, len(kept)),
+                'scored': scored,
+                'missed': missed,
+                'xpts': kept[f'{own}_xpts'].to_numpy(),
+                'result': np.select([wins == 1, draws == 1], ['w', 'd'], 'l'),
+                'date': match_dates.dt.strftime('%Y-%m-%d %H:%M:%S'),
+                'wins': wins,
+                'draws': draws,
+                'loses': 1 - wins - draws,
+                'pts': wins * 3 + draws,
+                'npxGD': np.round((xg - xga) * 0.92, 6),
+                'team': understat_names[kept[own].to_numpy()],
+                'xG_diff': np.round(xg - scored, 6),
+                'xGA_diff': np.round(xga - missed, 6),
+                'xpts_diff': np.round(kept[f'{own}_xpts'].to_numpy() - (wins * 3 + draws), 4)
+            }))
+
+        # Home row first, then away row, match by match
+        understat = pd.concat(sides, ignore_index=True).sort_values(['match', 'h_a'], ascending=[True, False],
+                                                                    kind='stable')
+        return understat.drop(columns='match').reset_index(drop=True)
+
+    def team_aliases(self) -> Dict[str, str]:
+        """
+        Understat-to-odds names of the noisy teams, in the team_mapping layout.
+
+        Returns:
+            Dictionary mapping Understat team names to odds team names
+        """
+        rng = np.random.default_rng([self.seed, 1])
+        names = self.team_names()
+        noisy = rng.random(len(names)) < self.name_noise
+        suffixes = rng.integers(0, len(self.NAME_SUFFIXES), len(names))
+
+        return {f"{name} {self.NAME_SUFFIXES[suffix]}": name
+                for name, is_noisy, suffix in zip(names, noisy, suffixes) if is_noisy}
+
+    def generate(self, output_folder: str) -> Dict[str, str]:
+        """
+        Write the odds folder and the Understat per-game file.
+
+        Args:
+            output_folder: Destination folder (created if needed)
+
+        Returns:
+            Dictionary with 'odds_folder' and 'understat_file' paths
+        """
+        rng = np.random.default_rng(self.seed)
+        odds_folder = os.path.join(output_folder, 'odds')
+        understat_file = os.path.join(output_folder, 'understat_per_game.csv')
+        os.makedirs(odds_folder, exist_ok=True)
+
+        names = np.array(self.team_names())
+        understat_names = names.copy()
+        odds_by_alias = self.team_aliases()
+        alias_by_odds = {odds_name: alias for alias, odds_name in odds_by_alias.items()}
+        for position, name in enumerate(names):
+            understat_names[position] = alias_by_odds.get(name, name)
+        understat_names = understat_names.astype(object)
+
+        fixtures = self._generate_fixtures(rng)
+        fixtures = fixtures.sort_values(['year', 'date', 'league_index'], kind='stable').reset_index(drop=True)
+
+        for year, season_fixtures in fixtures.groupby('year', sort=True):
+            season_name = f"{year % 100:02d}-{(year + 1) % 100:02d}"
+            odds = self._odds_frame(season_fixtures, names, rng)
+            odds.to_csv(os.path.join(odds_folder, f"{season_name}.csv"), index=False)
+
+        self._understat_frame(fixtures, understat_names, rng).to_csv(understat_file, index=False)
+
+        return {'odds_folder': odds_folder, 'understat_file': understat_file}
+
+
+class PipelineBenchmark:
+    """
+    Times every stage of the three tools on synthetic data of increasing size.
+
+    For each size, the generator writes a fresh dataset. The merger builds the
+    integrated dataset, the missing data finder builds the collection
+    template, and the match finder searches Understat for the template rows.
+    Tool output is silenced so that only the timings are reported.
+    """
+
+    def __init__(self, work_folder: str, seed: int = 42, finder_rows: Optional[int] = 200,
+                 track_memory: bool = False, **generator_settings):
+        """
+        Initialize the benchmark.
+
+        Args:
+            work_folder: Folder for generated data and tool output
+            seed: Generator seed shared by all sizes
+            finder_rows: Template rows searched by the match finder (None searches
+                all; its per-row cost grows with the Understat size, so full
+                searches at a million matches take hours)
+            track_memory: Record peak traced memory per stage (slower)
+            **generator_settings: Extra SyntheticLeagueGenerator settings
+        """
+        if finder_rows is not None and finder_rows < 1:
+            raise ValueError(f"finder_rows must be at least 1, got {finder_rows}")
+
+        self.work_folder = work_folder
+        self.seed = seed
+        self.finder_rows = finder_rows
+        self.track_memory = track_memory
+        self.generator_settings = generator_settings
+        self.results = pd.DataFrame()
+
+    def output_folder(self, matches: int) -> str:
+        """
+        Folder holding the tool outputs of one benchmarked size.
+
+        Args:
+            matches: Target number of matches passed to run_size()
+
+        Returns:
+            Path with the integrated dataset, the collection template and the found matches
+        """
+        return os.path.join(self.work_folder, f"matches_{matches}", 'output')
+
+    @staticmethod
+    def _top_level(metrics: PipelineMetrics, tool: str) -> List[Dict]:
+        """Top-level stage records of a tool run, tagged with the tool name."""
+        return [{'tool': tool, **record} for record in metrics.records if record['parent'] is None]
+
+    def _run_missing_finder(self, integrated_file: str, output_folder: str) -> PipelineMetrics:
+        """
+        Run the missing data finder step by step inside metric stages.
+
+        Args:
+            integrated_file: Integrated dataset written by the merger
+            output_folder: Folder for the collection template
+
+        Returns:
+            Metrics of the run
+        """
+        finder = UnderstatDataFinder()
+        metrics = PipelineMetrics(self.track_memory)
+        metrics.start_memory_tracking()
+
+        try:
+            with metrics.stage('load_integrated_dataset') as stage:
+                integrated_data = finder.load_integrated_dataset(integrated_file)
+                stage['rows_out'] = len(integrated_data)
+            with metrics.stage('find_missing_xg_matches', rows_in=len(integrated_data)) as stage:
+                missing_matches = finder.find_missing_xg_matches(integrated_data)
+                stage['rows_out'] = len(missing_matches)
+            with metrics.stage('create_manual_collection_template', rows_in=len(missing_matches)):
+                template_path = os.path.join(output_folder, 'understat_manual_collection_template.csv')
+                finder.create_manual_collection_template(missing_matches, template_path)
+            with metrics.stage('generate_summary_report', rows_in=len(integrated_data)):
+                finder.generate_summary_report(integrated_data, missing_matches)
+        finally:
+            metrics.stop_memory_tracking()
+
+        return metrics
+
+    def run_size(self, matches: int) -> pd.DataFrame:
+        """
+        Generate one dataset size and benchmark all tools on it.
+
+        Args:
+            matches: Target number of matches
+
+        Returns:
+            One row per top-level stage of every tool
+        """
+        generator = SyntheticLeagueGenerator.for_match_count(matches, seed=self.seed, **self.generator_settings)
+        size_folder = os.path.join(self.work_folder, f"matches_{matches}")
+        output_folder = self.output_folder(matches)
+        os.makedirs(output_folder, exist_ok=True)
+
+        print(f"\nBenchmarking {generator.match_count:,} matches "
+              f"({generator.leagues} competitions x {generator.seasons} seasons)...")
+
+        with self._silenced():
+            paths = generator.generate(size_folder)
+
+        records = []
+        integrated_file = os.path.join(output_folder, 'integrated_football_analytics_dataset.csv')
+
+        merger = FootballDataMerger(track_memory=self.track_memory)
+        # The generator's noisy names play the role of the real Understat spellings
+        merger.team_index.add_aliases(generator.team_aliases())
+        with self._silenced():
+            merger.merge_all_data(paths['odds_folder'], paths['understat_file'], integrated_file)
+        records += self._top_level(merger.stage_metrics, 'FootballDataMerger')
+
+        with self._silenced():
+            missing_metrics = self._run_missing_finder(integrated_file, output_folder)
+        records += self._top_level(missing_metrics, 'UnderstatDataFinder')
+
+        template_path = os.path.join(output_folder, 'understat_manual_collection_template.csv')
+        if self.finder_rows is not None:
+            template = pd.read_csv(template_path)
+            template.head(self.finder_rows).to_csv(template_path, index=False)
+
+        match_finder = UnderstatMatchFinder(track_memory=self.track_memory)
+        with self._silenced():
+            match_finder.run_match_search(template_path, paths['understat_file'], output_folder)
+        records += self._top_level(match_finder.stage_metrics, 'UnderstatMatchFinder')
+
+        size_results = pd.DataFrame(records)
+        size_results.insert(0, 'matches', generator.match_count)
+
+        for _, record in size_results.iterrows():
+            print(f"   {record['tool']}.{record['stage']}: {record['duration_s']:.3f}s")
+
+        return size_results
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _silenced():
+        """Discard the tools' progress output."""
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            yield
+
+    def run(self, sizes: List[int]) -> pd.DataFrame:
+        """
+        Benchmark every size and report how each stage scales.
+
+        Args:
+            sizes: Target match counts, e.g. [10_000, 100_000, 1_000_000]
+
+        Returns:
+            DataFrame of all stage records (also kept in self.results)
+        """
+        print("Starting pipeline benchmarks...")
+        print("="*60)
+
+        self.results = pd.concat([self.run_size(matches) for matches in sorted(sizes)], ignore_index=True)
+        self.generate_scaling_report()
+
+        return self.results
+
+    def scaling_table(self) -> pd.DataFrame:
+        """
+        Summarize stage durations by size with their scaling exponents.
+
+        The exponent k between two sizes solves t2 / t1 = (n2 / n1) ** k, so
+        about 1 means linear scaling and about 2 means quadratic scaling.
+
+        Returns:
+            One row per tool stage with a duration column per size and the
+            exponent between the two largest sizes
+        """
+        durations = self.results.pivot_table(index=['tool', 'stage'], columns='matches',
+                                             values='duration_s', aggfunc='sum', sort=False)
+
+        if durations.shape[1] >= 2:
+            small, large = durations.columns[-2], durations.columns[-1]
+            ratio = durations[large] / durations[small].where(durations[small] > 0)
+            durations['scaling_exponent'] = np.log(ratio) / math.log(large / small)
+
+        return durations
+
+    def generate_scaling_report(self) -> None:
+        """Print stage durations per size and flag super-linear stages."""
+        print("\n" + "="*60)
+        print("PIPELINE SCALING REPORT")
+        print("="*60)
+
+        table = self.scaling_table()
+        sizes = [column for column in table.columns if column != 'scaling_exponent']
+
+        print(f"\nStage duration (s) by match count:")
+        print("   " + f"{'stage':<55}" + "".join(f"{size:>12,}" for size in sizes) + "   exponent")
+
+        for (tool, stage), row in table.iterrows():
+            durations = "".join(f"{row[size]:>12.3f}" for size in sizes)
+            exponent = row.get('scaling_exponent', np.nan)
+            flag = "  <- super-linear" if exponent > 1.3 else ""
+            exponent_text = "" if pd.isna(exponent) else f"{exponent:>8.2f}"
+            print(f"   {tool + '.' + stage:<55}{durations}   {exponent_text}{flag}")
+
+
+def main():
+    """
+    Main execution function for the scaling benchmarks.
+    """
+    # Configuration
+    config = {
+        'work_folder': os.path.join(tempfile.gettempdir(), 'football_pipeline_benchmarks'),
+        'results_file': os.path.join(tempfile.gettempdir(), 'football_pipeline_benchmarks', 'benchmark_results.csv'),
+        'sizes': [10_000, 100_000, 1_000_000],
+        'seed': 42,
+        'finder_rows': 200
+    }
+
+    benchmark = PipelineBenchmark(config['work_folder'], seed=config['seed'], finder_rows=config['finder_rows'])
+
+    try:
+        results = benchmark.run(config['sizes'])
+        results.to_csv(config['results_file'], index=False)
+        print(f"\nBenchmark results saved to: {config['results_file']}")
+
+    except Exception as e:
+        print(f"\nBenchmark failed: {str(e)}")
+        return None
+
+
+if __name__ == "__main__":
+    main()
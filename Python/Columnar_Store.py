@@ -0,0 +1,382 @@
+"""
+Columnar Store
+==============
+
+A small dependency-free columnar storage layer for pandas DataFrames, used to
+cache parsed inputs and to persist typed datasets between pipeline runs.
+
+Author: Nazar Petrashchuk
+Created for: Football Analytics Portfolio Project
+
+Each DataFrame is stored as a folder holding one NumPy .npy file per column
+plus a schema.json describing names and dtypes. Plain .npy files load almost
+instantly, keep real datetime/category/integer types, and can be memory-mapped.
+
+Features:
+- Round-trips numeric, nullable integer, string, categorical and datetime columns
+- Optional memory-mapped column access
+- Content-addressed cache with size-bounded eviction
+"""
+
+import pandas as pd
+import numpy as np
+import os
+import json
+import shutil
+import uuid
+from typing import Dict, List, Optional
+
+
+class ColumnarStore:
+    """
+    Reads and writes DataFrames as a folder of per-column NumPy arrays.
+
+    Column files are named by position, so column names that are not valid
+    file names (such as '>2.5') are stored safely in the schema instead.
+    """
+
+    SCHEMA_FILE = 'schema.json'
+    FORMAT_VERSION = 1
+
+    @staticmethod
+    def _column_file(folder: str, position: int, part: str) -> str:
+        """Build the path of one stored array of a column."""
+        return os.path.join(folder, f"col_{position:04d}_{part}.npy")
+
+    @classmethod
+    def _encode_column(cls, series: pd.Series) -> Dict[str, np.ndarray]:
+        """
+        Split a column into plain NumPy arrays that np.save can write.
+
+        Args:
+            series: Column to encode
+
+        Returns:
+            Dictionary with the 'kind' of encoding and its arrays
+        """
+        dtype = series.dtype
+
+        if isinstance(dtype, pd.CategoricalDtype):
+            categories = cls._encode_column(pd.Series(dtype.categories))
+            return {
+                'kind': 'category',
+                'codes': series.cat.codes.to_numpy(),
+                'categories': categories
+            }
+
+        if isinstance(dtype, pd.DatetimeTZDtype):
+            raise TypeError(f"Timezone-aware column '{series.name}' is not supported")
+
+        if pd.api.types.is_string_dtype(dtype) or dtype == object:
+            mask = series.isna().to_numpy()
+            values = series.to_numpy(dtype=object, na_value='')
+            if not all(isinstance(value, str) for value in values):
+                raise TypeError(f"Column '{series.name}' holds non-string objects")
+            return {'kind': 'string', 'values': values.astype(str), 'mask': mask}
+
+        if isinstance(dtype, pd.api.extensions.ExtensionDtype):
+            # Nullable integer/boolean/float columns
+            mask = series.isna().to_numpy()
+            values = series.to_numpy(dtype=dtype.numpy_dtype, na_value=0)
+            return {'kind': 'masked', 'values': values, 'mask': mask}
+
+        return {'kind': 'numpy', 'values': series.to_numpy()}
+
+    @classmethod
+    def _decode_column(cls, encoded: Dict, dtype_name: str, name: str) -> pd.Series:
+        """Rebuild a column from its stored arrays and dtype name."""
+        kind = encoded['kind']
+
+        if kind == 'category':
+            categories = cls._decode_column(encoded['categories'], encoded['categories_dtype'], None)
+            values = pd.Categorical.from_codes(np.asarray(encoded['codes']), categories=pd.Index(categories),
+                                               ordered=encoded.get('ordered', False))
+            return pd.Series(values, name=name)
+
+        if kind == 'string':
+            values = np.asarray(encoded['values']).astype(object)
+            values[np.asarray(encoded['mask'])] = np.nan
+            return pd.Series(values, name=name, dtype=dtype_name)
+
+        if kind == 'masked':
+            values = pd.array(np.asarray(encoded['values']), dtype=dtype_name)
+            values[np.asarray(encoded['mask'])] = pd.NA
+            return pd.Series(values, name=name)
+
+        # Plain NumPy column: wrap without copying so memory maps stay shared
+        return pd.Series(encoded['values'], name=name, copy=False)
+
+    @classmethod
+    def write(cls, df: pd.DataFrame, folder: str) -> None:
+        """
+        Write a DataFrame to a columnar store folder.
+
+        Args:
+            df: DataFrame to store
+            folder: Destination folder (created if needed, existing columns replaced)
+
+        Raises:
+            TypeError: If a column type cannot be stored
+        """
+        os.makedirs(folder, exist_ok=True)
+
+        frame = df
+        has_index = not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1
+        if has_index:
+            frame = df.reset_index(names='__index__')
+
+        columns = []
+        for position, name in enumerate(frame.columns):
+            series = frame.iloc[:, position]
+            encoded = cls._encode_column(series)
+            column_info = {'name': name, 'dtype': str(series.dtype), 'kind': encoded['kind']}
+
+            if encoded['kind'] == 'category':
+                categories = encoded['categories']
+                column_info['ordered'] = bool(series.dtype.ordered)
+                column_info['categories_kind'] = categories['kind']
+                column_info['categories_dtype'] = str(series.dtype.categories.dtype)
+                np.save(cls._column_file(folder, position, 'codes'), encoded['codes'])
+                for part in ('values', 'mask'):
+                    if part in categories:
+                        np.save(cls._column_file(folder, position, f'categories_{part}'), categories[part])
+            else:
+                for part in ('values', 'mask'):
+                    if part in encoded:
+                        np.save(cls._column_file(folder, position, part), encoded[part])
+
+            columns.append(column_info)
+
+        schema = {
+            'format_version': cls.FORMAT_VERSION,
+            'rows': len(frame),
+            'has_index': has_index,
+            'columns': columns
+        }
+        with open(os.path.join(folder, cls.SCHEMA_FILE), 'w', encoding='utf-8') as handle:
+            json.dump(schema, handle, indent=2)
+
+    @classmethod
+    def read_schema(cls, folder: str) -> Dict:
+        """
+        Read the schema of a columnar store folder.
+
+        Args:
+            folder: Store folder
+
+        Returns:
+            Parsed schema dictionary
+
+        Raises:
+            FileNotFoundError: If the folder holds no schema
+        """
+        schema_path = os.path.join(folder, cls.SCHEMA_FILE)
+        if not os.path.exists(schema_path):
+            raise FileNotFoundError(f"Columnar store not found: {folder}")
+
+        with open(schema_path, encoding='utf-8') as handle:
+            return json.load(handle)
+
+    @classmethod
+    def read(cls, folder: str, columns: Optional[List[str]] = None,
+             mmap_mode: Optional[str] = None) -> pd.DataFrame:
+        """
+        Read a DataFrame from a columnar store folder.
+
+        Args:
+            folder: Store folder
+            columns: Optional subset of columns to load
+            mmap_mode: NumPy memory-map mode ('r' for read-only sharing), or None
+                to load arrays into memory
+
+        Returns:
+            DataFrame with the stored column types restored
+        """
+        schema = cls.read_schema(folder)
+        wanted = set(columns) if columns is not None else None
+
+        data = {}
+        index = None
+        for position, column_info in enumerate(schema['columns']):
+            name = column_info['name']
+            is_index = schema['has_index'] and name == '__index__'
+            if wanted is not None and name not in wanted and not is_index:
+                continue
+
+            series = cls._read_column(folder, position, column_info, mmap_mode)
+            if is_index:
+                index = pd.Index(series.to_numpy())
+            else:
+                data[name] = series
+
+        if columns is not None:
+            missing = [name for name in columns if name not in data]
+            if missing:
+                raise KeyError(f"Columns not found in store: {missing}")
+            data = {name: data[name] for name in columns}
+
+        frame = pd.DataFrame(data, copy=False)
+        if not data:
+            frame = pd.DataFrame(index=pd.RangeIndex(schema['rows']))
+        if index is not None:
+            frame.index = index
+
+        return frame
+
+    @classmethod
+    def read_column(cls, folder: str, name: str, mmap_mode: Optional[str] = None,
+                    schema: Optional[Dict] = None) -> pd.Series:
+        """
+        Read a single column from a columnar store folder.
+
+        Args:
+            folder: Store folder
+            name: Column name
+            mmap_mode: NumPy memory-map mode, or None to load the arrays into memory
+            schema: Schema from read_schema, to avoid re-reading it per column
+
+        Returns:
+            The column with its stored type restored
+
+        Raises:
+            KeyError: If the store has no such column
+        """
+        schema = schema if schema is not None else cls.read_schema(folder)
+
+        for position, column_info in enumerate(schema['columns']):
+            if column_info['name'] == name:
+                return cls._read_column(folder, position, column_info, mmap_mode)
+
+        raise KeyError(f"Columns not found in store: {[name]}")
+
+    @classmethod
+    def _read_column(cls, folder: str, position: int, column_info: Dict,
+                     mmap_mode: Optional[str]) -> pd.Series:
+        """Load the arrays of one column and rebuild it."""
+        def load(part: str) -> np.ndarray:
+            return np.load(cls._column_file(folder, position, part), mmap_mode=mmap_mode, allow_pickle=False)
+
+        kind = column_info['kind']
+
+        if kind == 'category':
+            categories = {'kind': column_info['categories_kind'], 'values': load('categories_values')}
+            if column_info['categories_kind'] == 'string':
+                categories['mask'] = load('categories_mask')
+            encoded = {
+                'kind': 'category',
+                'codes': load('codes'),
+                'categories': categories,
+                'categories_dtype': column_info['categories_dtype'],
+                'ordered': column_info.get('ordered', False)
+            }
+        elif kind in ('string', 'masked'):
+            encoded = {'kind': kind, 'values': load('values'), 'mask': load('mask')}
+        else:
+            encoded = {'kind': kind, 'values': load('values')}
+
+        return cls._decode_column(encoded, column_info['dtype'], column_info['name'])
+
+
+class ColumnarCache:
+    """
+    Content-addressed cache of DataFrames kept in a local folder.
+
+    Entries are ColumnarStore folders named by their key. When the cache grows
+    beyond max_bytes, the least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Folder holding cache entries (created if needed)
+            max_bytes: Size bound enforced by evict()
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_path(self, key: str) -> str:
+        """Build the folder path of a cache entry."""
+        return os.path.join(self.cache_dir, key)
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        Load a cached DataFrame.
+
+        Args:
+            key: Content-derived cache key
+
+        Returns:
+            Cached DataFrame, or None on a miss or unreadable entry
+        """
+        entry_path = self._entry_path(key)
+
+        try:
+            df = ColumnarStore.read(entry_path)
+        except (OSError, ValueError, KeyError, TypeError):
+            self.misses += 1
+            return None
+
+        # Touch the entry so eviction treats it as recently used
+        os.utime(entry_path)
+        self.hits += 1
+        return df
+
+    def put(self, key: str, df: pd.DataFrame) -> bool:
+        """
+        Store a DataFrame under a key.
+
+        The entry is written to a temporary folder and renamed into place, so
+        readers never see a partially written entry.
+
+        Args:
+            key: Content-derived cache key
+            df: DataFrame to store
+
+        Returns:
+            True if the entry was stored, False if the frame could not be cached
+        """
+        entry_path = self._entry_path(key)
+        temp_path = os.path.join(self.cache_dir, f".tmp_{key}_{uuid.uuid4().hex}")
+
+        try:
+            ColumnarStore.write(df, temp_path)
+            os.replace(temp_path, entry_path)
+            return True
+        except (OSError, TypeError):
+            # Unsupported column types or a concurrent writer: skip caching
+            shutil.rmtree(temp_path, ignore_errors=True)
+            return False
+
+    @staticmethod
+    def _folder_size(folder: str) -> int:
+        """Total size in bytes of the files directly inside a folder."""
+        return sum(entry.stat().st_size for entry in os.scandir(folder) if entry.is_file())
+
+    def evict(self) -> int:
+        """
+        Remove least recently used entries until the cache fits max_bytes.
+
+        Returns:
+            Number of entries removed
+        """
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_dir() and not entry.name.startswith('.tmp_'):
+                entries.append((entry.stat().st_mtime, self._folder_size(entry.path), entry.path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        removed = 0
+
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total_bytes -= size
+            removed += 1
+
+        return removed
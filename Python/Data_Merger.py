@@ -21,11 +21,24 @@ Features:
 """
 
 import pandas as pd
+import numpy as np
 import os
+import shutil
+import uuid
 from datetime import datetime
 import glob
+import hashlib
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple, Optional
 
+from Columnar_Store import ColumnarCache, ColumnarStore
+from Integrated_Dataset import IntegratedDataset
+from Integration_Report import IntegrationReport, ReportAccumulator
+from Pipeline_Metrics import PipelineMetrics
+from Team_Resolver import TeamNameIndex
+
 class FootballDataMerger:
     """
     A robust data integration tool for combining football betting odds with advanced statistics.
@@ -34,64 +47,389 @@ class FootballDataMerger:
     with built-in error handling, data validation, and comprehensive reporting.
     """
     
-    def __init__(self):
-        """Initialize the FootballDataMerger with team mapping configuration."""
-        self.team_mapping = self._create_team_mapping()
+    def __init__(self, date_tolerance_days: int = 1, load_workers: int = 1, projected_reads: bool = False,
+                 cache_dir: Optional[str] = None, cache_max_bytes: int = 512 * 1024 * 1024,
+                 track_memory: bool = False, metrics_path: Optional[str] = None,
+                 profile_dir: Optional[str] = None, profile_stages: Optional[List[str]] = None,
+                 profile_mode: str = 'both'):
+        """
+        Initialize the FootballDataMerger with team mapping configuration.
+        
+        Args:
+            date_tolerance_days: Maximum date drift (in days) allowed when joining
+                odds fixtures to Understat matches; widen it for postponed games
+            load_workers: Number of odds files read concurrently (1 reads sequentially)
+            projected_reads: Load only the odds columns the pipeline uses, with the
+                compact dtypes from ODDS_COLUMN_DTYPES
+            cache_dir: Folder for the columnar cache of parsed inputs (None disables caching)
+            cache_max_bytes: Size bound of the cache; least recently used entries are evicted
+            track_memory: Record peak traced memory per stage (slower, uses tracemalloc)
+            metrics_path: JSON lines file that stage metrics are appended to after each run
+            profile_dir: Folder for per-stage cProfile (.prof) and allocation reports,
+                one subfolder per run (None disables profiling)
+            profile_stages: Stage names to profile, e.g. ['create_understat_lookup',
+                'parse_dates'] (None profiles every stage)
+            profile_mode: 'cprofile', 'tracemalloc' or 'both' (allocation snapshots
+                are slow around per-row stages)
+        """
+        if date_tolerance_days < 0:
+            raise ValueError(f"date_tolerance_days must be non-negative, got {date_tolerance_days}")
+        if load_workers < 1:
+            raise ValueError(f"load_workers must be at least 1, got {load_workers}")
+        
+        self.team_index = TeamNameIndex()
+        self.team_mapping = self.team_index.team_mapping
         self.processed_files = []
         self.merge_statistics = {}
+        self.team_ids = {}
+        self.date_tolerance_days = date_tolerance_days
+        self.load_workers = load_workers
+        self.projected_reads = projected_reads
+        self.odds_schema_cache = {}
+        self.date_format_cache = {}
+        self.cache = ColumnarCache(cache_dir, cache_max_bytes) if cache_dir else None
+        self.track_memory = track_memory
+        self.profile_dir = profile_dir
+        self.profile_stages = profile_stages
+        self.profile_mode = profile_mode
+        self.stage_metrics = self._create_stage_metrics()
+        self.metrics_path = metrics_path
+        self.date_offset_matches = pd.DataFrame()
+        self.integration_report = None
     
-    def _create_team_mapping(self) -> Dict[str, str]:
-        """
-        Create comprehensive team name mapping between different data sources.
-        
-        Returns:
-            Dict mapping Understat team names to Odds data team names
-        """
-        return {
-            'Arsenal': 'Arsenal',
-            'Aston Villa': 'Aston Villa',
-            'Bournemouth': 'Bournemouth',
-            'Brighton': 'Brighton',
-            'Brighton and Hove Albion': 'Brighton',
-            'Burnley': 'Burnley',
-            'Cardiff': 'Cardiff',
-            'Cardiff City': 'Cardiff',
-            'Chelsea': 'Chelsea',
-            'Crystal Palace': 'Crystal Palace',
-            'Everton': 'Everton',
-            'Fulham': 'Fulham',
-            'Huddersfield': 'Huddersfield',
-            'Huddersfield Town': 'Huddersfield',
-            'Hull': 'Hull',
-            'Hull City': 'Hull',
-            'Leicester': 'Leicester',
-            'Leicester City': 'Leicester',
-            'Liverpool': 'Liverpool',
-            'Manchester City': 'Man City',
-            'Manchester United': 'Man United',
-            'Middlesbrough': 'Middlesbrough',
-            'Newcastle United': 'Newcastle',
-            'Norwich': 'Norwich',
-            'Norwich City': 'Norwich',
-            'QPR': 'QPR',
-            'Queens Park Rangers': 'QPR',
-            'Sheffield United': 'Sheffield United',
-            'Southampton': 'Southampton',
-            'Stoke': 'Stoke',
-            'Stoke City': 'Stoke',
-            'Sunderland': 'Sunderland',
-            'Swansea': 'Swansea',
-            'Swansea City': 'Swansea',
-            'Tottenham': 'Tottenham',
-            'Tottenham Hotspur': 'Tottenham',
-            'Watford': 'Watford',
-            'West Bromwich Albion': 'West Brom',
-            'West Brom': 'West Brom',
-            'West Ham': 'West Ham',
-            'West Ham United': 'West Ham',
-            'Wolverhampton Wanderers': 'Wolves',
-            'Wolves': 'Wolves'
-        }
+    def _create_stage_metrics(self) -> PipelineMetrics:
+        """Create a fresh metrics collector with this merger's tracking and profiling settings."""
+        return PipelineMetrics(self.track_memory, profile_dir=self.profile_dir,
+                               profile_stages=self.profile_stages, profile_mode=self.profile_mode)
+    
+    # Columns read from odds files in projected mode and their compact dtypes
+    ODDS_COLUMN_DTYPES = {
+        'Div': 'category',
+        'Date': 'string',
+        'HomeTeam': 'category',
+        'AwayTeam': 'category',
+        'FTHG': 'Int8',
+        'FTAG': 'Int8',
+        'FTR': 'string',
+        'HS': 'Int16',
+        'AS': 'Int16',
+        'HST': 'Int16',
+        'AST': 'Int16',
+        'B365H': 'float32',
+        'B365D': 'float32',
+        'B365A': 'float32',
+        'BbAvH': 'float32',
+        'BbAvD': 'float32',
+        'BbAvA': 'float32',
+        'BbAv>2.5': 'float32',
+        'BbAv<2.5': 'float32'
+    }
+
+    # Bump whenever loading or processing logic changes so stale cache entries are ignored
+    CACHE_VERSION = 2
+
+    # Output formats of merge_all_data: the CSV, a typed columnar store, or both
+    OUTPUT_FORMATS = ('csv', 'columnar', 'both')
+
+    # Types of the final dataset columns in columnar output (Date becomes datetime64)
+    TYPED_OUTPUT_DTYPES = {
+        'Team1': 'category',
+        'Team2': 'category',
+        'G1': 'int8',
+        'G2': 'int8',
+        'R': 'category',
+        'S1': 'int16',
+        'S2': 'int16',
+        'ST1': 'int16',
+        'ST2': 'int16',
+        'Index': 'int32',
+        'pts1': 'int8',
+        'pts2': 'int8'
+    }
+
+    # Understat league names and their football-data.co.uk division codes
+    LEAGUE_DIVISIONS = {
+        'EPL': 'E0',
+        'La_liga': 'SP1',
+        'Bundesliga': 'D1',
+        'Serie_A': 'I1',
+        'Ligue_1': 'F1',
+        'RFPL': 'RUS'
+    }
+
+    # Alternative header names per canonical odds column, in order of preference.
+    # football-data.co.uk replaced the BetBrain averages (BbAv*) with Avg* in 2019-20.
+    ODDS_COLUMN_ALIASES = {
+        'BbAvH': ['BbAvH', 'AvgH'],
+        'BbAvD': ['BbAvD', 'AvgD'],
+        'BbAvA': ['BbAvA', 'AvgA'],
+        'BbAv>2.5': ['BbAv>2.5', 'Avg>2.5'],
+        'BbAv<2.5': ['BbAv<2.5', 'Avg<2.5']
+    }
+
+    # Packed match key layout: days since epoch << 32 | home team id << 16 | away team id
+    MATCH_KEY_DAY_SHIFT = 32
+    MATCH_KEY_TEAM_SHIFT = 16
+
+    def _intern_team_ids(self, team_names: pd.Series) -> np.ndarray:
+        """
+        Translate team names into compact integer IDs shared by all data sources.
+        
+        Each distinct name is assigned an ID the first time it is seen, so the
+        per-row work is a single factorize and array lookup.
+        
+        Args:
+            team_names: Series of team names
+            
+        Returns:
+            int64 array of team IDs aligned with the input
+        """
+        codes, uniques = pd.factorize(team_names.astype(str))
+        
+        unique_ids = np.empty(len(uniques), dtype=np.int64)
+        for pos, name in enumerate(uniques):
+            unique_ids[pos] = self.team_ids.setdefault(name, len(self.team_ids))
+        
+        if len(self.team_ids) >= 1 << self.MATCH_KEY_TEAM_SHIFT:
+            raise ValueError(f"Too many distinct team names for match keys: {len(self.team_ids):,}")
+        
+        return unique_ids[codes]
+
+    def _build_match_keys(self, dates: pd.Series, home_teams: pd.Series, away_teams: pd.Series) -> np.ndarray:
+        """
+        Pack match date and both team IDs into a single int64 key.
+        
+        Args:
+            dates: Series of match datetimes (time of day is ignored)
+            home_teams: Series of home team names
+            away_teams: Series of away team names
+            
+        Returns:
+            int64 array of match keys aligned with the inputs
+        """
+        day_ordinals = dates.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]').astype(np.int64)
+        home_ids = self._intern_team_ids(home_teams)
+        away_ids = self._intern_team_ids(away_teams)
+        
+        return (
+            (day_ordinals << self.MATCH_KEY_DAY_SHIFT) |
+            (home_ids << self.MATCH_KEY_TEAM_SHIFT) |
+            away_ids
+        )
+
+    def build_match_index(self, odds_data: pd.DataFrame) -> pd.Series:
+        """
+        Produce the readable 'YYYY-MM-DD_Home_vs_Away' match label for export.
+        
+        Args:
+            odds_data: Processed odds DataFrame
+            
+        Returns:
+            Series of readable match labels aligned with odds_data
+        """
+        return (
+            odds_data['Date'].dt.strftime('%Y-%m-%d') + '_' +
+            odds_data['HomeTeam'].astype(str) + '_vs_' + odds_data['AwayTeam'].astype(str)
+        )
+
+    @staticmethod
+    def _sniff_encoding(raw_bytes: bytes) -> str:
+        """
+        Detect the text encoding of a raw odds file.
+        
+        Args:
+            raw_bytes: Full file contents
+            
+        Returns:
+            'utf-8' when the contents decode cleanly, otherwise 'latin-1'
+        """
+        try:
+            raw_bytes.decode('utf-8')
+            return 'utf-8'
+        except UnicodeDecodeError:
+            return 'latin-1'
+
+    def _resolve_odds_schema(self, columns: pd.Index) -> Dict[str, str]:
+        """
+        Map a file's header to the canonical odds columns.
+        
+        The mapping is compiled once per distinct header signature and cached,
+        since hundreds of files share a handful of layouts.
+        
+        Args:
+            columns: Header of the odds file
+            
+        Returns:
+            Dictionary mapping source column names to canonical column names
+        """
+        signature = tuple(columns)
+        
+        if signature in self.odds_schema_cache:
+            return self.odds_schema_cache[signature]
+        
+        available = set(signature)
+        column_map = {}
+        
+        for canonical in self.ODDS_COLUMN_DTYPES:
+            for candidate in self.ODDS_COLUMN_ALIASES.get(canonical, [canonical]):
+                if candidate in available:
+                    column_map[candidate] = canonical
+                    break
+        
+        self.odds_schema_cache[signature] = column_map
+        return column_map
+
+    def _cache_key(self, stage: str, source_hash: str, settings: str = '') -> str:
+        """
+        Build a content-addressed cache key for one stage's output.
+        
+        Args:
+            stage: Name of the pipeline stage producing the cached frame
+            source_hash: Content hash of the source file
+            settings: Any configuration that changes the stage output
+            
+        Returns:
+            Hex digest identifying the cache entry
+        """
+        key_source = f"{self.CACHE_VERSION}|{stage}|{source_hash}|{settings}"
+        return hashlib.blake2b(key_source.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _load_odds_file(self, file: str) -> Tuple[Optional[pd.DataFrame], List[str]]:
+        """
+        Read and validate a single odds CSV file, recording per-file metrics.
+        
+        Messages are collected rather than printed so that files loaded
+        concurrently still report in a deterministic order.
+        
+        Args:
+            file: Path to odds CSV file
+            
+        Returns:
+            Tuple of (DataFrame or None if the file was skipped, log messages)
+        """
+        with self.stage_metrics.stage('load_odds_file', file=os.path.basename(file)) as stage:
+            df, messages = self._read_odds_file(file)
+            stage['rows_out'] = 0 if df is None else len(df)
+        
+        return df, messages
+
+    def _read_odds_file(self, file: str) -> Tuple[Optional[pd.DataFrame], List[str]]:
+        """
+        Read, normalize and validate a single odds CSV file.
+        
+        Args:
+            file: Path to odds CSV file
+            
+        Returns:
+            Tuple of (DataFrame or None if the file was skipped, log messages)
+        """
+        messages = [f"  Processing: {os.path.basename(file)}"]
+        
+        try:
+            with open(file, 'rb') as handle:
+                raw_bytes = handle.read()
+            
+            file_hash = hashlib.blake2b(raw_bytes, digest_size=16).hexdigest()
+            season = os.path.basename(file).replace('.csv', '')
+            
+            if self.cache is not None:
+                cache_key = self._cache_key('odds_file', file_hash, f"{season}|projected={self.projected_reads}")
+                df = self.cache.get(cache_key)
+                if df is not None:
+                    messages.append(f"    Loaded {len(df)} records from {season} (cache)")
+                    return df, messages
+            
+            # Sniff the encoding once instead of re-parsing on UnicodeDecodeError
+            encoding = self._sniff_encoding(raw_bytes)
+            
+            if self.projected_reads:
+                header = pd.read_csv(io.BytesIO(raw_bytes), encoding=encoding, nrows=0).columns
+                column_map = self._resolve_odds_schema(header)
+                df = pd.read_csv(
+                    io.BytesIO(raw_bytes),
+                    encoding=encoding,
+                    usecols=list(column_map),
+                    dtype={source: self.ODDS_COLUMN_DTYPES[canonical] for source, canonical in column_map.items()}
+                )
+            else:
+                df = pd.read_csv(io.BytesIO(raw_bytes), encoding=encoding)
+                column_map = self._resolve_odds_schema(df.columns)
+            
+            # Bring newer header layouts onto the canonical column names
+            renamed = {source: canonical for source, canonical in column_map.items() if source != canonical}
+            if renamed:
+                df = df.rename(columns=renamed)
+                messages.append(f"    Mapped columns: {', '.join(f'{a} -> {b}' for a, b in renamed.items())}")
+            
+            # Basic data validation
+            if df.empty:
+                messages.append(f"    Warning: {file} is empty, skipping...")
+                return None, messages
+            
+            if 'Date' not in df.columns:
+                messages.append(f"    Warning: {file} missing Date column, skipping...")
+                return None, messages
+            
+            # Show sample dates from this file for debugging
+            sample_dates = df['Date'].head(3).tolist()
+            messages.append(f"    Sample dates: {sample_dates}")
+            
+            # Each file uses one date layout, so parse it with a single fixed format
+            with self.stage_metrics.stage('parse_dates', rows_in=len(df), file=os.path.basename(file)) as stage:
+                df['Date'], date_method = self._parse_file_dates(df['Date'], file_hash)
+                stage['rows_out'] = int(df['Date'].notna().sum())
+            messages.append(f"    Parsed dates with {date_method}")
+            
+            # Extract season from filename
+            df['Season'] = season
+            
+            if encoding != 'utf-8':
+                messages.append(f"    Processed with {encoding} encoding")
+            messages.append(f"    Loaded {len(df)} records from {season}")
+            
+            if self.cache is not None:
+                self.cache.put(cache_key, df)
+            
+            return df, messages
+            
+        except Exception as e:
+            messages.append(f"    Warning: Could not process {file}: {str(e)}")
+            return None, messages
+
+    def _load_odds_files(self, csv_files: List[str]) -> List[pd.DataFrame]:
+        """
+        Load several odds files, concurrently when load_workers > 1.
+        
+        Args:
+            csv_files: Paths of odds CSV files
+            
+        Returns:
+            Loaded frames of the files that were not skipped, in input order
+        """
+        all_odds_data = []
+        
+        if self.load_workers > 1:
+            print(f"  Reading files with {self.load_workers} workers")
+            with ThreadPoolExecutor(max_workers=self.load_workers) as executor:
+                # map() yields results in submission order, keeping output deterministic
+                loaded_files = list(executor.map(self._load_odds_file, csv_files))
+        else:
+            loaded_files = map(self._load_odds_file, csv_files)
+        
+        for file, (df, messages) in zip(csv_files, loaded_files):
+            for message in messages:
+                print(message)
+            
+            if df is None:
+                continue
+            
+            all_odds_data.append(df)
+            self.processed_files.append(os.path.basename(file))
+        
+        if self.cache is not None:
+            self.cache.evict()
+        
+        return all_odds_data
 
     def merge_odds_files(self, odds_folder_path: str) -> pd.DataFrame:
         """
@@ -115,52 +453,9 @@ class FootballDataMerger:
         if not csv_files:
             raise ValueError(f"No CSV files found in {odds_folder_path}")
         
-        all_odds_data = []
-        
         print(f"Processing {len(csv_files)} odds files...")
         
-        for file in csv_files:
-            try:
-                print(f"  Processing: {os.path.basename(file)}")
-                df = pd.read_csv(file, encoding='utf-8')
-                
-                # Basic data validation
-                if df.empty:
-                    print(f"    Warning: {file} is empty, skipping...")
-                    continue
-                
-                if 'Date' not in df.columns:
-                    print(f"    Warning: {file} missing Date column, skipping...")
-                    continue
-                
-                # Show sample dates from this file for debugging
-                sample_dates = df['Date'].head(3).tolist()
-                print(f"    Sample dates: {sample_dates}")
-                
-                # Extract season from filename
-                season = os.path.basename(file).replace('.csv', '')
-                df['Season'] = season
-                
-                print(f"    Loaded {len(df)} records from {season}")
-                
-                all_odds_data.append(df)
-                self.processed_files.append(os.path.basename(file))
-                
-            except UnicodeDecodeError:
-                try:
-                    # Try different encoding
-                    df = pd.read_csv(file, encoding='latin-1')
-                    season = os.path.basename(file).replace('.csv', '')
-                    df['Season'] = season
-                    all_odds_data.append(df)
-                    self.processed_files.append(os.path.basename(file))
-                    print(f"    Processed with latin-1 encoding")
-                except Exception as e:
-                    print(f"    Warning: Could not process {file}: {str(e)}")
-                    continue
-            except Exception as e:
-                print(f"    Warning: Could not process {file}: {str(e)}")
-                continue
+        all_odds_data = self._load_odds_files(csv_files)
         
         if not all_odds_data:
             raise ValueError("No valid odds data could be loaded")
@@ -203,8 +498,11 @@ class FootballDataMerger:
         
         combined_odds = combined_odds[available_columns].copy()
         
-        # Robust date parsing with multiple format attempts
-        combined_odds['Date'] = self._parse_dates(combined_odds['Date'])
+        # Dates are normally parsed per file on load; fall back to robust parsing otherwise
+        if not pd.api.types.is_datetime64_any_dtype(combined_odds['Date']):
+            with self.stage_metrics.stage('parse_dates', rows_in=len(combined_odds)) as stage:
+                combined_odds['Date'] = self._parse_dates(combined_odds['Date'])
+                stage['rows_out'] = int(combined_odds['Date'].notna().sum())
         
         # Remove rows with invalid dates
         initial_count = len(combined_odds)
@@ -214,14 +512,119 @@ class FootballDataMerger:
         if initial_count > final_count:
             print(f"  Removed {initial_count - final_count} rows with invalid dates")
         
-        # Create match index for joining (odds data is the foundation)
-        combined_odds['match_index'] = (
-            combined_odds['Date'].dt.strftime('%Y-%m-%d') + '_' +
-            combined_odds['HomeTeam'].astype(str) + '_vs_' + combined_odds['AwayTeam'].astype(str)
+        if final_count:
+            print(f"  Date range: {combined_odds['Date'].min().date()} to {combined_odds['Date'].max().date()}")
+        
+        # Create match key for joining (odds data is the foundation)
+        combined_odds['match_key'] = self._build_match_keys(
+            combined_odds['Date'], combined_odds['HomeTeam'], combined_odds['AwayTeam']
         )
         
         return combined_odds
     
+    # Candidate date formats, tried in order (day-first formats win ties)
+    DATE_FORMATS = [
+        '%d/%m/%y',     # 16/08/14
+        '%d/%m/%Y',     # 16/08/2014
+        '%d-%m-%y',     # 16-08-14
+        '%d-%m-%Y',     # 16-08-2014
+        '%Y-%m-%d',     # 2014-08-16
+        '%m/%d/%y',     # 08/16/14 (US format)
+        '%m/%d/%Y',     # 08/16/2014 (US format)
+        '%Y/%m/%d',     # 2014/08/16
+        '%d.%m.%y',     # 16.08.14
+        '%d.%m.%Y'      # 16.08.2014
+    ]
+
+    def _detect_date_format(self, date_series: pd.Series) -> Optional[str]:
+        """
+        Find the first known date format that parses a sample of the series.
+        
+        Args:
+            date_series: Series containing date strings
+            
+        Returns:
+            Matching strptime format, or None if no single format fits
+        """
+        test_sample = date_series.dropna().astype(str).head(50)
+        
+        for date_format in self.DATE_FORMATS:
+            try:
+                pd.to_datetime(test_sample, format=date_format, errors='raise')
+                return date_format
+            except (ValueError, TypeError):
+                continue
+        
+        return None
+
+    def _correct_century(self, parsed_dates: pd.Series) -> Tuple[pd.Series, int]:
+        """
+        Move 2-digit-year dates parsed into the wrong century back by 100 years.
+        
+        Args:
+            parsed_dates: Series of parsed datetimes
+            
+        Returns:
+            Tuple of (corrected Series, number of dates corrected)
+        """
+        # Check if we have dates in wrong century (like 2014 being parsed as 2114)
+        mask = parsed_dates > pd.Timestamp('2030-01-01')
+        corrected = int(mask.sum())
+        if corrected:
+            # Subtract 100 years from dates that are too far in the future
+            parsed_dates.loc[mask] = parsed_dates.loc[mask] - pd.DateOffset(years=100)
+        
+        return parsed_dates, corrected
+
+    def _parse_file_dates(self, date_series: pd.Series, file_hash: str) -> Tuple[pd.Series, str]:
+        """
+        Parse one file's dates in a single vectorized pass.
+        
+        The format is detected from a sample of the file. Rows it leaves
+        unparsed (files mixing date layouts) are parsed value by value instead
+        of being dropped. The detected format is kept in memory by file content
+        hash, so loading an unchanged file again with the same merger skips
+        detection; across processes, the ColumnarCache (cache_dir) stores the
+        parsed files themselves.
+        
+        Args:
+            date_series: Raw Date column of a single odds file
+            file_hash: Content hash of the source file
+            
+        Returns:
+            Tuple of (parsed datetime Series, description of the method used)
+        """
+        date_format = self.date_format_cache.get(file_hash)
+        method = f"format {date_format} (cached)"
+        
+        if date_format is None:
+            date_format = self._detect_date_format(date_series)
+            method = f"format {date_format}"
+        
+        if date_format is None:
+            # No single format fits this file; fall back to flexible parsing
+            parsed_dates = pd.to_datetime(date_series, dayfirst=True, errors='coerce')
+            method = "flexible parsing (dayfirst=True)"
+        else:
+            self.date_format_cache[file_hash] = date_format
+            parsed_dates = pd.to_datetime(date_series, format=date_format, errors='coerce')
+        
+        unparsed = parsed_dates.isna() & date_series.notna()
+        if unparsed.any():
+            # Rows outside the file's main layout: infer the format of each value
+            parsed_dates[unparsed] = pd.to_datetime(date_series[unparsed], format='mixed', dayfirst=True,
+                                                    errors='coerce')
+            method += f", {int(unparsed.sum())} dates parsed individually"
+            still_unparsed = int((parsed_dates.isna() & date_series.notna()).sum())
+            if still_unparsed:
+                method += f" ({still_unparsed} could not be parsed)"
+        
+        parsed_dates, corrected = self._correct_century(parsed_dates)
+        if corrected:
+            method += f", {corrected} dates moved back a century"
+        
+        return parsed_dates, method
+
     def _parse_dates(self, date_series: pd.Series) -> pd.Series:
         """
         Robust date parsing with multiple format attempts and intelligent year handling.
@@ -245,33 +648,11 @@ class FootballDataMerger:
         successful_method = None
         
         # Strategy 1: Try specific formats with both 2-digit and 4-digit years
-        formats_to_try = [
-            '%d/%m/%y',     # 16/08/14
-            '%d/%m/%Y',     # 16/08/2014
-            '%d-%m-%y',     # 16-08-14
-            '%d-%m-%Y',     # 16-08-2014
-            '%Y-%m-%d',     # 2014-08-16
-            '%m/%d/%y',     # 08/16/14 (US format)
-            '%m/%d/%Y',     # 08/16/2014 (US format)
-            '%Y/%m/%d',     # 2014/08/16
-            '%d.%m.%y',     # 16.08.14
-            '%d.%m.%Y'      # 16.08.2014
-        ]
-        
-        for date_format in formats_to_try:
-            try:
-                # Test with a small sample first
-                test_sample = date_series_clean.head(50)
-                test_result = pd.to_datetime(test_sample, format=date_format, errors='raise')
-                
-                # If test passes, parse all dates
-                parsed_dates = pd.to_datetime(date_series, format=date_format, errors='coerce')
-                successful_method = f"Format: {date_format}"
-                print(f"  Successfully parsed dates using format: {date_format}")
-                break
-                
-            except (ValueError, TypeError) as e:
-                continue
+        date_format = self._detect_date_format(date_series_clean)
+        if date_format is not None:
+            parsed_dates = pd.to_datetime(date_series, format=date_format, errors='coerce')
+            successful_method = f"Format: {date_format}"
+            print(f"  Successfully parsed dates using format: {date_format}")
         
         # Strategy 2: If no single format worked, try flexible parsing
         if parsed_dates is None or parsed_dates.isna().sum() > len(parsed_dates) * 0.5:
@@ -291,13 +672,9 @@ class FootballDataMerger:
         
         # Strategy 3: Handle 2-digit years that might be interpreted incorrectly
         if parsed_dates is not None:
-            # Check if we have dates in wrong century (like 2014 being parsed as 2114)
-            future_dates = parsed_dates[parsed_dates > pd.Timestamp('2030-01-01')]
-            if len(future_dates) > 0:
-                print(f"  Correcting {len(future_dates)} dates with wrong century...")
-                # Subtract 100 years from dates that are too far in the future
-                mask = parsed_dates > pd.Timestamp('2030-01-01')
-                parsed_dates.loc[mask] = parsed_dates.loc[mask] - pd.DateOffset(years=100)
+            parsed_dates, corrected = self._correct_century(parsed_dates)
+            if corrected:
+                print(f"  Correcting {corrected} dates with wrong century...")
         
         # Validate results
         if parsed_dates is not None:
@@ -330,112 +707,355 @@ class FootballDataMerger:
         
         return parsed_dates
 
-    def process_understat_data(self, understat_file_path: str) -> pd.DataFrame:
+    def _load_understat_file(self, understat_file_path: str) -> pd.DataFrame:
         """
-        Process Understat xG data for integration with odds data.
+        Read and prepare the whole Understat file once, for every league in it.
         
         Args:
             understat_file_path: Path to Understat CSV file
             
         Returns:
-            Processed DataFrame with EPL data only and mapped team names
+            DataFrame with parsed dates and mapped team names for all leagues
             
         Raises:
             FileNotFoundError: If Understat file doesn't exist
-            ValueError: If no EPL data found
         """
         if not os.path.exists(understat_file_path):
             raise FileNotFoundError(f"Understat file not found: {understat_file_path}")
         
-        print("Processing Understat xG data...")
-        
-        df = pd.read_csv(understat_file_path)
+        with open(understat_file_path, 'rb') as handle:
+            raw_bytes = handle.read()
         
-        # Filter for Premier League only
-        epl_data = df[df['league'] == 'EPL'].copy()
+        if self.cache is not None:
+            file_hash = hashlib.blake2b(raw_bytes, digest_size=16).hexdigest()
+            mapping_hash = hashlib.blake2b(repr(sorted(self.team_mapping.items())).encode('utf-8'),
+                                           digest_size=16).hexdigest()
+            cache_key = self._cache_key('understat', file_hash, mapping_hash)
+            understat_data = self.cache.get(cache_key)
+            if understat_data is not None:
+                print(f"Loaded {len(understat_data):,} Understat records (cache)")
+                return understat_data
         
-        if epl_data.empty:
-            raise ValueError("No EPL data found in Understat file")
+        understat_data = pd.read_csv(io.BytesIO(raw_bytes))
         
         # Parse dates
-        epl_data['date'] = pd.to_datetime(epl_data['date'])
+        understat_data['date'] = pd.to_datetime(understat_data['date'])
         
         # Apply team name mapping
-        epl_data['team_mapped'] = epl_data['team'].map(self.team_mapping).fillna(epl_data['team'])
+        understat_data['team_mapped'] = self.team_index.map_names(understat_data['team'])
+        
+        if self.cache is not None:
+            self.cache.put(cache_key, understat_data)
+            self.cache.evict()
+        
+        return understat_data
+
+    def process_understat_data(self, understat_file_path: str, league: str = 'EPL') -> pd.DataFrame:
+        """
+        Process Understat xG data for integration with odds data.
+        
+        Args:
+            understat_file_path: Path to Understat CSV file
+            league: Understat league name to keep
+            
+        Returns:
+            Processed DataFrame with the league's data only and mapped team names
+            
+        Raises:
+            FileNotFoundError: If Understat file doesn't exist
+            ValueError: If no data found for the league
+        """
+        print("Processing Understat xG data...")
+        
+        understat_data = self._load_understat_file(understat_file_path)
+        
+        # Filter for the requested league only
+        league_data = understat_data[understat_data['league'] == league].copy()
+        
+        if league_data.empty:
+            raise ValueError(f"No {league} data found in Understat file")
+        
+        print(f"Processed {len(league_data):,} Understat records")
+        print(f"Date range: {league_data['date'].min().date()} to {league_data['date'].max().date()}")
+        
+        return league_data
+
+    # Header names accepted for the aggregate file's league and season columns, in
+    # order of preference; the understat.com export leaves both headers blank
+    TEAM_SEASON_KEY_HEADERS = {
+        'league': ('league', 'Unnamed: 0'),
+        'season': ('season', 'year', 'Unnamed: 1')
+    }
+
+    # Compact dtypes of the team-season dimension columns
+    TEAM_SEASON_DTYPES = {
+        'position': 'int8',
+        'matches': 'int8',
+        'wins': 'int8',
+        'draws': 'int8',
+        'loses': 'int8',
+        'scored': 'int16',
+        'missed': 'int16',
+        'pts': 'int16',
+        'xG': 'float32',
+        'xG_diff': 'float32',
+        'npxG': 'float32',
+        'xGA': 'float32',
+        'xGA_diff': 'float32',
+        'npxGA': 'float32',
+        'npxGD': 'float32',
+        'ppda_coef': 'float32',
+        'oppda_coef': 'float32',
+        'deep': 'int16',
+        'deep_allowed': 'int16',
+        'xpts': 'float32',
+        'xpts_diff': 'float32'
+    }
+
+    def _pack_team_season_keys(self, team_ids: np.ndarray, seasons: np.ndarray) -> np.ndarray:
+        """
+        Pack season start year and team ID into one int64 key.
+        
+        Args:
+            team_ids: Interned team IDs
+            seasons: Season start years (e.g. 2014 for 2014-15)
+            
+        Returns:
+            int64 array of team-season keys
+        """
+        return (seasons.astype(np.int64) << self.MATCH_KEY_TEAM_SHIFT) | team_ids.astype(np.int64)
+
+    def load_team_season_dimension(self, aggregate_file_path: str, league: str = 'EPL') -> pd.DataFrame:
+        """
+        Load Understat season aggregates into a keyed team-season dimension table.
+        
+        The aggregate file holds one row per team per season (position, xG,
+        npxGD, ppda_coef, deep, xpts_diff, ...). Rows are keyed by the packed
+        (season, team_id) integer, with team IDs shared with the match keys, so
+        match rows can reference season context instead of copying it.
+        
+        Args:
+            aggregate_file_path: Path to the aggregate understat.com.csv file
+            league: Understat league name to keep
+            
+        Returns:
+            DataFrame indexed by team-season key with compact dtypes
+            
+        Raises:
+            FileNotFoundError: If aggregate file doesn't exist
+            ValueError: If required columns are missing or seasons are not years,
+                or no data found for the league
+        """
+        if not os.path.exists(aggregate_file_path):
+            raise FileNotFoundError(f"Understat aggregate file not found: {aggregate_file_path}")
+        
+        print("Loading Understat team-season aggregates...")
         
-        print(f"Processed {len(epl_data):,} Understat records")
-        print(f"Date range: {epl_data['date'].min().date()} to {epl_data['date'].max().date()}")
+        aggregates = pd.read_csv(aggregate_file_path)
         
-        return epl_data
+        # League and season are found by header name (blank in the export), never by position
+        key_columns = {}
+        for key, headers in self.TEAM_SEASON_KEY_HEADERS.items():
+            header = next((header for header in headers if header in aggregates.columns), None)
+            if header is None:
+                raise ValueError(f"Understat aggregate file has no {key} column "
+                                 f"(expected one of {list(headers)}): {aggregate_file_path}")
+            key_columns[header] = key
+        
+        missing = [column for column in ['team', *self.TEAM_SEASON_DTYPES] if column not in aggregates.columns]
+        if missing:
+            raise ValueError(f"Understat aggregate file is missing columns {missing}: {aggregate_file_path}")
+        
+        aggregates = aggregates.rename(columns=key_columns)
+        if not pd.api.types.is_integer_dtype(aggregates['season']):
+            raise ValueError(f"Season column of {aggregate_file_path} must hold season start years, "
+                             f"got {aggregates['season'].dtype} values")
+        aggregates = aggregates[aggregates['league'] == league]
+        
+        if aggregates.empty:
+            raise ValueError(f"No {league} data found in Understat aggregate file")
+        
+        team_names = self.team_index.map_names(aggregates['team'])
+        team_ids = self._intern_team_ids(team_names)
+        seasons = aggregates['season'].to_numpy()
+        
+        dimension = aggregates[list(self.TEAM_SEASON_DTYPES)].astype(self.TEAM_SEASON_DTYPES)
+        dimension.insert(0, 'season', seasons.astype(np.int16))
+        dimension.insert(0, 'team', pd.Categorical(team_names))
+        dimension.insert(0, 'team_id', team_ids.astype(np.int32))
+        dimension.index = pd.Index(self._pack_team_season_keys(team_ids, seasons), name='team_season_key')
+        
+        if dimension.index.has_duplicates:
+            raise ValueError(f"Duplicate team-season rows in {aggregate_file_path}")
+        
+        print(f"Loaded {len(dimension):,} team-seasons for {league} "
+              f"({dimension.memory_usage(deep=True).sum() / 1024:.1f} KB)")
+        
+        return dimension.sort_index()
 
-    def create_understat_lookup(self, understat_data: pd.DataFrame) -> Dict[str, Dict]:
+    def _season_start_years(self, odds_data: pd.DataFrame) -> np.ndarray:
+        """
+        Derive the season start year of every odds row.
+        
+        Season labels such as '14-15' give the year directly; rows whose label
+        does not follow that pattern fall back to the match date, with seasons
+        starting in August.
+        
+        Args:
+            odds_data: Processed odds DataFrame with Season and Date columns
+            
+        Returns:
+            int64 array of season start years
+        """
+        label_years = odds_data['Season'].astype(str).str.extract(r'(\d{2})-\d{2}$', expand=False)
+        date_years = odds_data['Date'].dt.year - (odds_data['Date'].dt.month < 8)
+        
+        return (
+            pd.to_numeric(label_years, errors='coerce').add(2000)
+            .fillna(date_years)
+            .to_numpy(dtype=np.int64)
+        )
+
+    def assign_team_season_keys(self, odds_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add integer home/away team-season keys to processed odds rows.
+        
+        Args:
+            odds_data: Processed odds DataFrame
+            
+        Returns:
+            Copy of odds_data with 'home_season_key' and 'away_season_key' columns
+        """
+        seasons = self._season_start_years(odds_data)
+        
+        keyed = odds_data.copy()
+        keyed['home_season_key'] = self._pack_team_season_keys(self._intern_team_ids(odds_data['HomeTeam']), seasons)
+        keyed['away_season_key'] = self._pack_team_season_keys(self._intern_team_ids(odds_data['AwayTeam']), seasons)
+        
+        return keyed
+
+    def join_team_season(self, season_keys: pd.Series, dimension: pd.DataFrame,
+                         columns: Optional[List[str]] = None, prefix: str = '') -> pd.DataFrame:
+        """
+        Pull team-season context onto match rows through their integer keys.
+        
+        Args:
+            season_keys: Team-season keys of the match rows (home or away)
+            dimension: Table from load_team_season_dimension
+            columns: Dimension columns to fetch (defaults to all)
+            prefix: Prefix for the returned column names, e.g. 'home_'
+            
+        Returns:
+            DataFrame aligned with season_keys; unmatched keys give missing values
+        """
+        columns = columns or list(dimension.columns)
+        positions = dimension.index.get_indexer(season_keys.to_numpy())
+        
+        joined = dimension[columns].reset_index(drop=True).reindex(positions)
+        joined.index = season_keys.index
+        
+        return joined.add_prefix(prefix)
+
+    def _pair_home_away(self, understat_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Pair every Understat home row with its away counterpart in a single join.
+        
+        Home and away rows are joined on date and mirrored score (home scored ==
+        away missed, home missed == away scored). When several away rows qualify
+        for one home row, the first one in file order is kept, exactly as the
+        previous row-by-row search did.
+        
+        Args:
+            understat_data: Processed Understat DataFrame
+            
+        Returns:
+            DataFrame with one row per paired match, columns prefixed home_/away_
+        """
+        pair_columns = ['date', 'team_mapped', 'scored', 'missed', 'xG', 'xGA', 'npxG', 'xpts', 'year']
+        
+        home_games = understat_data.loc[understat_data['h_a'] == 'h', pair_columns]
+        away_games = understat_data.loc[understat_data['h_a'] == 'a', pair_columns]
+        
+        # Remember original positions so file order decides ties
+        home_games = home_games.dropna(subset=['date', 'scored', 'missed']).add_prefix('home_')
+        away_games = away_games.dropna(subset=['date', 'scored', 'missed']).add_prefix('away_')
+        home_games['home_pos'] = range(len(home_games))
+        away_games['away_pos'] = range(len(away_games))
+        
+        # Reduce the away side to its first row and candidate count per date/score, so
+        # the join stays one row per home game even when many matches share a day
+        away_keys = ['away_date', 'away_missed', 'away_scored']
+        first_away = away_games.groupby(away_keys, sort=False).agg(
+            away_pos=('away_pos', 'first'),
+            away_candidates=('away_pos', 'size')
+        ).reset_index()
+        
+        candidates = home_games.merge(
+            first_away,
+            left_on=['home_date', 'home_scored', 'home_missed'],
+            right_on=away_keys,
+            how='inner'
+        ).drop(columns=away_keys).sort_values('home_pos', kind='stable')
+        
+        # A home row with more than one qualifying away row is ambiguous
+        ambiguous_pairings = int((candidates['away_candidates'] > 1).sum())
+        self.merge_statistics['ambiguous_pairings'] = ambiguous_pairings
+        
+        if ambiguous_pairings:
+            print(f"  Warning: {ambiguous_pairings:,} home games had more than one date/score candidate "
+                  f"(first candidate kept)")
+        
+        paired = candidates.drop(columns='away_candidates').merge(away_games, on='away_pos', how='left')
+        return paired.reset_index(drop=True)
+
+    def create_understat_lookup(self, understat_data: pd.DataFrame) -> pd.DataFrame:
         """
         Create optimized lookup table for fast Understat data retrieval.
         
+        Each paired match is stored once under its packed match key; date drift
+        is absorbed later by the tolerance join in _integrate_xg_data.
+        
         Args:
             understat_data: Processed Understat DataFrame
             
         Returns:
-            Dictionary mapping match keys to xG statistics
+            DataFrame with one row per match, sorted by match day
         """
         print("Building Understat lookup table...")
         
-        # Separate home and away games
-        home_games = understat_data[understat_data['h_a'] == 'h'].copy()
-        away_games = understat_data[understat_data['h_a'] == 'a'].copy()
-        
-        understat_lookup = {}
-        matches_processed = 0
+        paired = self._pair_home_away(understat_data)
+        
+        value_columns = {
+            'home_xG': 'home_xG',
+            'away_xG': 'away_xG',
+            'home_xGA': 'home_xGA',
+            'away_xGA': 'away_xGA',
+            'home_npxG': 'home_npxG',
+            'away_npxG': 'away_npxG',
+            'home_xpts': 'home_xpts',
+            'away_xpts': 'away_xpts',
+            'year': 'home_year'
+        }
+        understat_lookup = paired[list(value_columns.values())].set_axis(list(value_columns), axis=1)
+        understat_lookup.insert(0, 'match_key', self._build_match_keys(
+            paired['home_date'], paired['home_team_mapped'], paired['away_team_mapped']
+        ))
         
-        for _, home_row in home_games.iterrows():
-            # Find corresponding away game by matching scores and date
-            away_match = away_games[
-                (away_games['date'] == home_row['date']) &
-                (away_games['scored'] == home_row['missed']) &
-                (away_games['missed'] == home_row['scored'])
-            ]
-            
-            if not away_match.empty:
-                away_row = away_match.iloc[0]
-                
-                # Create multiple lookup keys for flexible matching
-                date_str = home_row['date'].strftime('%Y-%m-%d')
-                
-                match_data = {
-                    'home_xG': home_row['xG'],
-                    'away_xG': away_row['xG'],
-                    'home_xGA': home_row['xGA'],
-                    'away_xGA': away_row['xGA'],
-                    'home_npxG': home_row['npxG'],
-                    'away_npxG': away_row['npxG'],
-                    'home_xpts': home_row['xpts'],
-                    'away_xpts': away_row['xpts'],
-                    'year': home_row['year']
-                }
-                
-                # Create primary and alternative keys for robust matching
-                keys = [
-                    f"{date_str}_{home_row['team_mapped']}_vs_{away_row['team_mapped']}",
-                    f"{(home_row['date'] + pd.Timedelta(days=1)).strftime('%Y-%m-%d')}_{home_row['team_mapped']}_vs_{away_row['team_mapped']}",
-                    f"{(home_row['date'] - pd.Timedelta(days=1)).strftime('%Y-%m-%d')}_{home_row['team_mapped']}_vs_{away_row['team_mapped']}"
-                ]
-                
-                for key in keys:
-                    understat_lookup[key] = match_data
-                
-                matches_processed += 1
+        # The same fixture listed twice on one day keeps the later row
+        understat_lookup = understat_lookup.drop_duplicates(subset='match_key', keep='last')
+        understat_lookup = understat_lookup.sort_values('match_key', kind='stable').reset_index(drop=True)
         
-        print(f"Created lookup table with {len(understat_lookup):,} keys from {matches_processed:,} matches")
+        print(f"Created lookup table with {len(understat_lookup):,} matches from {len(paired):,} pairings")
         
         return understat_lookup
 
-    def format_final_dataset(self, odds_data: pd.DataFrame, understat_lookup: Dict[str, Dict]) -> pd.DataFrame:
+    def format_final_dataset(self, odds_data: pd.DataFrame, understat_lookup: pd.DataFrame) -> pd.DataFrame:
         """
         Create final formatted dataset optimized for football analytics.
         
         Args:
             odds_data: Processed odds DataFrame (primary data source)
-            understat_lookup: Lookup dictionary for xG data
+            understat_lookup: Lookup table of Understat matches for xG data
             
         Returns:
             Final formatted DataFrame ready for analysis
@@ -452,18 +1072,18 @@ class FootballDataMerger:
         final_df['G2'] = odds_data['FTAG'].fillna(0).astype(int)  # Away goals
         final_df['R'] = odds_data['FTR'].fillna('D')  # Result (H/D/A)
         
-        # Match statistics
-        final_df['S1'] = odds_data['HS'].fillna(0).round(2)   # Home shots
-        final_df['S2'] = odds_data['AS'].fillna(0).round(2)   # Away shots
-        final_df['ST1'] = odds_data['HST'].fillna(0).round(2) # Home shots on target
-        final_df['ST2'] = odds_data['AST'].fillna(0).round(2) # Away shots on target
+        # Match statistics (projected reads store these as small ints / float32)
+        final_df['S1'] = odds_data['HS'].astype(float).fillna(0).round(2)   # Home shots
+        final_df['S2'] = odds_data['AS'].astype(float).fillna(0).round(2)   # Away shots
+        final_df['ST1'] = odds_data['HST'].astype(float).fillna(0).round(2) # Home shots on target
+        final_df['ST2'] = odds_data['AST'].astype(float).fillna(0).round(2) # Away shots on target
         
         # Betting market odds
-        final_df['W1'] = odds_data['BbAvH'].fillna(0).round(2)    # Home win odds
-        final_df['D'] = odds_data['BbAvD'].fillna(0).round(2)     # Draw odds
-        final_df['W2'] = odds_data['BbAvA'].fillna(0).round(2)    # Away win odds
-        final_df['>2.5'] = odds_data['BbAv>2.5'].fillna(0).round(2) # Over 2.5 goals
-        final_df['<2.5'] = odds_data['BbAv<2.5'].fillna(0).round(2) # Under 2.5 goals
+        final_df['W1'] = odds_data['BbAvH'].astype(float).fillna(0).round(2)    # Home win odds
+        final_df['D'] = odds_data['BbAvD'].astype(float).fillna(0).round(2)     # Draw odds
+        final_df['W2'] = odds_data['BbAvA'].astype(float).fillna(0).round(2)    # Away win odds
+        final_df['>2.5'] = odds_data['BbAv>2.5'].astype(float).fillna(0).round(2) # Over 2.5 goals
+        final_df['<2.5'] = odds_data['BbAv<2.5'].astype(float).fillna(0).round(2) # Under 2.5 goals
         
         # Unique identifier
         final_df['Index'] = range(1, len(final_df) + 1)
@@ -486,102 +1106,714 @@ class FootballDataMerger:
         
         return final_df
     
-    def _integrate_xg_data(self, odds_data: pd.DataFrame, understat_lookup: Dict[str, Dict]) -> Dict[str, List]:
+    @staticmethod
+    def _round_like_python(values: np.ndarray, decimals: int = 2) -> np.ndarray:
+        """
+        Round an array in bulk with the same results as Python's built-in round() on floats.
+        
+        numpy rounds via scaling, which can disagree with round() on values that
+        sit on a .5 boundary after scaling (1.885 -> 1.88 with np.round, 1.89
+        with round()). Only those few values are re-rounded one by one;
+        everything else is handled in a single vectorized pass.
+        
+        Args:
+            values: Float array to round
+            decimals: Number of decimal places
+            
+        Returns:
+            Rounded float array
+        """
+        rounded = np.round(values, decimals)
+        scaled = values * (10 ** decimals)
+        near_half = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+        
+        for pos in np.flatnonzero(near_half):
+            rounded[pos] = round(float(values[pos]), decimals)
+        
+        return rounded
+
+    def _split_match_keys(self, match_keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Split packed match keys into match day and (home, away) team pair.
+        
+        Args:
+            match_keys: int64 array of packed match keys
+            
+        Returns:
+            Tuple of (day ordinals, team pair codes)
+        """
+        team_pair_mask = (np.int64(1) << self.MATCH_KEY_DAY_SHIFT) - 1
+        return match_keys >> self.MATCH_KEY_DAY_SHIFT, match_keys & team_pair_mask
+
+    def _integrate_xg_data(self, odds_data: pd.DataFrame, understat_lookup: pd.DataFrame) -> Dict[str, np.ndarray]:
         """
         Integrate xG data from lookup table with match data.
         
+        Every odds fixture is joined to the Understat match of the same home/away
+        pair with the nearest date, as long as it lies within
+        date_tolerance_days. Fixtures joined at a non-zero offset are recorded in
+        self.date_offset_matches.
+        
         Args:
             odds_data: Main odds DataFrame
-            understat_lookup: xG data lookup dictionary
+            understat_lookup: Lookup table from create_understat_lookup
             
         Returns:
-            Dictionary containing xG statistics lists
+            Dictionary containing xG statistics arrays
         """
-        xg_stats = {
-            'xg1': [],
-            'xg2': [],
-            'xpts1': [],
-            'xpts2': []
+        xg_columns = {
+            'xg1': 'home_xG',
+            'xg2': 'away_xG',
+            'xpts1': 'home_xpts',
+            'xpts2': 'away_xpts'
         }
         
-        matches_found = 0
-        
-        for _, row in odds_data.iterrows():
-            match_key = row['match_index']
-            
-            if match_key in understat_lookup:
-                match_data = understat_lookup[match_key]
-                xg_stats['xg1'].append(round(match_data['home_xG'], 2))
-                xg_stats['xg2'].append(round(match_data['away_xG'], 2))
-                xg_stats['xpts1'].append(round(match_data['home_xpts'], 2))
-                xg_stats['xpts2'].append(round(match_data['away_xpts'], 2))
-                matches_found += 1
-            else:
-                # Default values for unmatched records
-                xg_stats['xg1'].append(0.0)
-                xg_stats['xg2'].append(0.0)
-                xg_stats['xpts1'].append(0.0)
-                xg_stats['xpts2'].append(0.0)
+        # The row-by-row merge rounded home values as Python floats (taken from
+        # iterrows rows) and away values as NumPy scalars (from .iloc rows), and
+        # the two disagree on .5 boundaries, so each side keeps its own rounding
+        python_rounded = {'xg1', 'xpts1'}
+        
+        odds_day, odds_pair = self._split_match_keys(odds_data['match_key'].to_numpy())
+        left = pd.DataFrame({
+            'match_day': odds_day,
+            'team_pair': odds_pair,
+            'odds_pos': np.arange(len(odds_data))
+        }).sort_values('match_day', kind='stable')
+        
+        lookup_day, lookup_pair = self._split_match_keys(understat_lookup['match_key'].to_numpy())
+        right = understat_lookup[list(xg_columns.values())].assign(
+            match_day=lookup_day,
+            team_pair=lookup_pair,
+            understat_day=lookup_day
+        ).sort_values('match_day', kind='stable')
+        
+        # Nearest-date join per team pair, memory linear in the number of matches
+        joined = pd.merge_asof(
+            left, right,
+            on='match_day',
+            by='team_pair',
+            direction='nearest',
+            tolerance=self.date_tolerance_days
+        ).sort_values('odds_pos', kind='stable')
+        
+        found_mask = joined['understat_day'].notna().to_numpy()
+        matches_found = int(found_mask.sum())
+        
+        xg_stats = {}
+        for stat_name, column in xg_columns.items():
+            values = joined[column].to_numpy(dtype=float, na_value=np.nan)
+            # Default values for unmatched records
+            rounded = self._round_like_python(values, 2) if stat_name in python_rounded else np.round(values, 2)
+            xg_stats[stat_name] = np.where(found_mask, rounded, 0.0)
+        
+        # Report fixtures whose Understat date differs from the odds date
+        date_offsets = (joined['understat_day'] - joined['match_day']).to_numpy(dtype=float, na_value=np.nan)
+        offset_mask = found_mask & (date_offsets != 0)
+        offset_rows = odds_data.iloc[np.flatnonzero(offset_mask)]
+        self.date_offset_matches = pd.DataFrame({
+            'Date': offset_rows['Date'].to_numpy(),
+            'HomeTeam': offset_rows['HomeTeam'].to_numpy(),
+            'AwayTeam': offset_rows['AwayTeam'].to_numpy(),
+            'OffsetDays': date_offsets[offset_mask].astype(int)
+        })
         
         match_rate = (matches_found / len(odds_data)) * 100
         print(f"Successfully matched {matches_found:,}/{len(odds_data):,} matches ({match_rate:.1f}% coverage)")
         
+        if len(self.date_offset_matches):
+            print(f"  {len(self.date_offset_matches):,} matches joined at a non-zero date offset "
+                  f"(window: ±{self.date_tolerance_days} days)")
+        
         self.merge_statistics['total_matches'] = len(odds_data)
         self.merge_statistics['matched_xg'] = matches_found
         self.merge_statistics['coverage_rate'] = match_rate
+        self.merge_statistics['date_offset_matches'] = len(self.date_offset_matches)
         
         return xg_stats
 
-    def generate_comprehensive_report(self, final_data: pd.DataFrame) -> None:
+    def to_typed_dataset(self, final_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert the final dataset to real column types.
+        
+        Dates become datetime64, team names and results categoricals and counts
+        small integers (see TYPED_OUTPUT_DTYPES); odds, xG and xPts stay float64
+        so every value equals the one written to the CSV.
+        
+        Args:
+            final_data: Formatted rows, as produced by format_final_dataset or
+                read back from the output CSV
+            
+        Returns:
+            New DataFrame with the same columns in the same order
+        """
+        typed = final_data.astype({column: dtype for column, dtype in self.TYPED_OUTPUT_DTYPES.items()
+                                   if column in final_data.columns})
+        typed['Date'] = pd.to_datetime(final_data['Date'], format='%d.%m.%Y')
+        
+        return typed.reset_index(drop=True)
+
+    @staticmethod
+    def columnar_output_path(output_path: str) -> str:
+        """
+        Folder of the columnar copy written next to an output CSV.
+        
+        Args:
+            output_path: Path of the output CSV
+            
+        Returns:
+            The CSV path with its extension replaced by '.columnar'
+        """
+        return IntegratedDataset.columnar_path(output_path)
+
+    def save_typed_dataset(self, final_data: pd.DataFrame, folder: str) -> None:
+        """
+        Write the final dataset as a typed columnar store.
+        
+        The store is written to a temporary folder. An existing store is then
+        renamed aside, the new one renamed into place and the old one deleted,
+        so readers see the old store or the new one (or, between the two
+        renames, none), never a mix of their columns. If the new store cannot
+        be moved into place, the old one is restored.
+        
+        Args:
+            final_data: Formatted rows of the final dataset
+            folder: Destination ColumnarStore folder (replaced if it exists)
+        """
+        parent = os.path.dirname(os.path.abspath(folder))
+        run_id = uuid.uuid4().hex
+        temp_folder = os.path.join(parent, f".tmp_{os.path.basename(folder)}_{run_id}")
+        old_folder = os.path.join(parent, f".old_{os.path.basename(folder)}_{run_id}")
+        
+        try:
+            ColumnarStore.write(self.to_typed_dataset(final_data), temp_folder)
+            if os.path.exists(folder):
+                os.replace(folder, old_folder)
+            try:
+                os.replace(temp_folder, folder)
+            except OSError:
+                if os.path.exists(old_folder):
+                    os.replace(old_folder, folder)
+                raise
+        finally:
+            shutil.rmtree(temp_folder, ignore_errors=True)
+            shutil.rmtree(old_folder, ignore_errors=True)
+
+    def generate_comprehensive_report(self, final_data: pd.DataFrame,
+                                      years: Optional[np.ndarray] = None) -> IntegrationReport:
         """
         Generate detailed analysis report of the merged dataset.
         
+        All metrics are gathered in a single pass by ReportAccumulator; the
+        caller's DataFrame is not modified.
+        
         Args:
             final_data: Final merged DataFrame
+            years: Calendar year of each row, when typed dates are at hand
+                (otherwise read from the formatted Date column)
+            
+        Returns:
+            IntegrationReport with the printed metrics (also kept in self.integration_report)
+        """
+        accumulator = ReportAccumulator()
+        accumulator.update(final_data, years)
+        self.integration_report = accumulator.finalize(len(self.processed_files))
+        self.integration_report.print_report()
+        
+        return self.integration_report
+
+    def _settings_fingerprint(self) -> str:
+        """
+        Summarize every setting that changes the integrated output.
+        
+        Returns:
+            Hex digest of pipeline version, join settings and team mapping
+        """
+        settings = repr((
+            self.CACHE_VERSION,
+            self.date_tolerance_days,
+            self.projected_reads,
+            sorted(self.team_mapping.items())
+        ))
+        return hashlib.blake2b(settings.encode('utf-8'), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _hash_file(file_path: str) -> str:
+        """Content hash of a file on disk."""
+        with open(file_path, 'rb') as handle:
+            return hashlib.blake2b(handle.read(), digest_size=16).hexdigest()
+
+    def _load_manifest(self, manifest_path: str, output_path: str, settings: str,
+                       understat_hash: str) -> Optional[Dict]:
+        """
+        Load an incremental-merge manifest if it still describes the output file.
+        
+        Args:
+            manifest_path: Path of the manifest JSON
+            output_path: Integrated dataset the manifest describes
+            settings: Current settings fingerprint
+            understat_hash: Content hash of the current Understat file
+            
+        Returns:
+            Manifest dictionary, or None if a full rebuild is required
+        """
+        if not os.path.exists(manifest_path) or not os.path.exists(output_path):
+            return None
+        
+        try:
+            with open(manifest_path, encoding='utf-8') as handle:
+                manifest = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        
+        if manifest.get('settings') != settings:
+            print("  Pipeline settings changed since last run, rebuilding all partitions")
+            return None
+        
+        if manifest.get('understat_hash') != understat_hash:
+            print("  Understat file changed since last run, rebuilding all partitions")
+            return None
+        
+        return manifest
+
+    def _format_odds_partition(self, odds_file_data: pd.DataFrame, understat_lookup: pd.DataFrame) -> pd.DataFrame:
+        """
+        Turn one loaded odds file into its rows of the final dataset.
+        
+        Processing files one at a time gives the same rows as processing the
+        concatenated frame; only the Index column has to be offset by the caller.
+        
+        Args:
+            odds_file_data: Frame returned by _load_odds_file
+            understat_lookup: Lookup table from create_understat_lookup
+            
+        Returns:
+            Final formatted rows for this file
+        """
+        # Columns absent from this file are blank, as they would be after concat
+        for column in list(self.ODDS_COLUMN_DTYPES) + ['Season']:
+            if column not in odds_file_data.columns:
+                odds_file_data[column] = np.nan
+        
+        odds_data = self._process_odds_data(odds_file_data)
+        return self.format_final_dataset(odds_data, understat_lookup)
+
+    def _merge_streaming(self, odds_folder_path: str, understat_file_path: str,
+                         output_path: str) -> IntegrationReport:
+        """
+        Merge odds files one at a time, appending each file's rows to the output.
+        
+        Only the Understat lookup and a single odds file are held in memory at
+        any time, so peak memory does not grow with the number of seasons or
+        leagues. The written file is identical to the batch pipeline's output.
+        
+        Args:
+            odds_folder_path: Path to folder containing odds CSV files
+            understat_file_path: Path to Understat CSV file
+            output_path: Path for output CSV file
+            
+        Returns:
+            IntegrationReport accumulated over the written partitions
+        """
+        if not os.path.exists(odds_folder_path):
+            raise FileNotFoundError(f"Odds folder not found: {odds_folder_path}")
+        
+        csv_files = glob.glob(os.path.join(odds_folder_path, "*.csv"))
+        
+        if not csv_files:
+            raise ValueError(f"No CSV files found in {odds_folder_path}")
+        
+        understat_data = self.process_understat_data(understat_file_path)
+        understat_lookup = self.create_understat_lookup(understat_data)
+        del understat_data
+        
+        print(f"Streaming {len(csv_files)} odds files...")
+        
+        total_matches = 0
+        matches_found = 0
+        date_offset_matches = 0
+        report_accumulator = ReportAccumulator()
+        
+        for file in csv_files:
+            df, messages = self._load_odds_file(file)
+            for message in messages:
+                print(message)
+            
+            if df is None:
+                continue
+            
+            self.processed_files.append(os.path.basename(file))
+            final_part = self._format_odds_partition(df, understat_lookup)
+            final_part['Index'] = range(total_matches + 1, total_matches + len(final_part) + 1)
+            
+            # First chunk creates the file and header, later chunks append
+            final_part.to_csv(output_path, mode='a' if total_matches else 'w',
+                              header=not total_matches, index=False)
+            report_accumulator.update(final_part)
+            
+            total_matches += len(final_part)
+            matches_found += self.merge_statistics['matched_xg']
+            date_offset_matches += self.merge_statistics['date_offset_matches']
+        
+        if self.cache is not None:
+            self.cache.evict()
+        
+        if not total_matches:
+            raise ValueError("No valid odds data could be loaded")
+        
+        self.merge_statistics['total_matches'] = total_matches
+        self.merge_statistics['matched_xg'] = matches_found
+        self.merge_statistics['coverage_rate'] = (matches_found / total_matches) * 100
+        self.merge_statistics['date_offset_matches'] = date_offset_matches
+        
+        print(f"Successfully matched {matches_found:,}/{total_matches:,} matches "
+              f"({self.merge_statistics['coverage_rate']:.1f}% coverage)")
+        print(f"Dataset saved successfully to: {output_path}")
+        
+        return report_accumulator.finalize(len(self.processed_files))
+
+    def _merge_incremental(self, odds_folder_path: str, understat_file_path: str,
+                           output_path: str) -> pd.DataFrame:
+        """
+        Rebuild only the season partitions whose odds file changed since the last run.
+        
+        A manifest next to the output records each odds file's content hash, its
+        row range in the output and its merge statistics. Unchanged partitions
+        are copied from the existing output as text; changed ones are joined
+        against the Understat lookup and spliced in. The Index column is then
+        renumbered, so the file matches a full rebuild.
+        
+        Args:
+            odds_folder_path: Path to folder containing odds CSV files
+            understat_file_path: Path to Understat CSV file
+            output_path: Path for output CSV file
+            
+        Returns:
+            Final integrated DataFrame built from the spliced rows in memory, with
+            the dtypes read_csv gives the output file (it is not read back)
+        """
+        if not os.path.exists(odds_folder_path):
+            raise FileNotFoundError(f"Odds folder not found: {odds_folder_path}")
+        
+        csv_files = glob.glob(os.path.join(odds_folder_path, "*.csv"))
+        
+        if not csv_files:
+            raise ValueError(f"No CSV files found in {odds_folder_path}")
+        
+        manifest_path = output_path + '.manifest.json'
+        settings = self._settings_fingerprint()
+        understat_hash = self._hash_file(understat_file_path)
+        file_hashes = [self._hash_file(file) for file in csv_files]
+        
+        manifest = self._load_manifest(manifest_path, output_path, settings, understat_hash)
+        previous = {}
+        existing_rows = None
+        
+        if manifest is not None:
+            previous = {part['file']: part for part in manifest['partitions']}
+            # Read as text so unchanged rows are copied byte for byte
+            existing_rows = pd.read_csv(output_path, dtype=str, keep_default_na=False)
+            if len(existing_rows) != sum(part['rows'] for part in manifest['partitions']):
+                print("  Output file does not match manifest, rebuilding all partitions")
+                previous = {}
+        
+        changed = [
+            (file, file_hash) for file, file_hash in zip(csv_files, file_hashes)
+            if previous.get(os.path.basename(file), {}).get('hash') != file_hash
+        ]
+        print(f"Incremental mode: {len(changed)}/{len(csv_files)} odds files new or changed")
+        
+        rebuilt = {}
+        if changed:
+            understat_data = self.process_understat_data(understat_file_path)
+            understat_lookup = self.create_understat_lookup(understat_data)
+            
+            for file, file_hash in changed:
+                df, messages = self._load_odds_file(file)
+                for message in messages:
+                    print(message)
+                
+                if df is None:
+                    continue
+                
+                self.processed_files.append(os.path.basename(file))
+                final_part = self._format_odds_partition(df, understat_lookup)
+                
+                rebuilt[os.path.basename(file)] = {
+                    'hash': file_hash,
+                    'rows': pd.read_csv(io.StringIO(final_part.to_csv(index=False)),
+                                        dtype=str, keep_default_na=False),
+                    'matched_xg': self.merge_statistics['matched_xg'],
+                    'date_offset_matches': self.merge_statistics['date_offset_matches']
+                }
+        
+        # Splice partitions back together in file order
+        partitions = []
+        part_frames = []
+        row_start = 0
+        
+        for file, file_hash in zip(csv_files, file_hashes):
+            name = os.path.basename(file)
+            
+            if name in rebuilt:
+                part = rebuilt[name]
+                rows = part['rows']
+            elif name in previous and previous[name]['hash'] == file_hash:
+                part = previous[name]
+                rows = existing_rows.iloc[part['start']:part['start'] + part['rows']]
+                self.processed_files.append(name)
+            else:
+                # File was skipped (empty or invalid) on this run
+                continue
+            
+            partitions.append({
+                'file': name,
+                'hash': file_hash,
+                'start': row_start,
+                'rows': len(rows),
+                'matched_xg': part['matched_xg'],
+                'date_offset_matches': part['date_offset_matches']
+            })
+            part_frames.append(rows)
+            row_start += len(rows)
+        
+        if not part_frames:
+            raise ValueError("No valid odds data could be loaded")
+        
+        final_text = pd.concat(part_frames, ignore_index=True)
+        final_text['Index'] = [str(position) for position in range(1, len(final_text) + 1)]
+        final_text.to_csv(output_path, index=False)
+        
+        with open(manifest_path, 'w', encoding='utf-8') as handle:
+            json.dump({
+                'settings': settings,
+                'understat_hash': understat_hash,
+                'partitions': partitions
+            }, handle, indent=2)
+        
+        total_matches = len(final_text)
+        matches_found = sum(part['matched_xg'] for part in partitions)
+        self.merge_statistics['total_matches'] = total_matches
+        self.merge_statistics['matched_xg'] = matches_found
+        self.merge_statistics['coverage_rate'] = (matches_found / total_matches) * 100
+        self.merge_statistics['date_offset_matches'] = sum(part['date_offset_matches'] for part in partitions)
+        self.merge_statistics['rebuilt_partitions'] = len(rebuilt)
+        
+        print(f"Dataset saved successfully to: {output_path}")
+        
+        return self._parse_text_rows(final_text)
+    
+    @staticmethod
+    def _parse_text_rows(text_rows: pd.DataFrame) -> pd.DataFrame:
+        """
+        Give rows held as CSV text the dtypes read_csv would give them.
+        
+        Args:
+            text_rows: Rows read or formatted with dtype=str and keep_default_na=False
+            
+        Returns:
+            New DataFrame with numeric columns converted and empty fields as NaN
+        """
+        parsed = {}
+        for column, values in text_rows.items():
+            values = values.replace('', np.nan)
+            try:
+                parsed[column] = pd.to_numeric(values)
+            except (ValueError, TypeError):
+                parsed[column] = values
+        return pd.DataFrame(parsed, index=text_rows.index)
+
+    def _spawn_worker(self) -> 'FootballDataMerger':
+        """
+        Create a merger with the same settings but its own per-run state.
+        
+        Returns:
+            New FootballDataMerger sharing configuration, team names, the input
+            cache and the run's stage metrics (not statistics or team IDs)
+        """
+        worker = FootballDataMerger(
+            date_tolerance_days=self.date_tolerance_days,
+            load_workers=self.load_workers,
+            projected_reads=self.projected_reads,
+            track_memory=self.track_memory,
+            metrics_path=self.metrics_path,
+            profile_dir=self.profile_dir,
+            profile_stages=self.profile_stages,
+            profile_mode=self.profile_mode
+        )
+        worker.team_index = self.team_index
+        worker.team_mapping = self.team_mapping
+        worker.cache = self.cache
+        # Stages of worker threads are recorded under the caller's current stage
+        worker.stage_metrics = self.stage_metrics
+        return worker
+
+    def _merge_league(self, league: str, understat_league: pd.DataFrame,
+                      season_frames: List[Tuple[str, pd.DataFrame]], output_folder: str) -> List[Dict]:
+        """
+        Merge one league's odds seasons with its Understat data, one file per season.
+        
+        Index numbering runs across the league's seasons in file order, so the
+        partitions of a league concatenate to its single-league dataset.
+        
+        Args:
+            league: Understat league name
+            understat_league: Understat rows of this league
+            season_frames: (season, loaded odds frame) pairs for the league's division
+            output_folder: Root folder of the partitioned output
+            
+        Returns:
+            One summary dictionary per written league-season partition
+        """
+        understat_lookup = self.create_understat_lookup(understat_league)
+        
+        league_folder = os.path.join(output_folder, league)
+        os.makedirs(league_folder, exist_ok=True)
+        
+        partitions = []
+        next_index = 1
+        
+        for season, odds_file_data in season_frames:
+            final_part = self._format_odds_partition(odds_file_data, understat_lookup)
+            final_part['Index'] = range(next_index, next_index + len(final_part))
+            next_index += len(final_part)
+            
+            partition_path = os.path.join(league_folder, f"{season}.csv")
+            final_part.to_csv(partition_path, index=False)
+            
+            partitions.append({
+                'league': league,
+                'division': self.LEAGUE_DIVISIONS[league],
+                'season': season,
+                'matches': len(final_part),
+                'matched_xg': self.merge_statistics['matched_xg'],
+                'path': partition_path
+            })
+        
+        return partitions
+
+    def merge_all_leagues(self, odds_folder_path: str, understat_file_path: str, output_folder: str,
+                          leagues: Optional[List[str]] = None, max_workers: int = 1) -> pd.DataFrame:
+        """
+        Merge every Understat league with its football-data.co.uk division in one run.
+        
+        The Understat file and the odds files are each read once. Odds rows are
+        split by their Div column into (league, season) partitions and leagues
+        are merged independently, in parallel when max_workers > 1. Output is
+        one CSV per league-season at output_folder/<league>/<season>.csv.
+        
+        Args:
+            odds_folder_path: Path to folder containing odds CSV files (any divisions)
+            understat_file_path: Path to Understat per-game CSV file
+            output_folder: Root folder for the partitioned output
+            leagues: Understat leagues to merge (defaults to all in LEAGUE_DIVISIONS)
+            max_workers: Number of leagues merged concurrently
+            
+        Returns:
+            DataFrame summarizing every written partition
         """
-        print("\n" + "="*60)
-        print("COMPREHENSIVE DATA INTEGRATION REPORT")
-        print("="*60)
-        
-        # Dataset overview
-        print(f"\nDataset Overview:")
-        print(f"   Total matches: {len(final_data):,}")
-        print(f"   Total columns: {len(final_data.columns)}")
-        print(f"   Files processed: {len(self.processed_files)}")
-        
-        # Data quality metrics
-        matches_with_xg = len(final_data[final_data['xG1'] > 0])
-        coverage_rate = (matches_with_xg / len(final_data)) * 100
-        
-        print(f"\nData Quality Metrics:")
-        print(f"   xG data coverage: {matches_with_xg:,}/{len(final_data):,} ({coverage_rate:.1f}%)")
-        print(f"   Complete records: {len(final_data.dropna()):,}")
-        print(f"   Missing data rate: {(final_data.isnull().sum().sum() / (len(final_data) * len(final_data.columns)) * 100):.1f}%")
-        
-        # Temporal analysis
-        final_data['Year'] = pd.to_datetime(final_data['Date'], format='%d.%m.%Y').dt.year
-        year_stats = final_data.groupby('Year').agg({
-            'xG1': lambda x: (x > 0).sum(),
-            'Date': 'count'
-        }).rename(columns={'Date': 'Total', 'xG1': 'WithXG'})
-        year_stats['Coverage%'] = (year_stats['WithXG'] / year_stats['Total'] * 100).round(1)
-        
-        print(f"\nCoverage by Year:")
-        for year, stats in year_stats.iterrows():
-            print(f"   {year}: {stats['WithXG']:,}/{stats['Total']:,} matches ({stats['Coverage%']:.1f}%)")
-        
-        # Key statistics
-        print(f"\nKey Statistics:")
-        print(f"   Average goals per match: {final_data[['G1', 'G2']].sum(axis=1).mean():.2f}")
-        print(f"   Average xG per match: {final_data[['xG1', 'xG2']].sum(axis=1).mean():.2f}")
-        print(f"   Home win rate: {(final_data['R'] == 'H').mean()*100:.1f}%")
-        print(f"   Draw rate: {(final_data['R'] == 'D').mean()*100:.1f}%")
-        print(f"   Away win rate: {(final_data['R'] == 'A').mean()*100:.1f}%")
-        
-        print(f"\nColumn Structure:")
-        print(f"   {final_data.columns.tolist()}")
-
-    def merge_all_data(self, odds_folder_path: str, understat_file_path: str, output_path: str) -> pd.DataFrame:
+        leagues = leagues or list(self.LEAGUE_DIVISIONS)
+        unknown = [league for league in leagues if league not in self.LEAGUE_DIVISIONS]
+        if unknown:
+            raise ValueError(f"No division code known for leagues: {unknown}")
+        
+        try:
+            print("Starting multi-league integration...")
+            print("="*60)
+            
+            # Every run gets its own metrics, shared with the league workers
+            self.stage_metrics = self._create_stage_metrics()
+            self.stage_metrics.start_memory_tracking()
+            
+            print("\nProcessing Understat xG data...")
+            with self.stage_metrics.stage('load_understat_data') as stage:
+                understat_data = self._load_understat_file(understat_file_path)
+                understat_by_league = {league: data for league, data in understat_data.groupby('league', sort=False)}
+                stage['rows_out'] = len(understat_data)
+            
+            if not os.path.exists(odds_folder_path):
+                raise FileNotFoundError(f"Odds folder not found: {odds_folder_path}")
+            
+            csv_files = glob.glob(os.path.join(odds_folder_path, "*.csv"))
+            print(f"\nProcessing {len(csv_files)} odds files...")
+            
+            # Split every loaded file by division into (league, season) partitions,
+            # keeping file order; parts of the same league-season are combined
+            league_by_division = {self.LEAGUE_DIVISIONS[league]: league for league in leagues}
+            partition_parts = {}
+            with self.stage_metrics.stage('load_odds_data') as stage:
+                for odds_file_data in self._load_odds_files(csv_files):
+                    if 'Div' not in odds_file_data.columns:
+                        print(f"  Warning: season {odds_file_data['Season'].iloc[0]} has no Div column, skipping...")
+                        continue
+                    
+                    for division, part in odds_file_data.groupby('Div', sort=False, observed=True):
+                        league = league_by_division.get(str(division))
+                        if league is not None:
+                            key = (league, part['Season'].iloc[0])
+                            partition_parts.setdefault(key, []).append(part)
+                stage['rows_out'] = len(partition_parts)
+            
+            season_frames_by_league = {}
+            for (league, season), parts in partition_parts.items():
+                season_frame = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0].copy()
+                season_frames_by_league.setdefault(league, []).append((season, season_frame))
+            
+            tasks = []
+            for league in leagues:
+                if league not in understat_by_league:
+                    print(f"  Skipping {league}: no Understat data")
+                elif league not in season_frames_by_league:
+                    print(f"  Skipping {league}: no odds data for division {self.LEAGUE_DIVISIONS[league]}")
+                else:
+                    tasks.append((league, understat_by_league[league].copy(), season_frames_by_league[league]))
+            
+            if not tasks:
+                raise ValueError("No league has both Understat and odds data")
+            
+            print(f"\nMerging {len(tasks)} leagues...")
+            
+            def run_task(task: Tuple[str, pd.DataFrame, List[Tuple[str, pd.DataFrame]]]) -> List[Dict]:
+                league, understat_league, season_frames = task
+                # Each league gets its own merger so per-run state is never shared
+                with self.stage_metrics.stage('merge_league', rows_in=len(understat_league), league=league) as stage:
+                    partitions = self._spawn_worker()._merge_league(league, understat_league, season_frames,
+                                                                    output_folder)
+                    stage['rows_out'] = sum(partition['matches'] for partition in partitions)
+                return partitions
+            
+            with self.stage_metrics.stage('merge_leagues', rows_in=len(tasks)) as stage:
+                if max_workers > 1:
+                    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                        league_results = list(executor.map(run_task, tasks))
+                else:
+                    league_results = [run_task(task) for task in tasks]
+                
+                summary = pd.DataFrame([partition for partitions in league_results for partition in partitions])
+                stage['rows_out'] = len(summary)
+            
+            print("\nLeague-season partitions written:")
+            for _, partition in summary.iterrows():
+                print(f"   {partition['league']} {partition['season']}: "
+                      f"{partition['matched_xg']:,}/{partition['matches']:,} matches with xG")
+            
+            return summary
+            
+        except Exception as e:
+            print(f"\nMulti-league integration failed: {str(e)}")
+            raise
+        
+        finally:
+            self.stage_metrics.stop_memory_tracking()
+            self.stage_metrics.print_summary()
+            if self.metrics_path:
+                self.stage_metrics.write_jsonl(self.metrics_path)
+            profile_folder = self.stage_metrics.write_profiles()
+            if profile_folder:
+                print(f"Stage profiles written to: {profile_folder}")
+
+    def merge_all_data(self, odds_folder_path: str, understat_file_path: str, output_path: str,
+                       incremental: bool = False, streaming: bool = False,
+                       output_format: str = 'csv') -> Optional[pd.DataFrame]:
         """
         Main orchestration method for complete data integration pipeline.
         
@@ -589,46 +1821,121 @@ class FootballDataMerger:
             odds_folder_path: Path to folder containing odds CSV files
             understat_file_path: Path to Understat CSV file
             output_path: Path for output CSV file
+            incremental: Only reprocess odds files that changed since the last
+                incremental run, splicing them into the existing output
+            streaming: Process and write one odds file at a time with bounded
+                memory; the dataset is only written to output_path
+            output_format: 'csv', 'columnar' or 'both'. Columnar output is a
+                typed ColumnarStore folder at columnar_output_path(output_path);
+                streaming mode writes CSV only and incremental mode needs the CSV
             
         Returns:
-            Final integrated DataFrame
+            Final integrated DataFrame, or None in streaming mode
             
         Raises:
+            ValueError: If output_format is unknown or not supported by the mode
             Exception: If any step in the pipeline fails
         """
+        if output_format not in self.OUTPUT_FORMATS:
+            raise ValueError(f"output_format must be one of {self.OUTPUT_FORMATS}, got {output_format!r}")
+        if streaming and output_format != 'csv':
+            raise ValueError("Streaming mode writes CSV output only")
+        if incremental and output_format == 'columnar':
+            raise ValueError("Incremental mode splices the CSV output; use output_format='both'")
+        
+        write_csv = output_format in ('csv', 'both')
+        write_columnar = output_format in ('columnar', 'both')
+        
         try:
             print("Starting Football Data Integration Pipeline...")
             print("="*60)
             
+            # Every run gets its own metrics (and run_id) for regression tracking
+            self.stage_metrics = self._create_stage_metrics()
+            self.stage_metrics.start_memory_tracking()
+            
+            if streaming:
+                print("\nSteps 1-5: Streaming odds files into the integrated dataset...")
+                with self.stage_metrics.stage('merge_streaming') as stage:
+                    self.integration_report = self._merge_streaming(odds_folder_path, understat_file_path, output_path)
+                    stage['rows_out'] = self.merge_statistics['total_matches']
+                # The report was accumulated while streaming; only print it here
+                with self.stage_metrics.stage('generate_comprehensive_report'):
+                    self.integration_report.print_report()
+                return None
+            
+            if incremental:
+                print("\nSteps 1-5: Incremental merge of changed season files...")
+                with self.stage_metrics.stage('merge_incremental') as stage:
+                    final_data = self._merge_incremental(odds_folder_path, understat_file_path, output_path)
+                    stage['rows_out'] = len(final_data)
+                if write_columnar:
+                    columnar_path = self.columnar_output_path(output_path)
+                    with self.stage_metrics.stage('save_columnar_output', rows_in=len(final_data)) as stage:
+                        self.save_typed_dataset(final_data, columnar_path)
+                        stage['rows_out'] = len(final_data)
+                    print(f"Typed columnar dataset saved to: {columnar_path}")
+                with self.stage_metrics.stage('generate_comprehensive_report', rows_in=len(final_data)):
+                    self.generate_comprehensive_report(final_data)
+                return final_data
+            
             # Step 1: Process odds data (primary source)
             print("\nStep 1: Processing betting odds data...")
-            odds_data = self.merge_odds_files(odds_folder_path)
+            with self.stage_metrics.stage('merge_odds_files') as stage:
+                odds_data = self.merge_odds_files(odds_folder_path)
+                stage['rows_out'] = len(odds_data)
             
             # Step 2: Process Understat data
             print("\nStep 2: Processing Understat xG data...")
-            understat_data = self.process_understat_data(understat_file_path)
+            with self.stage_metrics.stage('process_understat_data') as stage:
+                understat_data = self.process_understat_data(understat_file_path)
+                stage['rows_out'] = len(understat_data)
             
             # Step 3: Create lookup system
             print("\nStep 3: Creating intelligent lookup system...")
-            understat_lookup = self.create_understat_lookup(understat_data)
+            with self.stage_metrics.stage('create_understat_lookup', rows_in=len(understat_data)) as stage:
+                understat_lookup = self.create_understat_lookup(understat_data)
+                stage['rows_out'] = len(understat_lookup)
             
             # Step 4: Generate final dataset
             print("\nStep 4: Creating final analytics dataset...")
-            final_data = self.format_final_dataset(odds_data, understat_lookup)
+            with self.stage_metrics.stage('format_final_dataset', rows_in=len(odds_data)) as stage:
+                final_data = self.format_final_dataset(odds_data, understat_lookup)
+                stage['rows_out'] = len(final_data)
             
             # Step 5: Save results
             print("\nStep 5: Saving integrated dataset...")
-            final_data.to_csv(output_path, index=False)
-            print(f"Dataset saved successfully to: {output_path}")
+            if write_csv:
+                with self.stage_metrics.stage('save_output', rows_in=len(final_data)) as stage:
+                    final_data.to_csv(output_path, index=False)
+                    stage['rows_out'] = len(final_data)
+                print(f"Dataset saved successfully to: {output_path}")
+            
+            if write_columnar:
+                columnar_path = self.columnar_output_path(output_path)
+                with self.stage_metrics.stage('save_columnar_output', rows_in=len(final_data)) as stage:
+                    self.save_typed_dataset(final_data, columnar_path)
+                    stage['rows_out'] = len(final_data)
+                print(f"Typed columnar dataset saved to: {columnar_path}")
             
-            # Step 6: Generate comprehensive report
-            self.generate_comprehensive_report(final_data)
+            # Step 6: Generate comprehensive report (years come from the typed odds dates)
+            with self.stage_metrics.stage('generate_comprehensive_report', rows_in=len(final_data)):
+                self.generate_comprehensive_report(final_data, years=odds_data['Date'].dt.year.to_numpy())
             
             return final_data
             
         except Exception as e:
             print(f"\nPipeline failed: {str(e)}")
             raise
+        
+        finally:
+            self.stage_metrics.stop_memory_tracking()
+            self.stage_metrics.print_summary()
+            if self.metrics_path:
+                self.stage_metrics.write_jsonl(self.metrics_path)
+            profile_folder = self.stage_metrics.write_profiles()
+            if profile_folder:
+                print(f"Stage profiles written to: {profile_folder}")
 
 
 def main():
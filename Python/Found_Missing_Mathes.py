@@ -22,11 +22,193 @@ Features:
 """
 
 import pandas as pd
+import numpy as np
 import os
+import io
+import contextlib
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
-from difflib import SequenceMatcher
-import re
+
+from Columnar_Store import ColumnarStore
+from Pipeline_Metrics import PipelineMetrics
+from Team_Resolver import TeamNameIndex, TeamSimilarityMatrix
+
+class UnderstatGameIndex:
+    """
+    Understat per-game rows sorted by match day, with lookup indexes.
+    
+    Rows are stably sorted by day, so each day is one contiguous row range and
+    rows of a day keep their original order. Packed (day, team, h_a) keys map
+    to a team's rows of a day, so a candidate lookup only touches the games of
+    that day. An index can be written to a ColumnarStore folder and opened
+    memory-mapped, so several worker processes share one read-only copy.
+    """
+    
+    # Packed (day, team, h_a) key layout; team codes must stay below 2**20
+    KEY_DAY_SHIFT = 21
+    
+    def __init__(self, understat_data: pd.DataFrame):
+        """
+        Build the indexes.
+        
+        Rows without a team name can never be a candidate and are left out.
+        
+        Args:
+            understat_data: Understat per-game rows with a parsed 'date' column
+        """
+        missing_team = understat_data['team'].isna()
+        self.dropped_rows = int(missing_team.sum())
+        if self.dropped_rows:
+            print(f"   Warning: {self.dropped_rows} Understat rows without a team name were not indexed")
+            understat_data = understat_data[~missing_team]
+        
+        days = understat_data['date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+        order = np.argsort(days, kind='stable')
+        
+        # Team codes in order of first appearance, so the names double as the search vocabulary
+        team_codes, team_names = pd.factorize(understat_data['team'])
+        if len(team_names) >= 1 << (self.KEY_DAY_SHIFT - 1):
+            raise ValueError(f"Too many Understat teams to index: {len(team_names):,}")
+        
+        self._set_rows(
+            days=days[order],
+            dates=understat_data['date'].to_numpy()[order],
+            team_codes=team_codes[order],
+            vocabulary=list(team_names),
+            away=(understat_data['h_a'] == 'a').to_numpy()[order],
+            scored=understat_data['scored'].to_numpy()[order],
+            missed=understat_data['missed'].to_numpy()[order],
+            xg=understat_data['xG'].to_numpy()[order],
+            xpts=understat_data['xpts'].to_numpy()[order]
+        )
+        
+        # (date, team, h_a) index over sorted packed keys: day << 21 | team code << 1 | away flag
+        keys = (self.days << self.KEY_DAY_SHIFT) | (self.team_code_array.astype(np.int64) << 1) | self.away
+        self.key_positions = np.argsort(keys, kind='stable')
+        self.sorted_keys = keys[self.key_positions]
+    
+    def _set_rows(self, days: np.ndarray, dates: np.ndarray, team_codes: np.ndarray, vocabulary: List[str],
+                  away: np.ndarray, scored: np.ndarray, missed: np.ndarray, xg: np.ndarray,
+                  xpts: np.ndarray) -> None:
+        """Set the day-sorted row arrays and the lookups derived from them."""
+        self.days = days
+        self.dates = dates
+        self.team_code_array = team_codes
+        self.vocabulary = vocabulary
+        self.away = away
+        self.scored = scored
+        self.missed = missed
+        self.xg = xg
+        self.xpts = xpts
+        
+        # Team name of every row (a process-local object array)
+        self.teams = np.asarray(vocabulary, dtype=object)[team_codes]
+        self.team_codes = {name: code for code, name in enumerate(vocabulary)}
+        
+        # Date -> row range over the sorted rows
+        unique_days, starts = np.unique(self.days, return_index=True)
+        stops = np.append(starts[1:], len(self.days))
+        self.day_ranges = dict(zip(unique_days.tolist(), zip(starts.tolist(), stops.tolist())))
+    
+    def write(self, folder: str) -> None:
+        """
+        Write the index to a ColumnarStore folder.
+        
+        Args:
+            folder: Destination folder (created if needed)
+        """
+        ColumnarStore.write(pd.DataFrame({
+            'day': self.days,
+            'date': self.dates,
+            'team': pd.Categorical.from_codes(self.team_code_array, categories=pd.Index(self.vocabulary, dtype=object)),
+            'away': self.away,
+            'scored': self.scored,
+            'missed': self.missed,
+            'xG': self.xg,
+            'xpts': self.xpts,
+            'key_position': self.key_positions,
+            'sorted_key': self.sorted_keys
+        }), folder)
+    
+    @classmethod
+    def open(cls, folder: str, mmap_mode: Optional[str] = 'r') -> 'UnderstatGameIndex':
+        """
+        Open an index written by write().
+        
+        Numeric arrays stay memory maps, so processes opening the same folder
+        share their pages; only the team name lookups are rebuilt per process.
+        
+        Args:
+            folder: Folder the index was written to
+            mmap_mode: NumPy memory-map mode, or None to load the arrays into memory
+            
+        Returns:
+            UnderstatGameIndex over the stored rows
+        """
+        rows = ColumnarStore.read(folder, mmap_mode=mmap_mode)
+        team = rows['team'].array
+        
+        index = cls.__new__(cls)
+        index._set_rows(
+            days=rows['day'].to_numpy(),
+            dates=rows['date'].to_numpy(),
+            team_codes=team.codes,
+            vocabulary=list(team.categories),
+            away=rows['away'].to_numpy(),
+            scored=rows['scored'].to_numpy(),
+            missed=rows['missed'].to_numpy(),
+            xg=rows['xG'].to_numpy(),
+            xpts=rows['xpts'].to_numpy()
+        )
+        index.key_positions = rows['key_position'].to_numpy()
+        index.sorted_keys = rows['sorted_key'].to_numpy()
+        return index
+    
+    def __len__(self) -> int:
+        """Number of indexed Understat rows."""
+        return len(self.days)
+    
+    @staticmethod
+    def day_key(match_date: datetime.date) -> int:
+        """Day number (days since 1970-01-01) of a calendar date."""
+        return int(np.datetime64(match_date, 'D').astype(np.int64))
+    
+    def day_range(self, day: int) -> Tuple[int, int]:
+        """Sorted row range (start, stop) of a day; empty if no games were played."""
+        return self.day_ranges.get(day, (0, 0))
+    
+    def rows_for(self, day: int, team: str, side: str) -> np.ndarray:
+        """Sorted row positions of a team's home ('h') or away ('a') games on a day."""
+        code = self.team_codes.get(team)
+        if code is None:
+            return self.key_positions[:0]
+        
+        # Binary search of the sorted keys: no per-key Python objects to hold
+        key = (day << self.KEY_DAY_SHIFT) | (code << 1) | (side == 'a')
+        start, stop = np.searchsorted(self.sorted_keys, [key, key + 1])
+        return self.key_positions[start:stop]
+    
+    def game(self, position: int) -> Dict:
+        """
+        One Understat game as plain Python values.
+        
+        Args:
+            position: Row position in the sorted rows
+            
+        Returns:
+            Dictionary with date, team, scored, missed, xG and xpts
+        """
+        return {
+            'date': pd.Timestamp(self.dates[position]),
+            'team': self.teams[position],
+            'scored': self.scored[position].item(),
+            'missed': self.missed[position].item(),
+            'xG': self.xg[position].item(),
+            'xpts': self.xpts[position].item()
+        }
+
 
 class UnderstatMatchFinder:
     """
@@ -36,59 +218,41 @@ class UnderstatMatchFinder:
     provides confidence scores for potential matches.
     """
     
-    def __init__(self):
-        """Initialize with team mapping and fuzzy matching settings."""
-        self.team_mapping = self._create_team_mapping()
+    # Ways of splitting the template across worker processes
+    SHARD_MODES = ('date', 'league')
+    
+    # Date-range shards per worker, so uneven shards still keep every worker busy
+    SHARDS_PER_WORKER = 4
+    
+    def __init__(self, track_memory: bool = False, profile_dir: Optional[str] = None,
+                 profile_stages: Optional[List[str]] = None, profile_mode: str = 'both'):
+        """
+        Initialize with team mapping and fuzzy matching settings.
+        
+        Args:
+            track_memory: Record peak traced memory per stage (slower, uses tracemalloc)
+            profile_dir: Folder for per-stage cProfile (.prof) and allocation reports,
+                one subfolder per run (None disables profiling)
+            profile_stages: Stage names to profile, e.g. ['find_potential_matches']
+                (None profiles every stage)
+            profile_mode: 'cprofile', 'tracemalloc' or 'both' (allocation snapshots
+                are slow around per-row stages)
+        """
+        self.team_index = TeamNameIndex()
+        self.team_mapping = self.team_index.team_mapping
+        self.similarity_matrix = None
         self.found_matches = []
         self.match_confidence_threshold = 0.7
+        self.track_memory = track_memory
+        self.profile_dir = profile_dir
+        self.profile_stages = profile_stages
+        self.profile_mode = profile_mode
+        self.stage_metrics = self._create_stage_metrics()
     
-    def _create_team_mapping(self) -> Dict[str, str]:
-        """Create comprehensive team name mapping."""
-        return {
-            'Arsenal': 'Arsenal',
-            'Aston Villa': 'Aston Villa',
-            'Bournemouth': 'Bournemouth',
-            'Brighton': 'Brighton',
-            'Brighton and Hove Albion': 'Brighton',
-            'Burnley': 'Burnley',
-            'Cardiff': 'Cardiff',
-            'Cardiff City': 'Cardiff',
-            'Chelsea': 'Chelsea',
-            'Crystal Palace': 'Crystal Palace',
-            'Everton': 'Everton',
-            'Fulham': 'Fulham',
-            'Huddersfield': 'Huddersfield',
-            'Huddersfield Town': 'Huddersfield',
-            'Hull': 'Hull',
-            'Hull City': 'Hull',
-            'Leicester': 'Leicester',
-            'Leicester City': 'Leicester',
-            'Liverpool': 'Liverpool',
-            'Manchester City': 'Man City',
-            'Manchester United': 'Man United',
-            'Middlesbrough': 'Middlesbrough',
-            'Newcastle United': 'Newcastle',
-            'Norwich': 'Norwich',
-            'Norwich City': 'Norwich',
-            'QPR': 'QPR',
-            'Queens Park Rangers': 'QPR',
-            'Sheffield United': 'Sheffield United',
-            'Southampton': 'Southampton',
-            'Stoke': 'Stoke',
-            'Stoke City': 'Stoke',
-            'Sunderland': 'Sunderland',
-            'Swansea': 'Swansea',
-            'Swansea City': 'Swansea',
-            'Tottenham': 'Tottenham',
-            'Tottenham Hotspur': 'Tottenham',
-            'Watford': 'Watford',
-            'West Bromwich Albion': 'West Brom',
-            'West Brom': 'West Brom',
-            'West Ham': 'West Ham',
-            'West Ham United': 'West Ham',
-            'Wolverhampton Wanderers': 'Wolves',
-            'Wolves': 'Wolves'
-        }
+    def _create_stage_metrics(self) -> PipelineMetrics:
+        """Create a fresh metrics collector with this finder's tracking and profiling settings."""
+        return PipelineMetrics(self.track_memory, profile_dir=self.profile_dir,
+                               profile_stages=self.profile_stages, profile_mode=self.profile_mode)
     
     def _similarity_score(self, str1: str, str2: str) -> float:
         """
@@ -101,7 +265,40 @@ class UnderstatMatchFinder:
         Returns:
             Similarity score between 0 and 1
         """
-        return SequenceMatcher(None, str1.lower(), str2.lower()).ratio()
+        return self.team_index.similarity(str1, str2)
+    
+    def _build_similarity_matrix(self, missing_template: pd.DataFrame, understat_teams: List[str]) -> None:
+        """
+        Prepare the away team similarity matrix of a search.
+        
+        The finder searches one league, so one matrix of template away team names
+        by Understat team names serves the whole search. Cells are scored on first
+        use and then reused by every candidate with the same name pair. Missing
+        away team names are left out; their template rows have no candidates.
+        
+        Args:
+            missing_template: Template with missing matches
+            understat_teams: Team names of the Understat league
+        """
+        with self.stage_metrics.stage('build_similarity_matrix', rows_in=len(missing_template)) as stage:
+            self.similarity_matrix = TeamSimilarityMatrix(missing_template['AwayTeam'].dropna().unique(), understat_teams)
+            stage['rows_out'] = self.similarity_matrix.matrix.size
+    
+    def _away_similarity(self, found_team: str, expected_team: str) -> float:
+        """
+        Similarity of a found Understat away team to the expected one.
+        
+        Args:
+            found_team: Understat team name
+            expected_team: Template away team name
+            
+        Returns:
+            Similarity score between 0 and 1, identical to _similarity_score
+        """
+        if self.similarity_matrix is None:
+            return self._similarity_score(found_team, expected_team)
+        
+        return self.similarity_matrix.score(expected_team, found_team)
     
     def _normalize_team_name(self, team_name: str) -> str:
         """
@@ -113,25 +310,15 @@ class UnderstatMatchFinder:
         Returns:
             Normalized team name
         """
-        # Remove common prefixes/suffixes
-        normalized = re.sub(r'\b(FC|AFC|United|City|Town)\b', '', team_name, flags=re.IGNORECASE)
-        normalized = normalized.strip()
-        
-        # Handle common variations
-        variations = {
-            'Man Utd': 'Manchester United',
-            'Man City': 'Manchester City',
-            'Spurs': 'Tottenham',
-            'Arsenal FC': 'Arsenal',
-            'Chelsea FC': 'Chelsea'
-        }
-        
-        return variations.get(normalized, normalized)
+        return self.team_index.normalize(team_name)
     
     def _find_best_team_match(self, target_team: str, available_teams: List[str]) -> Tuple[str, float]:
         """
         Find the best matching team name from available options.
         
+        The team index keeps its vocabulary between calls, so the available
+        names are indexed once and each distinct target is resolved once.
+        
         Args:
             target_team: Team name to match
             available_teams: List of available team names
@@ -139,33 +326,7 @@ class UnderstatMatchFinder:
         Returns:
             Tuple of (best_match, confidence_score)
         """
-        normalized_target = self._normalize_team_name(target_team)
-        best_match = ""
-        best_score = 0.0
-        
-        for team in available_teams:
-            normalized_team = self._normalize_team_name(team)
-            
-            # Direct mapping check
-            if target_team in self.team_mapping.values():
-                reverse_mapping = {v: k for k, v in self.team_mapping.items()}
-                if target_team in reverse_mapping:
-                    mapped_name = reverse_mapping[target_team]
-                    if self._similarity_score(mapped_name, team) > 0.8:
-                        return team, 1.0
-            
-            # Similarity score
-            score = self._similarity_score(normalized_target, normalized_team)
-            
-            # Boost score for exact substring matches
-            if normalized_target.lower() in normalized_team.lower() or normalized_team.lower() in normalized_target.lower():
-                score += 0.2
-            
-            if score > best_score:
-                best_score = score
-                best_match = team
-        
-        return best_match, min(best_score, 1.0)
+        return self.team_index.set_vocabulary(available_teams).resolve(target_team)
     
     def load_missing_template(self, template_path: str) -> pd.DataFrame:
         """
@@ -187,12 +348,13 @@ class UnderstatMatchFinder:
         
         return df
     
-    def load_understat_data(self, understat_path: str) -> pd.DataFrame:
+    def load_understat_data(self, understat_path: str, leagues: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Load and prepare Understat dataset.
         
         Args:
             understat_path: Path to Understat CSV file
+            leagues: Understat leagues to keep (default: EPL only)
             
         Returns:
             Processed Understat DataFrame
@@ -204,26 +366,50 @@ class UnderstatMatchFinder:
         
         df = pd.read_csv(understat_path)
         
-        # Filter for EPL only
-        epl_data = df[df['league'] == 'EPL'].copy()
+        # Filter for the searched leagues (EPL only by default)
+        leagues = leagues or ['EPL']
+        league_data = df[df['league'].isin(leagues)].copy()
         
-        if epl_data.empty:
-            raise ValueError("No EPL data found in Understat file")
+        if league_data.empty:
+            raise ValueError(f"No {', '.join(leagues)} data found in Understat file")
         
         # Parse dates
-        epl_data['date'] = pd.to_datetime(epl_data['date'])
+        league_data['date'] = pd.to_datetime(league_data['date'])
         
-        print(f"Loaded {len(epl_data)} Understat records for EPL")
-        return epl_data
+        print(f"Loaded {len(league_data)} Understat records for {', '.join(leagues)}")
+        return league_data
     
-    def search_matches_in_understat(self, missing_template: pd.DataFrame, 
-                                   understat_data: pd.DataFrame) -> pd.DataFrame:
+    def _prepare_search(self, missing_template: pd.DataFrame, understat_data: Optional[pd.DataFrame],
+                        understat_index: Optional[UnderstatGameIndex]) -> UnderstatGameIndex:
+        """
+        Build the game index if needed and set up team resolution for a search.
+        
+        Args:
+            missing_template: Template with missing matches
+            understat_data: Understat dataset (unused if understat_index is given)
+            understat_index: Prebuilt index of the Understat dataset, or None
+            
+        Returns:
+            The game index to search
+        """
+        if understat_index is None:
+            with self.stage_metrics.stage('build_understat_index', rows_in=len(understat_data)) as stage:
+                understat_index = UnderstatGameIndex(understat_data)
+                stage['rows_out'] = len(understat_index.day_ranges)
+        
+        self.team_index.set_vocabulary(understat_index.vocabulary)
+        self._build_similarity_matrix(missing_template, understat_index.vocabulary)
+        return understat_index
+    
+    def search_matches_in_understat(self, missing_template: pd.DataFrame, understat_data: Optional[pd.DataFrame],
+                                    understat_index: Optional[UnderstatGameIndex] = None) -> pd.DataFrame:
         """
         Search for missing matches in Understat dataset.
         
         Args:
             missing_template: Template with missing matches
-            understat_data: Understat dataset
+            understat_data: Understat dataset (may be None if understat_index is given)
+            understat_index: Prebuilt index of the Understat dataset (built here if None)
             
         Returns:
             DataFrame with found matches and confidence scores
@@ -231,7 +417,8 @@ class UnderstatMatchFinder:
         print("Searching for matches in Understat dataset...")
         
         found_matches = []
-        understat_teams = understat_data['team'].unique().tolist()
+        understat_index = self._prepare_search(missing_template, understat_data, understat_index)
+        understat_teams = understat_index.vocabulary
         
         for idx, missing_match in missing_template.iterrows():
             print(f"Searching for match {idx + 1}/{len(missing_template)}: {missing_match['HomeTeam']} vs {missing_match['AwayTeam']}")
@@ -243,11 +430,18 @@ class UnderstatMatchFinder:
             home_goals = missing_match['HomeGoals']
             away_goals = missing_match['AwayGoals']
             
+            # Without both team names there is nothing to match against
+            if pd.isna(home_team) or pd.isna(away_team):
+                print(f"  No potential matches found (team name missing)")
+                continue
+            
             # Find potential matches in Understat
-            potential_matches = self._find_potential_matches(
-                understat_data, target_date, home_team, away_team, 
-                home_goals, away_goals, understat_teams
-            )
+            with self.stage_metrics.stage('find_potential_matches') as stage:
+                potential_matches = self._find_potential_matches(
+                    understat_index, target_date, home_team, away_team, 
+                    home_goals, away_goals, understat_teams
+                )
+                stage['rows_out'] = len(potential_matches)
             
             if potential_matches:
                 best_match = max(potential_matches, key=lambda x: x['confidence'])
@@ -283,28 +477,235 @@ class UnderstatMatchFinder:
             else:
                 print(f"  No potential matches found")
         
-        if found_matches:
-            results_df = pd.DataFrame(found_matches)
-            print(f"\nFound {len(results_df)} potential matches")
-            print(f"High confidence matches (>0.8): {len(results_df[results_df['Match_Confidence'] > 0.8])}")
-            print(f"Medium confidence matches (0.6-0.8): {len(results_df[(results_df['Match_Confidence'] > 0.6) & (results_df['Match_Confidence'] <= 0.8)])}")
-            print(f"Low confidence matches (<0.6): {len(results_df[results_df['Match_Confidence'] <= 0.6])}")
-            return results_df
-        else:
+        return self._summarize_found_matches(pd.DataFrame(found_matches))
+    
+    def _summarize_found_matches(self, results_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Print the confidence breakdown of a search result.
+        
+        Args:
+            results_df: Found matches, one row per template match
+            
+        Returns:
+            The same DataFrame (empty if nothing was found)
+        """
+        if results_df.empty:
             print("No matches found in Understat dataset")
             return pd.DataFrame()
+        
+        print(f"\nFound {len(results_df)} potential matches")
+        print(f"High confidence matches (>0.8): {len(results_df[results_df['Match_Confidence'] > 0.8])}")
+        print(f"Medium confidence matches (0.6-0.8): {len(results_df[(results_df['Match_Confidence'] > 0.6) & (results_df['Match_Confidence'] <= 0.8)])}")
+        print(f"Low confidence matches (<0.6): {len(results_df[results_df['Match_Confidence'] <= 0.6])}")
+        return results_df
+    
+    def search_matches_batch(self, missing_template: pd.DataFrame, understat_data: Optional[pd.DataFrame],
+                             understat_index: Optional[UnderstatGameIndex] = None) -> pd.DataFrame:
+        """
+        Search for all missing matches at once with table joins.
+        
+        Produces the same rows as search_matches_in_understat. The template is
+        joined to Understat home games on (date, home team, home goals) and to
+        the paired away games on (kick-off, away goals, home goals conceded);
+        template rows without such a pair fall back to a join on total goals.
+        Rows missing a team name have no candidates.
+        Candidates are then scored with array operations and the first best
+        candidate of each template row is kept, as in the row-by-row search.
+        
+        Args:
+            missing_template: Template with missing matches
+            understat_data: Understat dataset (may be None if understat_index is given)
+            understat_index: Prebuilt index of the Understat dataset (built here if None)
+            
+        Returns:
+            DataFrame with found matches and confidence scores
+        """
+        print(f"Searching for {len(missing_template):,} matches in Understat dataset (batch mode)...")
+        
+        understat_index = self._prepare_search(missing_template, understat_data, understat_index)
+        understat_teams = understat_index.vocabulary
+        
+        template = missing_template.reset_index(drop=True)
+        
+        # Template side: day, resolved home team and its confidence, goals
+        home_teams = template['HomeTeam'].dropna().unique().tolist()
+        resolved = [self._find_best_team_match(team, understat_teams) for team in home_teams]
+        home_lookup = pd.DataFrame(resolved, index=home_teams, columns=['home_match', 'home_confidence'])
+        
+        targets = pd.DataFrame({
+            'row': np.arange(len(template)),
+            'day': pd.to_datetime(template['Date'], format='%d.%m.%Y').to_numpy().astype('datetime64[D]').astype(np.int64),
+            'home_match': home_lookup['home_match'].reindex(template['HomeTeam']).to_numpy(),
+            'home_confidence': home_lookup['home_confidence'].reindex(template['HomeTeam']).to_numpy(),
+            'home_goals': template['HomeGoals'].to_numpy(dtype=float),
+            'away_goals': template['AwayGoals'].to_numpy(dtype=float)
+        })
+        targets = targets[template['HomeTeam'].notna().to_numpy() & template['AwayTeam'].notna().to_numpy()]
+        
+        # Understat side: home and away games, positions in day order
+        games = pd.DataFrame({
+            'position': np.arange(len(understat_index)),
+            'day': understat_index.days,
+            'date': understat_index.dates,
+            'team': understat_index.teams,
+            'scored': understat_index.scored.astype(float),
+            'missed': understat_index.missed.astype(float)
+        })
+        is_away = understat_index.away
+        home_games = games[~is_away].rename(columns={'team': 'home_match', 'position': 'home_position'})
+        away_games = games[is_away].drop(columns='day').rename(columns={
+            'team': 'away_team_found', 'position': 'away_position',
+            'scored': 'away_scored', 'missed': 'away_missed'
+        })
+        
+        # Strategy 1: exact date, home team and score
+        exact = targets.merge(
+            home_games.rename(columns={'scored': 'home_goals'}).drop(columns='missed'),
+            on=['day', 'home_match', 'home_goals']
+        )
+        exact = exact.merge(
+            away_games,
+            left_on=['date', 'away_goals', 'home_goals'],
+            right_on=['date', 'away_scored', 'away_missed']
+        )
+        away_similarity = self._exact_pair_similarities(exact, template['AwayTeam'].to_numpy()[exact['row'].to_numpy()])
+        exact['confidence'] = (exact['home_confidence'] * 0.6) + (away_similarity * 0.4)
+        
+        # Pairs left unscored could not have been the best candidate of their row
+        scored = ~np.isnan(away_similarity)
+        exact, away_similarity = exact[scored].copy(), away_similarity[scored]
+        exact['away_team_switched'] = away_similarity < 0.8
+        exact['score_match'] = True
+        exact['note'] = ''
+        
+        # Strategy 2: rows without an exact pair, matching total goals instead
+        fallback_targets = targets[~targets['row'].isin(exact['row'])]
+        fallback = fallback_targets.merge(home_games.drop(columns='missed'), on=['day', 'home_match'])
+        fallback = fallback.merge(away_games, left_on=['date', 'scored'], right_on=['date', 'away_missed'])
+        fallback = fallback[fallback['scored'] + fallback['away_scored'] ==
+                            fallback['home_goals'] + fallback['away_goals']].copy()
+        fallback['confidence'] = fallback['home_confidence'] * 0.4
+        fallback['away_team_switched'] = True
+        fallback['score_match'] = False
+        fallback['note'] = 'Exact score mismatch but total goals match'
+        
+        # Best candidate per row: highest confidence, earliest (home, away) game on ties
+        candidates = pd.concat([exact, fallback], ignore_index=True)
+        candidates = candidates[candidates['confidence'] >= self.match_confidence_threshold]
+        candidates = candidates.sort_values(
+            ['row', 'confidence', 'home_position', 'away_position'],
+            ascending=[True, False, True, True], kind='stable'
+        ).drop_duplicates('row')
+        
+        return self._summarize_found_matches(self._format_batch_matches(template, candidates, understat_index))
+    
+    def _exact_pair_similarities(self, exact: pd.DataFrame, expected_teams: np.ndarray) -> np.ndarray:
+        """
+        Away team similarities of exact-score candidates, scored only where they can matter.
+        
+        Candidates of a row are visited from the highest quick_ratio bound down,
+        scoring their cells in the similarity matrix, until no unscored candidate
+        could still reach the row's best confidence. Confidence grows with the
+        similarity, so skipped candidates are strictly worse than the chosen one
+        and the best candidate per row is exactly as if all had been scored.
+        
+        Args:
+            exact: Strategy 1 candidates with row, home_confidence, positions and away_team_found
+            expected_teams: Template away team names, aligned with exact
+            
+        Returns:
+            float64 array of similarity scores, NaN for candidates left unscored
+        """
+        if exact.empty:
+            return np.empty(0)
+        
+        matrix = self.similarity_matrix
+        expected_codes, found_codes = matrix.codes(expected_teams, exact['away_team_found'])
+        home_confidence = exact['home_confidence'].to_numpy(dtype=float)
+        rows = exact['row'].to_numpy()
+        
+        confidence_bounds = (home_confidence * 0.6) + (matrix.bounds(expected_codes, found_codes) * 0.4)
+        order = np.lexsort((exact['away_position'].to_numpy(), exact['home_position'].to_numpy(),
+                            -confidence_bounds, rows))
+        
+        similarity = matrix.computed(expected_codes, found_codes)
+        best_confidence = np.full(rows.max() + 1, -np.inf)
+        while True:
+            confidence = (home_confidence * 0.6) + (similarity * 0.4)
+            np.fmax.at(best_confidence, rows, confidence)
+            
+            pending = np.isnan(similarity) & (confidence_bounds >= best_confidence[rows])
+            if not pending.any():
+                return similarity
+            
+            # Score the highest-bound pending candidate of each row
+            ordered = order[pending[order]]
+            ordered_rows = rows[ordered]
+            first = ordered[np.r_[True, ordered_rows[1:] != ordered_rows[:-1]]]
+            matrix.lookup(expected_codes[first], found_codes[first])
+            similarity = matrix.computed(expected_codes, found_codes)
+    
+    def _format_batch_matches(self, template: pd.DataFrame, candidates: pd.DataFrame,
+                              understat_index: UnderstatGameIndex) -> pd.DataFrame:
+        """
+        Lay out the chosen candidates like the row-by-row search results.
+        
+        Args:
+            template: Missing matches template with a default index
+            candidates: One chosen candidate per template row, in template order
+            understat_index: Index the candidate positions refer to
+            
+        Returns:
+            DataFrame with the columns of search_matches_in_understat
+        """
+        if candidates.empty:
+            return pd.DataFrame()
+        
+        rows = candidates['row'].to_numpy()
+        home_positions = candidates['home_position'].to_numpy()
+        away_positions = candidates['away_position'].to_numpy()
+        matched = template.iloc[rows]
+        
+        return pd.DataFrame({
+            'Template_Index': matched['Index'].to_numpy(),
+            'Template_Date': matched['Date'].to_numpy(),
+            'Template_HomeTeam': matched['HomeTeam'].to_numpy(),
+            'Template_AwayTeam': matched['AwayTeam'].to_numpy(),
+            'Template_HomeGoals': matched['HomeGoals'].to_numpy(),
+            'Template_AwayGoals': matched['AwayGoals'].to_numpy(),
+            'Template_Result': matched['Result'].to_numpy(),
+            
+            'Found_Date': pd.DatetimeIndex(understat_index.dates[home_positions]).strftime('%Y-%m-%d'),
+            'Found_HomeTeam': understat_index.teams[home_positions],
+            'Found_AwayTeam': understat_index.teams[away_positions],
+            'Found_HomeGoals': understat_index.scored[home_positions],
+            'Found_AwayGoals': understat_index.scored[away_positions],
+            
+            'Home_xG': understat_index.xg[home_positions],
+            'Away_xG': understat_index.xg[away_positions],
+            'Home_xpts': understat_index.xpts[home_positions],
+            'Away_xpts': understat_index.xpts[away_positions],
+            
+            'Match_Confidence': [round(confidence, 3) for confidence in candidates['confidence'].tolist()],
+            'Away_Team_Switched': candidates['away_team_switched'].to_numpy(dtype=bool),
+            'Expected_Away_Team': matched['AwayTeam'].to_numpy(),
+            'Found_Away_Team': understat_index.teams[away_positions],
+            'Score_Match': candidates['score_match'].to_numpy(dtype=bool),
+            'Notes': candidates['note'].to_numpy(dtype=object)
+        })
     
-    def _find_potential_matches(self, understat_data: pd.DataFrame, target_date: datetime.date,
+    def _find_potential_matches(self, understat_index: UnderstatGameIndex, target_date: datetime.date,
                                home_team: str, away_team: str, home_goals: int, away_goals: int,
                                understat_teams: List[str]) -> List[Dict]:
         """
         Find potential matches in Understat for a specific missing match.
         
         Focus on exact date and result matching, with flexible away team matching
-        since Understat sometimes has switched away teams.
+        since Understat sometimes has switched away teams. Only the games of the
+        target day are examined, through the index's row range and team lookup.
         
         Args:
-            understat_data: Understat dataset
+            understat_index: Index over the Understat dataset
             target_date: Target match date (must be exact)
             home_team: Expected home team (must match)
             away_team: Expected away team (may be switched)
@@ -317,38 +718,46 @@ class UnderstatMatchFinder:
         """
         potential_matches = []
         
-        # Filter by EXACT date only
-        date_filtered = understat_data[understat_data['date'].dt.date == target_date]
+        # Filter by EXACT date only: the day's contiguous row range
+        day = understat_index.day_key(target_date)
+        day_start, day_stop = understat_index.day_range(day)
         
-        if date_filtered.empty:
+        if day_start == day_stop:
             return potential_matches
         
+        day_dates = understat_index.dates[day_start:day_stop]
+        day_away = understat_index.away[day_start:day_stop]
+        day_scored = understat_index.scored[day_start:day_stop]
+        day_missed = understat_index.missed[day_start:day_stop]
+        
         # Find best team matches
         home_match, home_confidence = self._find_best_team_match(home_team, understat_teams)
         away_match, away_confidence = self._find_best_team_match(away_team, understat_teams)
         
-        # Strategy 1: Look for correct home team with exact result
-        home_games = date_filtered[
-            (date_filtered['team'] == home_match) & 
-            (date_filtered['h_a'] == 'h') &
-            (date_filtered['scored'] == home_goals)
-        ]
+        home_positions = understat_index.rows_for(day, home_match, 'h')
         
-        for _, home_game in home_games.iterrows():
+        # Strategy 1: Look for correct home team with exact result
+        for home_position in home_positions:
+            if understat_index.scored[home_position] != home_goals:
+                continue
+            home_game = understat_index.game(home_position)
+            
             # Find corresponding away game with exact result
-            away_games = date_filtered[
-                (date_filtered['date'] == home_game['date']) &
-                (date_filtered['h_a'] == 'a') &
-                (date_filtered['scored'] == away_goals) &
-                (date_filtered['missed'] == home_goals)
-            ]
-            
-            for _, away_game in away_games.iterrows():
+            away_positions = day_start + np.flatnonzero(
+                (day_dates == understat_index.dates[home_position]) &
+                day_away &
+                (day_scored == away_goals) &
+                (day_missed == home_goals)
+            )
+            
+            for away_position in away_positions:
+                away_game = understat_index.game(away_position)
+                
                 # Calculate confidence based on team matching quality
                 # Date and score are perfect (required), so focus on teams
                 
                 # Check if away team matches expected
-                away_team_confidence = self._similarity_score(away_game['team'], away_team)
+                away_team_confidence = self._away_similarity(away_game['team'], away_team)
                 
                 # Overall confidence based on team matching
                 overall_confidence = (home_confidence * 0.6) + (away_team_confidence * 0.4)
@@ -377,19 +786,17 @@ class UnderstatMatchFinder:
         if not potential_matches:
             total_goals = home_goals + away_goals
             
-            home_games_alt = date_filtered[
-                (date_filtered['team'] == home_match) & 
-                (date_filtered['h_a'] == 'h')
-            ]
-            
-            for _, home_game in home_games_alt.iterrows():
-                away_games_alt = date_filtered[
-                    (date_filtered['date'] == home_game['date']) &
-                    (date_filtered['h_a'] == 'a') &
-                    (date_filtered['missed'] == home_game['scored'])
-                ]
+            for home_position in home_positions:
+                home_game = understat_index.game(home_position)
+                
+                away_positions = day_start + np.flatnonzero(
+                    (day_dates == understat_index.dates[home_position]) &
+                    day_away &
+                    (day_missed == understat_index.scored[home_position])
+                )
                 
-                for _, away_game in away_games_alt.iterrows():
+                for away_position in away_positions:
+                    away_game = understat_index.game(away_position)
                     game_total = home_game['scored'] + away_game['scored']
                     
                     if game_total == total_goals:
@@ -423,6 +830,168 @@ class UnderstatMatchFinder:
         return [match for match in potential_matches 
                 if match['confidence'] >= self.match_confidence_threshold]
     
+    @staticmethod
+    def _resolve_shard_by(missing_template: pd.DataFrame, shard_by: str) -> str:
+        """
+        Sharding actually used for a template.
+        
+        Templates written before Missing_Matches added the League column cannot
+        be sharded by league; they are sharded by date instead.
+        
+        Args:
+            missing_template: Template with missing matches
+            shard_by: Requested sharding, 'date' or 'league'
+            
+        Returns:
+            'league' if requested and the template has a League column, else 'date'
+        """
+        if shard_by == 'league' and 'League' not in missing_template.columns:
+            print("Warning: template has no League column, sharding by date instead")
+            return 'date'
+        
+        return shard_by
+    
+    @staticmethod
+    def _template_leagues(missing_template: pd.DataFrame) -> List[str]:
+        """
+        Leagues of the template rows, for league sharding.
+        
+        Args:
+            missing_template: Template with a League column of Understat league names
+            
+        Returns:
+            League names in order of first appearance, without missing values
+        """
+        return missing_template['League'].dropna().unique().tolist()
+    
+    @staticmethod
+    def _date_shards(missing_template: pd.DataFrame, shard_count: int) -> List[np.ndarray]:
+        """
+        Split template rows into contiguous date ranges of about equal size.
+        
+        Args:
+            missing_template: Template rows to split
+            shard_count: Number of date-range shards
+            
+        Returns:
+            Ascending row positions per non-empty shard
+        """
+        days = pd.to_datetime(missing_template['Date'], format='%d.%m.%Y').to_numpy()
+        order = np.argsort(days, kind='stable')
+        return [np.sort(positions) for positions in np.array_split(order, shard_count) if len(positions)]
+    
+    def _shard_template(self, missing_template: pd.DataFrame, shard_by: str,
+                        shard_count: int) -> List[Tuple[Optional[str], np.ndarray]]:
+        """
+        Split the template rows into shards.
+        
+        Args:
+            missing_template: Template with missing matches
+            shard_by: 'date' for contiguous date ranges of about equal size,
+                'league' for one shard per League value (needs a League column);
+                rows without a League value are sharded by date
+            shard_count: Number of date-range shards
+            
+        Returns:
+            (league or None, ascending template row positions) per shard;
+            None shards are searched against all Understat leagues
+        """
+        if shard_by == 'league':
+            leagues = missing_template['League']
+            shards = [(league, np.flatnonzero(leagues.to_numpy() == league))
+                      for league in self._template_leagues(missing_template)]
+            
+            without_league = np.flatnonzero(leagues.isna().to_numpy())
+            if len(without_league):
+                print(f"Warning: {len(without_league)} template rows have no League, "
+                      f"searching them in all leagues")
+                shards += [(None, without_league[positions])
+                           for positions in self._date_shards(missing_template.iloc[without_league], shard_count)]
+            return shards
+        
+        return [(None, positions) for positions in self._date_shards(missing_template, shard_count)]
+    
+    def search_matches_parallel(self, missing_template: pd.DataFrame, understat_data: pd.DataFrame,
+                                workers: int, shard_by: str = 'date', batch: bool = False) -> pd.DataFrame:
+        """
+        Search for missing matches with the template sharded across worker processes.
+        
+        The Understat index is written once to a temporary ColumnarStore folder
+        (one per league when sharding by league) and every worker opens it
+        memory-mapped, so the index is shared rather than sent with each task;
+        tasks carry only their template rows. Shard results are put back in
+        template order, so date sharding returns exactly the rows of the
+        single-process search. League shards are searched against their own
+        league's Understat rows; template rows without a League value are
+        sharded by date and searched against all of understat_data, and
+        templates without a League column are sharded by date.
+        
+        Args:
+            missing_template: Template with missing matches
+            understat_data: Understat dataset (all leagues to search)
+            workers: Number of worker processes
+            shard_by: 'date' or 'league' (by date if the template has no League column)
+            batch: Search each shard with search_matches_batch instead of row by row
+            
+        Returns:
+            DataFrame with found matches and confidence scores
+            
+        Raises:
+            ValueError: If workers or shard_by are invalid
+        """
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        if shard_by not in self.SHARD_MODES:
+            raise ValueError(f"shard_by must be one of {self.SHARD_MODES}, got {shard_by!r}")
+        shard_by = self._resolve_shard_by(missing_template, shard_by)
+        
+        # Template positions travel through the workers in the Index column
+        template = missing_template.reset_index(drop=True)
+        template_index = template['Index'].to_numpy()
+        search_template = template.assign(Index=np.arange(len(template)))
+        
+        shards = self._shard_template(template, shard_by, workers * self.SHARDS_PER_WORKER)
+        print(f"Searching for {len(template):,} matches in {len(shards)} shards by {shard_by} "
+              f"with {workers} workers...")
+        
+        with tempfile.TemporaryDirectory(prefix='understat_index_') as index_root:
+            with self.stage_metrics.stage('write_understat_index', rows_in=len(understat_data)) as stage:
+                if shard_by == 'league':
+                    league_data = dict(tuple(understat_data.groupby('league', sort=False)))
+                    league_data[None] = understat_data
+                else:
+                    league_data = {None: understat_data}
+                
+                index_folders = {}
+                for league in dict.fromkeys(league for league, _ in shards):
+                    if league not in league_data:
+                        print(f"  Skipping {league}: no Understat data")
+                        continue
+                    index_folders[league] = os.path.join(index_root, str(league))
+                    UnderstatGameIndex(league_data[league]).write(index_folders[league])
+                stage['rows_out'] = len(index_folders)
+            
+            tasks = [(index_folders[league], search_template.take(positions), batch)
+                     for league, positions in shards if league in index_folders]
+            
+            with self.stage_metrics.stage('search_shards', rows_in=len(tasks)) as stage:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_search_worker,
+                                         initargs=(self.team_mapping, self.match_confidence_threshold)) as executor:
+                    shard_results = list(executor.map(_search_shard, tasks))
+                stage['rows_out'] = sum(len(result) for result in shard_results)
+        
+        shard_results = [result for result in shard_results if not result.empty]
+        if not shard_results:
+            return self._summarize_found_matches(pd.DataFrame())
+        
+        # Template order, then the template's own Index values back
+        found_matches = pd.concat(shard_results, ignore_index=True)
+        positions = found_matches['Template_Index'].to_numpy()
+        found_matches = found_matches.take(np.argsort(positions, kind='stable')).reset_index(drop=True)
+        found_matches['Template_Index'] = template_index[np.sort(positions)]
+        
+        return self._summarize_found_matches(found_matches)
+    
     def export_found_matches(self, found_matches: pd.DataFrame, output_path: str) -> None:
         """
         Export found matches to CSV for manual verification.
@@ -507,7 +1076,8 @@ class UnderstatMatchFinder:
         print(f"  4. Use the xG values from high-confidence matches")
         print(f"  5. For unmatched entries, search manually in Understat by date and home team")
     
-    def run_match_search(self, template_path: str, understat_path: str, output_folder: str) -> None:
+    def run_match_search(self, template_path: str, understat_path: str, output_folder: str,
+                         batch: bool = False, workers: int = 1, shard_by: str = 'date') -> None:
         """
         Run complete match search workflow.
         
@@ -515,31 +1085,117 @@ class UnderstatMatchFinder:
             template_path: Path to missing matches template
             understat_path: Path to Understat dataset
             output_folder: Output folder for results
+            batch: Search the whole template at once with table joins
+                (search_matches_batch) instead of row by row; same results
+            workers: Number of worker processes; above 1 the template is sharded
+                across a process pool (search_matches_parallel)
+            shard_by: 'date' or 'league' sharding when workers > 1; league
+                sharding searches each template league against its own
+                Understat league (by date if the template has no League column);
+                rows without a League value search every loaded league and EPL
         """
         print("Starting Understat match search...")
         print("="*50)
         
         try:
+            # Every run gets its own metrics (and profiles)
+            self.stage_metrics = self._create_stage_metrics()
+            self.stage_metrics.start_memory_tracking()
+            
             # Load data
-            missing_template = self.load_missing_template(template_path)
-            understat_data = self.load_understat_data(understat_path)
+            with self.stage_metrics.stage('load_missing_template') as stage:
+                missing_template = self.load_missing_template(template_path)
+                stage['rows_out'] = len(missing_template)
+            with self.stage_metrics.stage('load_understat_data') as stage:
+                if workers > 1:
+                    shard_by = self._resolve_shard_by(missing_template, shard_by)
+                parallel_leagues = workers > 1 and shard_by == 'league'
+                leagues = None
+                if parallel_leagues:
+                    # Rows without a League also search the default EPL data
+                    leagues = self._template_leagues(missing_template)
+                    if missing_template['League'].isna().any():
+                        leagues = list(dict.fromkeys(leagues + ['EPL']))
+                understat_data = self.load_understat_data(understat_path, leagues)
+                stage['rows_out'] = len(understat_data)
             
             # Search for matches
-            found_matches = self.search_matches_in_understat(missing_template, understat_data)
+            with self.stage_metrics.stage('search_matches_in_understat', rows_in=len(missing_template)) as stage:
+                if workers > 1:
+                    found_matches = self.search_matches_parallel(missing_template, understat_data,
+                                                                 workers, shard_by, batch)
+                elif batch:
+                    found_matches = self.search_matches_batch(missing_template, understat_data)
+                else:
+                    found_matches = self.search_matches_in_understat(missing_template, understat_data)
+                stage['rows_out'] = len(found_matches)
             
             # Export results
             if not found_matches.empty:
                 output_path = os.path.join(output_folder, 'found_understat_matches.csv')
-                self.export_found_matches(found_matches, output_path)
+                with self.stage_metrics.stage('export_found_matches', rows_in=len(found_matches)):
+                    self.export_found_matches(found_matches, output_path)
             
             # Generate report
-            self.generate_search_report(missing_template, found_matches)
+            with self.stage_metrics.stage('generate_search_report', rows_in=len(found_matches)):
+                self.generate_search_report(missing_template, found_matches)
             
             print(f"\nSearch completed successfully!")
             
         except Exception as e:
             print(f"\nSearch failed: {str(e)}")
             raise
+        
+        finally:
+            self.stage_metrics.stop_memory_tracking()
+            self.stage_metrics.print_summary()
+            profile_folder = self.stage_metrics.write_profiles()
+            if profile_folder:
+                print(f"Stage profiles written to: {profile_folder}")
+
+
+# Per-process state of search workers, set up once by the pool initializer
+_worker_finder = None
+_worker_indexes = {}
+
+
+def _init_search_worker(team_mapping: Dict[str, str], confidence_threshold: float) -> None:
+    """
+    Create the finder of a search worker process.
+    
+    Args:
+        team_mapping: Team name aliases of the parent finder
+        confidence_threshold: Minimum confidence of a reported match
+    """
+    global _worker_finder
+    _worker_finder = UnderstatMatchFinder()
+    _worker_finder.team_index = TeamNameIndex(team_mapping)
+    _worker_finder.team_mapping = _worker_finder.team_index.team_mapping
+    _worker_finder.match_confidence_threshold = confidence_threshold
+
+
+def _search_shard(task: Tuple[str, pd.DataFrame, bool]) -> pd.DataFrame:
+    """
+    Search one template shard in a worker process.
+    
+    The shard's Understat index is opened memory-mapped on first use and kept
+    for later shards of the same folder.
+    
+    Args:
+        task: (index folder, template rows, batch mode)
+        
+    Returns:
+        Found matches of the shard, in shard order
+    """
+    index_folder, shard, batch = task
+    if index_folder not in _worker_indexes:
+        _worker_indexes[index_folder] = UnderstatGameIndex.open(index_folder)
+    
+    # Per-shard progress lines from several processes would interleave
+    _worker_finder.stage_metrics = _worker_finder._create_stage_metrics()
+    search = _worker_finder.search_matches_batch if batch else _worker_finder.search_matches_in_understat
+    with contextlib.redirect_stdout(io.StringIO()):
+        return search(shard, None, _worker_indexes[index_folder])
 
 
 def main():
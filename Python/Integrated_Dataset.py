@@ -0,0 +1,288 @@
+"""
+Integrated Dataset Reader
+=========================
+
+Memory-mapped, column-oriented access to the integrated football analytics
+dataset written by FootballDataMerger with output_format='columnar' or 'both'.
+
+Author: Nazar Petrashchuk
+Created for: Football Analytics Portfolio Project
+
+Columns are opened read-only from the per-column .npy files of the typed
+ColumnarStore copy, so nothing is parsed and several analysis processes on one
+machine share the same pages from the OS file cache instead of each holding a
+private parsed copy of the CSV.
+
+Features:
+- Lazy, zero-copy column access (numeric and date columns are memory-map views)
+- Row selection by season and team from a few small columns
+- Contiguous row slices as views without copying
+- Conversion of selected rows back to the CSV representation
+"""
+
+import pandas as pd
+import numpy as np
+import os
+from typing import Iterable, List, Optional
+
+from Columnar_Store import ColumnarStore
+
+
+class IntegratedDataset:
+    """
+    Read-only view of a typed integrated dataset store.
+
+    Only the columns that are actually used are opened. Seasons are derived
+    from the match dates, with seasons starting in August, and labelled like
+    the odds files ('14-15').
+    """
+
+    COLUMNAR_SUFFIX = '.columnar'
+
+    # Shot counts are stored as small integers but written to the CSV as floats
+    CSV_FLOAT_COLUMNS = ('S1', 'S2', 'ST1', 'ST2')
+
+    # First month of a season; later months belong to the season starting that year
+    SEASON_START_MONTH = 8
+
+    def __init__(self, folder: str, mmap_mode: Optional[str] = 'r'):
+        """
+        Open a typed dataset store.
+
+        Args:
+            folder: ColumnarStore folder of the integrated dataset
+            mmap_mode: NumPy memory-map mode ('r' shares pages read-only), or
+                None to load the columns that are used into memory
+
+        Raises:
+            FileNotFoundError: If the folder holds no columnar store
+        """
+        self.folder = folder
+        self.mmap_mode = mmap_mode
+        self.schema = ColumnarStore.read_schema(folder)
+        self._columns = {}
+        self._season_years = None
+
+    @classmethod
+    def columnar_path(cls, csv_path: str) -> str:
+        """
+        Folder of the typed copy written next to an integrated dataset CSV.
+
+        Args:
+            csv_path: Path of the integrated dataset CSV
+
+        Returns:
+            The CSV path with its extension replaced by '.columnar'
+        """
+        return os.path.splitext(csv_path)[0] + cls.COLUMNAR_SUFFIX
+
+    @classmethod
+    def is_current(cls, csv_path: str) -> bool:
+        """
+        Whether a typed copy exists and is at least as new as the CSV.
+
+        Args:
+            csv_path: Path of the integrated dataset CSV
+
+        Returns:
+            True if the copy can be used in place of the CSV
+        """
+        schema_path = os.path.join(cls.columnar_path(csv_path), ColumnarStore.SCHEMA_FILE)
+        if not os.path.exists(schema_path):
+            return False
+
+        return not os.path.exists(csv_path) or os.path.getmtime(schema_path) >= os.path.getmtime(csv_path)
+
+    @classmethod
+    def open(cls, csv_path: str, mmap_mode: Optional[str] = 'r') -> 'IntegratedDataset':
+        """
+        Open the typed copy of an integrated dataset CSV.
+
+        Args:
+            csv_path: Path of the integrated dataset CSV
+            mmap_mode: NumPy memory-map mode, or None to load columns into memory
+
+        Returns:
+            IntegratedDataset over the copy
+
+        Raises:
+            FileNotFoundError: If no current typed copy exists
+        """
+        if not cls.is_current(csv_path):
+            raise FileNotFoundError(f"No up-to-date columnar copy of {csv_path}; "
+                                    f"rerun the merger with output_format='both'")
+
+        return cls(cls.columnar_path(csv_path), mmap_mode)
+
+    def __len__(self) -> int:
+        """Number of matches in the dataset."""
+        return self.schema['rows']
+
+    @property
+    def columns(self) -> List[str]:
+        """Column names in dataset order."""
+        return [column_info['name'] for column_info in self.schema['columns']]
+
+    def column(self, name: str) -> pd.Series:
+        """
+        Open one column.
+
+        Numeric and date columns wrap the memory map without copying; categorical
+        columns map their codes and only hold the few category labels in memory.
+
+        Args:
+            name: Column name
+
+        Returns:
+            The full column
+        """
+        if name not in self._columns:
+            self._columns[name] = ColumnarStore.read_column(self.folder, name, self.mmap_mode, self.schema)
+
+        return self._columns[name]
+
+    def to_frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        All rows as a DataFrame backed by the opened columns.
+
+        Args:
+            columns: Subset of columns (default: all)
+
+        Returns:
+            DataFrame in dataset order
+        """
+        columns = columns if columns is not None else self.columns
+        return pd.DataFrame({name: self.column(name) for name in columns}, copy=False)
+
+    def slice(self, start: int, stop: int, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        A contiguous range of rows, as views of the opened columns.
+
+        Args:
+            start: First row position
+            stop: Row position after the last row
+            columns: Subset of columns (default: all)
+
+        Returns:
+            DataFrame of rows start..stop-1 with their positional index
+        """
+        columns = columns if columns is not None else self.columns
+        return pd.DataFrame({name: self.column(name).iloc[start:stop] for name in columns}, copy=False)
+
+    def season_start_years(self) -> np.ndarray:
+        """
+        Season start year of every row, derived from the match dates.
+
+        Returns:
+            int64 array (e.g. 2019 for a match in July 2020 of the 19-20 season)
+        """
+        if self._season_years is None:
+            months = self.column('Date').to_numpy().astype('datetime64[M]').astype(np.int64)
+            years = months // 12 + 1970
+            self._season_years = years - (months % 12 + 1 < self.SEASON_START_MONTH)
+
+        return self._season_years
+
+    @staticmethod
+    def season_label(start_year: int) -> str:
+        """Label a season like the odds files do, e.g. 2014 -> '14-15'."""
+        return f"{start_year % 100:02d}-{(start_year + 1) % 100:02d}"
+
+    @classmethod
+    def _season_start_year(cls, season) -> int:
+        """Season start year from a label such as '14-15' or a start year."""
+        if isinstance(season, str):
+            try:
+                return 2000 + int(season.split('-')[0])
+            except ValueError:
+                raise ValueError(f"Season labels look like '14-15', got {season!r}") from None
+
+        return int(season)
+
+    def seasons(self) -> List[str]:
+        """
+        Seasons present in the dataset.
+
+        Returns:
+            Season labels in chronological order
+        """
+        return [self.season_label(year) for year in np.unique(self.season_start_years()).tolist()]
+
+    def row_mask(self, seasons: Optional[Iterable] = None, teams: Optional[Iterable[str]] = None) -> np.ndarray:
+        """
+        Boolean mask of the rows in the given seasons involving the given teams.
+
+        Args:
+            seasons: Season labels ('14-15') or start years; None keeps all seasons
+            teams: Team names as they appear in Team1/Team2; a row matches if
+                either side is one of them. None keeps all teams
+
+        Returns:
+            Boolean array with one entry per row
+        """
+        mask = np.ones(len(self), dtype=bool)
+
+        if seasons is not None:
+            start_years = [self._season_start_year(season) for season in seasons]
+            mask &= np.isin(self.season_start_years(), start_years)
+
+        if teams is not None:
+            teams = list(teams)
+            team_mask = np.zeros(len(self), dtype=bool)
+            for side in ('Team1', 'Team2'):
+                # Compare category codes rather than the team name strings
+                values = self.column(side).array
+                codes = values.categories.get_indexer(teams)
+                team_mask |= np.isin(values.codes, codes[codes >= 0])
+            mask &= team_mask
+
+        return mask
+
+    def select(self, seasons: Optional[Iterable] = None, teams: Optional[Iterable[str]] = None,
+               columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Rows of the given seasons and teams.
+
+        Only the selected rows are copied out of the memory maps.
+
+        Args:
+            seasons: Season labels ('14-15') or start years; None keeps all seasons
+            teams: Team names; a row matches if either side is one of them
+            columns: Subset of columns (default: all)
+
+        Returns:
+            DataFrame of the matching rows, indexed by their row position
+        """
+        positions = np.flatnonzero(self.row_mask(seasons, teams))
+        columns = columns if columns is not None else self.columns
+
+        return pd.DataFrame({name: self.column(name).take(positions) for name in columns})
+
+    @staticmethod
+    def as_csv_layout(frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert typed rows to the representation read back from the CSV.
+
+        Dates become dd.mm.YYYY strings, categoricals object columns of strings
+        and small integers int64, so code written against the CSV behaves
+        identically. Missing dates and categories stay missing (NaN), as empty
+        CSV fields read back.
+
+        Args:
+            frame: Rows of the typed dataset
+
+        Returns:
+            New DataFrame in the CSV's representation
+        """
+        converted = {}
+        for name in frame.columns:
+            series = frame[name]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                series = series.dt.strftime('%d.%m.%Y')
+            elif isinstance(series.dtype, pd.CategoricalDtype):
+                series = series.astype(object).where(series.notna())
+            elif pd.api.types.is_integer_dtype(series):
+                series = series.astype(float if name in IntegratedDataset.CSV_FLOAT_COLUMNS else np.int64)
+            converted[name] = series
+
+        return pd.DataFrame(converted, index=frame.index)
@@ -0,0 +1,235 @@
+"""
+Integration Report
+==================
+
+Single-pass aggregation of the coverage, result and goal metrics reported
+after a data integration run.
+
+Author: Nazar Petrashchuk
+Created for: Football Analytics Portfolio Project
+
+Features:
+- All report metrics gathered in one vectorized pass over typed columns
+- Incremental accumulation, so streamed partitions are reported without
+  holding the whole dataset
+- Structured result object for programmatic use, with the familiar printout
+"""
+
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class IntegrationReport:
+    """
+    Metrics of an integrated dataset.
+
+    Counts and sums are stored; rates and averages are derived properties, so
+    reports of separate partitions can be combined exactly.
+    """
+
+    total_matches: int = 0
+    columns: List[str] = field(default_factory=list)
+    files_processed: int = 0
+    matches_with_xg: int = 0
+    complete_records: int = 0
+    missing_cells: int = 0
+    year_totals: Dict[int, int] = field(default_factory=dict)
+    year_with_xg: Dict[int, int] = field(default_factory=dict)
+    total_goals: int = 0
+    total_xg: float = 0.0
+    home_wins: int = 0
+    draws: int = 0
+    away_wins: int = 0
+
+    @property
+    def total_columns(self) -> int:
+        """Number of columns in the dataset."""
+        return len(self.columns)
+
+    @staticmethod
+    def _percent(part: float, total: float) -> float:
+        """Share of a total in percent (0 for an empty total)."""
+        return (part / total) * 100 if total else 0.0
+
+    @property
+    def coverage_rate(self) -> float:
+        """Percentage of matches with xG data."""
+        return self._percent(self.matches_with_xg, self.total_matches)
+
+    @property
+    def missing_rate(self) -> float:
+        """Percentage of empty cells over the whole dataset."""
+        return self._percent(self.missing_cells, self.total_matches * self.total_columns)
+
+    @property
+    def average_goals(self) -> float:
+        """Average goals per match."""
+        return self.total_goals / self.total_matches if self.total_matches else 0.0
+
+    @property
+    def average_xg(self) -> float:
+        """Average combined xG per match (matches without xG count as 0)."""
+        return self.total_xg / self.total_matches if self.total_matches else 0.0
+
+    @property
+    def home_win_rate(self) -> float:
+        """Percentage of home wins."""
+        return self._percent(self.home_wins, self.total_matches)
+
+    @property
+    def draw_rate(self) -> float:
+        """Percentage of draws."""
+        return self._percent(self.draws, self.total_matches)
+
+    @property
+    def away_win_rate(self) -> float:
+        """Percentage of away wins."""
+        return self._percent(self.away_wins, self.total_matches)
+
+    def year_coverage(self) -> pd.DataFrame:
+        """
+        Coverage of xG data by calendar year.
+
+        Returns:
+            DataFrame indexed by Year with WithXG, Total and Coverage% columns
+        """
+        years = sorted(self.year_totals)
+        year_stats = pd.DataFrame({
+            'WithXG': [self.year_with_xg.get(year, 0) for year in years],
+            'Total': [self.year_totals[year] for year in years]
+        }, index=pd.Index(years, name='Year'))
+        year_stats['Coverage%'] = (year_stats['WithXG'] / year_stats['Total'] * 100).round(1)
+
+        return year_stats
+
+    def print_report(self) -> None:
+        """Print the report in the pipeline's report layout."""
+        print("\n" + "="*60)
+        print("COMPREHENSIVE DATA INTEGRATION REPORT")
+        print("="*60)
+
+        # Dataset overview
+        print(f"\nDataset Overview:")
+        print(f"   Total matches: {self.total_matches:,}")
+        print(f"   Total columns: {self.total_columns}")
+        print(f"   Files processed: {self.files_processed}")
+
+        # Data quality metrics
+        print(f"\nData Quality Metrics:")
+        print(f"   xG data coverage: {self.matches_with_xg:,}/{self.total_matches:,} ({self.coverage_rate:.1f}%)")
+        print(f"   Complete records: {self.complete_records:,}")
+        print(f"   Missing data rate: {self.missing_rate:.1f}%")
+
+        # Temporal analysis
+        print(f"\nCoverage by Year:")
+        for year, stats in self.year_coverage().iterrows():
+            print(f"   {year}: {int(stats['WithXG']):,}/{int(stats['Total']):,} matches ({stats['Coverage%']:.1f}%)")
+
+        # Key statistics
+        print(f"\nKey Statistics:")
+        print(f"   Average goals per match: {self.average_goals:.2f}")
+        print(f"   Average xG per match: {self.average_xg:.2f}")
+        print(f"   Home win rate: {self.home_win_rate:.1f}%")
+        print(f"   Draw rate: {self.draw_rate:.1f}%")
+        print(f"   Away win rate: {self.away_win_rate:.1f}%")
+
+        print(f"\nColumn Structure:")
+        print(f"   {self.columns}")
+
+
+class ReportAccumulator:
+    """
+    Builds an IntegrationReport from one or more dataset partitions.
+
+    Each update() makes a single pass over the partition's columns and only
+    keeps counters, so memory does not grow with the number of partitions.
+    """
+
+    def __init__(self):
+        """Initialize an empty accumulator."""
+        self.report = IntegrationReport()
+
+    @staticmethod
+    def _years(dates: pd.Series) -> np.ndarray:
+        """
+        Calendar years of the Date column.
+
+        Args:
+            dates: Datetime column, or dd.mm.YYYY strings as written to the CSV
+
+        Returns:
+            Integer array of years (0 for unparseable dates)
+        """
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            # Fixed-format parsing runs in C; slicing the strings is several times slower
+            dates = pd.to_datetime(dates, format='%d.%m.%Y', errors='coerce')
+
+        return dates.dt.year.fillna(0).astype(np.int64).to_numpy()
+
+    def update(self, final_data: pd.DataFrame, years: Optional[np.ndarray] = None) -> None:
+        """
+        Add one partition of the integrated dataset.
+
+        Args:
+            final_data: Formatted rows (as produced by format_final_dataset)
+            years: Calendar year of each row, if already known from typed dates;
+                derived from the Date column otherwise
+        """
+        report = self.report
+        if not report.columns:
+            report.columns = final_data.columns.tolist()
+
+        rows = len(final_data)
+        report.total_matches += rows
+        if not rows:
+            return
+
+        # Missing cells and incomplete rows; plain NumPy integer and boolean columns cannot hold NaN
+        incomplete = np.zeros(rows, dtype=bool)
+        for column in final_data.columns:
+            series = final_data[column]
+            if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'iub':
+                continue
+            missing = series.isna().to_numpy()
+            report.missing_cells += int(missing.sum())
+            incomplete |= missing
+        report.complete_records += rows - int(incomplete.sum())
+
+        # xG coverage overall and by year
+        has_xg = (final_data['xG1'] > 0).to_numpy()
+        report.matches_with_xg += int(has_xg.sum())
+
+        if years is None:
+            years = self._years(final_data['Date'])
+        year_values, year_counts = np.unique(years, return_counts=True)
+        xg_values, xg_counts = np.unique(years[has_xg], return_counts=True)
+        for year, count in zip(year_values.tolist(), year_counts.tolist()):
+            report.year_totals[year] = report.year_totals.get(year, 0) + count
+        for year, count in zip(xg_values.tolist(), xg_counts.tolist()):
+            report.year_with_xg[year] = report.year_with_xg.get(year, 0) + count
+
+        # Goals, xG and result counts
+        report.total_goals += int(final_data['G1'].sum() + final_data['G2'].sum())
+        report.total_xg += float(np.nansum(final_data['xG1'].to_numpy(dtype=float))
+                                 + np.nansum(final_data['xG2'].to_numpy(dtype=float)))
+
+        results = final_data['R'].value_counts()
+        report.home_wins += int(results.get('H', 0))
+        report.draws += int(results.get('D', 0))
+        report.away_wins += int(results.get('A', 0))
+
+    def finalize(self, files_processed: int) -> IntegrationReport:
+        """
+        Complete the report.
+
+        Args:
+            files_processed: Number of odds files merged
+
+        Returns:
+            The accumulated IntegrationReport
+        """
+        self.report.files_processed = files_processed
+        return self.report
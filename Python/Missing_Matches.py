@@ -19,9 +19,11 @@ by date, home team, and match result for manual verification and data extraction
 import pandas as pd
 import os
 from datetime import datetime
-from typing import Dict
 import glob
 
+from Integrated_Dataset import IntegratedDataset
+from Team_Resolver import TeamNameIndex
+
 class UnderstatDataFinder:
     """
     Identifies matches from Odds dataset that are missing Understat xG data.
@@ -32,68 +34,33 @@ class UnderstatDataFinder:
     
     def __init__(self):
         """Initialize with team mapping for basic matching attempts."""
-        self.team_mapping = self._create_team_mapping()
-    
-    def _create_team_mapping(self) -> Dict[str, str]:
-        """Create team name mapping between Understat and Odds data."""
-        return {
-            'Arsenal': 'Arsenal',
-            'Aston Villa': 'Aston Villa',
-            'Bournemouth': 'Bournemouth',
-            'Brighton': 'Brighton',
-            'Brighton and Hove Albion': 'Brighton',
-            'Burnley': 'Burnley',
-            'Cardiff': 'Cardiff',
-            'Cardiff City': 'Cardiff',
-            'Chelsea': 'Chelsea',
-            'Crystal Palace': 'Crystal Palace',
-            'Everton': 'Everton',
-            'Fulham': 'Fulham',
-            'Huddersfield': 'Huddersfield',
-            'Huddersfield Town': 'Huddersfield',
-            'Hull': 'Hull',
-            'Hull City': 'Hull',
-            'Leicester': 'Leicester',
-            'Leicester City': 'Leicester',
-            'Liverpool': 'Liverpool',
-            'Manchester City': 'Man City',
-            'Manchester United': 'Man United',
-            'Middlesbrough': 'Middlesbrough',
-            'Newcastle United': 'Newcastle',
-            'Norwich': 'Norwich',
-            'Norwich City': 'Norwich',
-            'QPR': 'QPR',
-            'Queens Park Rangers': 'QPR',
-            'Sheffield United': 'Sheffield United',
-            'Southampton': 'Southampton',
-            'Stoke': 'Stoke',
-            'Stoke City': 'Stoke',
-            'Sunderland': 'Sunderland',
-            'Swansea': 'Swansea',
-            'Swansea City': 'Swansea',
-            'Tottenham': 'Tottenham',
-            'Tottenham Hotspur': 'Tottenham',
-            'Watford': 'Watford',
-            'West Bromwich Albion': 'West Brom',
-            'West Brom': 'West Brom',
-            'West Ham': 'West Ham',
-            'West Ham United': 'West Ham',
-            'Wolverhampton Wanderers': 'Wolves',
-            'Wolves': 'Wolves'
-        }
+        self.team_index = TeamNameIndex()
+        self.team_mapping = self.team_index.team_mapping
     
-    def load_integrated_dataset(self, integrated_file_path: str) -> pd.DataFrame:
+    def load_integrated_dataset(self, integrated_file_path: str, use_columnar: bool = False) -> pd.DataFrame:
         """
         Load the integrated dataset from the main merger script.
         
+        With use_columnar, if the merger also wrote a typed columnar copy that
+        is up to date, the columns are memory-mapped from it instead of parsing
+        the CSV; rows are then only copied when they are selected. The typed
+        columns (datetime Date, categorical teams, small integer counts) differ
+        from the CSV's, so callers opt in.
+        
         Args:
             integrated_file_path: Path to the integrated CSV file
+            use_columnar: Prefer the memory-mapped columnar copy when available
             
         Returns:
-            DataFrame with integrated data
+            DataFrame with integrated data (typed columns when read from the copy)
         """
         print("Loading integrated dataset...")
         
+        if use_columnar and IntegratedDataset.is_current(integrated_file_path):
+            df = IntegratedDataset.open(integrated_file_path).to_frame()
+            print(f"Loaded {len(df):,} integrated matches (memory-mapped columnar copy)")
+            return df
+        
         if not os.path.exists(integrated_file_path):
             raise FileNotFoundError(f"Integrated file not found: {integrated_file_path}")
         
@@ -122,16 +89,22 @@ class UnderstatDataFinder:
         
         return missing_xg
     
-    def create_manual_collection_template(self, missing_matches: pd.DataFrame, output_path: str) -> None:
+    def create_manual_collection_template(self, missing_matches: pd.DataFrame, output_path: str,
+                                          league: str = 'EPL') -> None:
         """
         Create a CSV template for manual xG data collection.
         
         Args:
             missing_matches: DataFrame with matches missing xG data
             output_path: Path to save the template CSV
+            league: Understat league of the matches, written to the League column
+                unless the matches carry their own League column
         """
         print("Creating manual data collection template...")
         
+        # Typed rows from the columnar copy are written exactly like CSV rows
+        missing_matches = IntegratedDataset.as_csv_layout(missing_matches)
+        
         # Select key columns for identification and create template for manual entry
         template_df = pd.DataFrame()
         
@@ -143,6 +116,8 @@ class UnderstatDataFinder:
         template_df['AwayGoals'] = missing_matches['G2']
         template_df['Result'] = missing_matches['R']
         template_df['Index'] = missing_matches['Index']  # For easy reference back to main dataset
+        # Understat league, used by Found_Missing_Mathes to shard the search by league
+        template_df['League'] = missing_matches['League'] if 'League' in missing_matches.columns else league
         
         # Empty columns for manual xG data entry
         template_df['Home_xG'] = ''  # To be filled manually
@@ -210,27 +185,30 @@ class UnderstatDataFinder:
         print(f"  4. Fill in the xG values manually in the template")
         print(f"  5. Update the main integrated dataset with collected values")
     
-    def run_missing_data_analysis(self, integrated_file_path: str, output_folder: str) -> None:
+    def run_missing_data_analysis(self, integrated_file_path: str, output_folder: str,
+                                  league: str = 'EPL', use_columnar: bool = False) -> None:
         """
         Run the complete missing data analysis and create manual collection template.
         
         Args:
             integrated_file_path: Path to integrated dataset CSV
             output_folder: Output folder for template and reports
+            league: Understat league of the integrated dataset
+            use_columnar: Read the merger's typed columnar copy when it is current
         """
         print("Starting missing Understat data analysis...")
         print("="*50)
         
         try:
             # Load integrated dataset
-            integrated_data = self.load_integrated_dataset(integrated_file_path)
+            integrated_data = self.load_integrated_dataset(integrated_file_path, use_columnar)
             
             # Find missing matches
             missing_matches = self.find_missing_xg_matches(integrated_data)
             
             # Create manual collection template
             template_path = os.path.join(output_folder, 'understat_manual_collection_template.csv')
-            self.create_manual_collection_template(missing_matches, template_path)
+            self.create_manual_collection_template(missing_matches, template_path, league)
             
             # Generate summary report
             self.generate_summary_report(integrated_data, missing_matches)
@@ -250,7 +228,9 @@ def main():
     # Configuration
     config = {
         'integrated_file': r"C:\Users\Nazar\Desktop\Why_football_is_so_popular\integrated_football_analytics_dataset.csv",
-        'output_folder': r"C:\Users\Nazar\Desktop\Why_football_is_so_popular\missing_data_collection"
+        'output_folder': r"C:\Users\Nazar\Desktop\Why_football_is_so_popular\missing_data_collection",
+        'league': 'EPL',
+        'use_columnar': False  # Read the typed copy written with output_format='both'
     }
     
     # Initialize finder
@@ -260,7 +240,9 @@ def main():
     try:
         finder.run_missing_data_analysis(
             config['integrated_file'],
-            config['output_folder']
+            config['output_folder'],
+            config['league'],
+            config['use_columnar']
         )
         
         print(f"\nCheck the output folder for the manual collection template:")
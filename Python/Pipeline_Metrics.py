@@ -0,0 +1,324 @@
+"""
+Pipeline Metrics
+================
+
+Lightweight instrumentation for the football data pipeline: wall time, row
+counts and peak memory per stage and per file.
+
+Author: Nazar Petrashchuk
+Created for: Football Analytics Portfolio Project
+
+Features:
+- Nested stage timing with a context manager
+- Peak traced memory per stage via tracemalloc (opt-in, it slows allocation-heavy code)
+- Thread-safe recording for stages run inside worker threads
+- Structured records as a DataFrame or appended JSON lines for regression tracking
+- Opt-in cProfile and tracemalloc allocation reports per stage
+"""
+
+import pandas as pd
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class PipelineMetrics:
+    """
+    Collects one record per executed pipeline stage.
+
+    Each record holds the stage name, its parent stage, rows in and out, wall
+    time and (when memory tracking is on) the peak traced memory while the
+    stage ran. Memory is only measured on the thread that owns the collector;
+    stages run in worker threads report timings and rows only.
+
+    With a profile folder set, stages on the owning thread are also run under
+    cProfile and/or between tracemalloc snapshots (see PROFILE_MODES). Repeated stages (such as one
+    per file or per fixture) accumulate into a single profile per stage name.
+    A nested stage suspends its parent's profiler, so each call is attributed
+    to the innermost profiled stage.
+    """
+
+    # Profiling modes: call profiles, allocation snapshots, or both
+    PROFILE_MODES = ('cprofile', 'tracemalloc', 'both')
+
+    def __init__(self, track_memory: bool = False, profile_dir: Optional[str] = None,
+                 profile_stages: Optional[Iterable[str]] = None, profile_top: int = 25,
+                 profile_mode: str = 'both'):
+        """
+        Initialize an empty metrics collector.
+
+        Args:
+            track_memory: Record peak memory per stage using tracemalloc
+            profile_dir: Folder that write_profiles() writes .prof files and
+                allocation reports to (None disables profiling)
+            profile_stages: Names of the stages to profile (None profiles all)
+            profile_top: Number of functions and source lines listed in the
+                text reports
+            profile_mode: One of PROFILE_MODES. Snapshots are taken around every
+                stage occurrence, which is slow for per-row stages; use
+                'cprofile' there
+        """
+        if profile_top < 1:
+            raise ValueError(f"profile_top must be at least 1, got {profile_top}")
+        if profile_mode not in self.PROFILE_MODES:
+            raise ValueError(f"profile_mode must be one of {self.PROFILE_MODES}, got {profile_mode!r}")
+
+        self.track_memory = track_memory
+        self.profile_dir = profile_dir
+        self.profile_stages = set(profile_stages) if profile_stages is not None else None
+        self.profile_top = profile_top
+        self.profile_calls = profile_mode in ('cprofile', 'both')
+        self.profile_allocations = profile_mode in ('tracemalloc', 'both')
+        self.run_id = uuid.uuid4().hex[:12]
+        self.records = []
+        self.profiles = {}
+        self.allocations = {}
+        self._profile_stack = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._owner_thread = threading.get_ident()
+        self._owner_stack = self._stack()
+        self._started_tracemalloc = False
+
+    def _stack(self) -> List[Dict]:
+        """Stage stack of the current thread."""
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def start_memory_tracking(self) -> None:
+        """Start tracemalloc if memory tracking or profiling is enabled and it is not already running."""
+        needs_tracing = self.track_memory or (self.profile_dir is not None and self.profile_allocations)
+        if needs_tracing and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def stop_memory_tracking(self) -> None:
+        """Stop tracemalloc if this collector started it."""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _measures_memory(self) -> bool:
+        """Whether peak memory can be attributed to stages on the current thread."""
+        return (self.track_memory and tracemalloc.is_tracing()
+                and threading.get_ident() == self._owner_thread)
+
+    def _profiles_stage(self, name: str) -> bool:
+        """Whether a stage started on the current thread should be profiled."""
+        return (self.profile_dir is not None
+                and threading.get_ident() == self._owner_thread
+                and (self.profile_stages is None or name in self.profile_stages))
+
+    def _take_snapshot(self) -> Optional[tracemalloc.Snapshot]:
+        """Snapshot traced allocations, excluding tracemalloc's own bookkeeping."""
+        if not self.profile_allocations or not tracemalloc.is_tracing():
+            return None
+
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>')
+        ])
+
+    def _start_profile(self, name: str) -> Tuple[cProfile.Profile, Optional[tracemalloc.Snapshot]]:
+        """Take the opening snapshot and switch profiling from the parent stage to this one."""
+        if self._profile_stack and self.profile_calls:
+            self._profile_stack[-1].disable()
+        snapshot = self._take_snapshot()
+
+        profiler = self.profiles.setdefault(name, cProfile.Profile())
+        self._profile_stack.append(profiler)
+        if self.profile_calls:
+            profiler.enable()
+
+        return profiler, snapshot
+
+    def _stop_profile(self, name: str, profiler: cProfile.Profile,
+                      snapshot: Optional[tracemalloc.Snapshot]) -> None:
+        """Hand profiling back to the parent stage and accumulate the allocation diff."""
+        if self.profile_calls:
+            profiler.disable()
+        self._profile_stack.pop()
+
+        closing = self._take_snapshot()
+        if snapshot is not None and closing is not None:
+            # Net allocations still alive when the stage ended, summed per source line
+            stage_allocations = self.allocations.setdefault(name, {})
+            for diff in closing.compare_to(snapshot, 'lineno'):
+                if diff.size_diff == 0 and diff.count_diff == 0:
+                    continue
+                frame = diff.traceback[0]
+                totals = stage_allocations.setdefault((frame.filename, frame.lineno), [0, 0])
+                totals[0] += diff.size_diff
+                totals[1] += diff.count_diff
+
+        # Resume the parent only now, so snapshot overhead stays out of its profile
+        if self._profile_stack and self.profile_calls:
+            self._profile_stack[-1].enable()
+
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None, **details) -> Iterator[Dict]:
+        """
+        Measure one pipeline stage.
+
+        The yielded record can be updated inside the block, typically to set
+        'rows_out' once the stage result is known.
+
+        Args:
+            name: Stage name
+            rows_in: Number of input rows, if known up front
+            **details: Extra fields stored on the record (e.g. file name)
+
+        Yields:
+            The stage record dictionary
+        """
+        stack = self._stack()
+        # Stages started in worker threads belong to the owner thread's current stage
+        parent_stack = stack if stack or threading.get_ident() == self._owner_thread else self._owner_stack
+        record = {
+            'run_id': self.run_id,
+            'stage': name,
+            'parent': parent_stack[-1]['stage'] if parent_stack else None,
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'rows_in': rows_in,
+            'rows_out': None,
+            'duration_s': None,
+            'peak_memory_bytes': None,
+            **details
+        }
+
+        measure_memory = self._measures_memory()
+        if measure_memory:
+            # Fold the parent's peak so far into it before resetting for this stage
+            if stack and '_peak' in stack[-1]:
+                stack[-1]['_peak'] = max(stack[-1]['_peak'], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            record['_peak'] = 0
+
+        profile = self._profiles_stage(name)
+        if profile:
+            profiler, snapshot = self._start_profile(name)
+
+        stack.append(record)
+        start = time.perf_counter()
+
+        try:
+            yield record
+        finally:
+            record['duration_s'] = round(time.perf_counter() - start, 6)
+            stack.pop()
+
+            if profile:
+                self._stop_profile(name, profiler, snapshot)
+
+            if measure_memory:
+                peak = max(record.pop('_peak'), tracemalloc.get_traced_memory()[1])
+                record['peak_memory_bytes'] = peak
+                if stack and '_peak' in stack[-1]:
+                    stack[-1]['_peak'] = max(stack[-1]['_peak'], peak)
+            else:
+                record.pop('_peak', None)
+
+            with self._lock:
+                self.records.append(record)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Return the collected records as a DataFrame.
+
+        Returns:
+            One row per stage, in completion order
+        """
+        return pd.DataFrame(self.records)
+
+    def write_jsonl(self, output_path: str) -> None:
+        """
+        Append the collected records to a JSON lines file.
+
+        Args:
+            output_path: Path of the .jsonl file (created if missing)
+        """
+        with open(output_path, 'a', encoding='utf-8') as handle:
+            for record in self.records:
+                handle.write(json.dumps(record, default=str) + '\n')
+
+    def write_profiles(self) -> Optional[str]:
+        """
+        Write the collected profiles of this run into profile_dir/<run_id>.
+
+        For every profiled stage, call profiling writes <stage>.prof (load it
+        with pstats or snakeviz) and <stage>_profile.txt with the top functions
+        by cumulative time; allocation profiling writes <stage>_allocations.txt
+        with the source lines that allocated the most memory still held when
+        the stage ended.
+
+        Returns:
+            Folder the reports were written to, or None if nothing was profiled
+        """
+        if self.profile_dir is None or not self.profiles:
+            return None
+
+        run_folder = os.path.join(self.profile_dir, self.run_id)
+        os.makedirs(run_folder, exist_ok=True)
+
+        for name, profiler in self.profiles.items():
+            if self.profile_calls:
+                profiler.dump_stats(os.path.join(run_folder, f"{name}.prof"))
+
+                report = io.StringIO()
+                try:
+                    stats = pstats.Stats(profiler, stream=report)
+                    stats.sort_stats('cumulative').print_stats(self.profile_top)
+                except TypeError:
+                    # pstats refuses profilers that never recorded a call
+                    report.write("No calls recorded\n")
+                with open(os.path.join(run_folder, f"{name}_profile.txt"), 'w', encoding='utf-8') as handle:
+                    handle.write(f"Stage: {name}\n")
+                    handle.write(report.getvalue())
+
+            if self.profile_allocations:
+                with open(os.path.join(run_folder, f"{name}_allocations.txt"), 'w', encoding='utf-8') as handle:
+                    handle.write(self._format_allocations(name))
+
+        return run_folder
+
+    def _format_allocations(self, name: str) -> str:
+        """Format the top allocating source lines of a stage as a text report."""
+        lines = [f"Stage: {name}"]
+
+        if name not in self.allocations:
+            lines.append("No allocation snapshots (tracemalloc was not running)")
+            return "\n".join(lines) + "\n"
+
+        top_lines = sorted(self.allocations[name].items(), key=lambda item: item[1][0], reverse=True)
+        lines.append(f"Top {self.profile_top} source lines by net allocated memory:")
+        for rank, ((filename, lineno), (size, count)) in enumerate(top_lines[:self.profile_top], start=1):
+            lines.append(f"{rank:>4}. {filename}:{lineno}: {size / 1024:,.1f} KiB in {count:,} blocks")
+
+        return "\n".join(lines) + "\n"
+
+    def print_summary(self) -> None:
+        """Print top-level stage timings, rows and peak memory."""
+        print("\nStage Metrics:")
+        for record in self.records:
+            if record['parent'] is not None:
+                continue
+
+            line = f"   {record['stage']}: {record['duration_s']:.3f}s"
+            if record['rows_in'] is not None or record['rows_out'] is not None:
+                rows_in = '-' if record['rows_in'] is None else f"{record['rows_in']:,}"
+                rows_out = '-' if record['rows_out'] is None else f"{record['rows_out']:,}"
+                line += f", rows {rows_in} -> {rows_out}"
+            if record['peak_memory_bytes'] is not None:
+                line += f", peak {record['peak_memory_bytes'] / (1024 * 1024):.1f} MB"
+            print(line)
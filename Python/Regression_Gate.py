@@ -0,0 +1,503 @@
+"""
+Performance Regression Gate
+===========================
+
+Compares the current performance and output of the football data tools with
+committed baselines, and fails when a stage regresses.
+
+Author: Nazar Petrashchuk
+Created for: Football Analytics Portfolio Project
+
+Purpose:
+Refactors of Data_Merger.py have doubled runtimes without anyone noticing.
+This gate reruns the benchmark suite at fixed sizes and compares every
+stage's time and peak memory with the baseline JSON files in
+benchmark_baselines/. It also checks that the tool outputs are byte-identical:
+the seeded synthetic outputs against the hashes stored in the baselines, and
+a fixed golden input set against its committed integrated dataset.
+
+Timings are stored next to the time of a fixed calibration workload, and
+compared as a ratio to it, so a baseline recorded on one machine still works
+on a faster or slower one.
+
+The integrated dataset in the repository root is not used as the golden
+output: it was produced before odds headers were mapped by signature and
+its odds columns are expected to differ, and the Understat per-game file it
+was built from is not shipped. The golden inputs in benchmark_baselines/golden/
+are a small seeded synthetic league committed as files, so generator changes
+cannot move them.
+
+Features:
+- Configurable relative tolerances with absolute noise floors
+- Timings normalized by a calibration workload
+- Best-of-N timings to damp scheduler noise
+- Output hashes of all three tools on seeded synthetic data
+- Byte-identical golden CSV check on committed inputs
+- Baseline and golden refresh after intentional changes
+"""
+
+import pandas as pd
+import numpy as np
+import os
+import sys
+import filecmp
+import hashlib
+import json
+import platform
+import tempfile
+import contextlib
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from Benchmark_Suite import PipelineBenchmark
+from Data_Merger import FootballDataMerger
+
+# Repository root, used for the default locations of shipped data
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class PerformanceRegressionGate:
+    """
+    Checks stage timings, peak memory and outputs against stored baselines.
+
+    A stage regresses when its measurement exceeds the baseline by more than
+    the relative tolerance and by more than the absolute floor, so that tiny
+    stages do not fail on noise. Each measurement also times a fixed
+    calibration workload; with normalize_timings the baseline times are
+    scaled by the calibration ratio before comparing, so only slowdowns
+    relative to the machine's own speed fail.
+    """
+
+    # Output files hashed per size, in the benchmark's output folder
+    OUTPUT_FILES = [
+        'integrated_football_analytics_dataset.csv',
+        'understat_manual_collection_template.csv',
+        'found_understat_matches.csv'
+    ]
+
+    # Files of a golden folder: inputs, the aliases of its noisy names and the expected output
+    GOLDEN_ODDS_FOLDER = 'odds'
+    GOLDEN_UNDERSTAT_FILE = 'understat_per_game.csv'
+    GOLDEN_ALIASES_FILE = 'team_aliases.json'
+    GOLDEN_OUTPUT_FILE = 'integrated_football_analytics_dataset.csv'
+
+    # Rows of the calibration workload
+    CALIBRATION_ROWS = 200_000
+
+    def __init__(self, baseline_folder: str, work_folder: str, sizes: Optional[List[int]] = None,
+                 time_tolerance: float = 0.5, memory_tolerance: float = 0.25,
+                 min_duration_s: float = 0.05, min_memory_bytes: int = 1024 * 1024,
+                 repeats: int = 3, seed: int = 42, finder_rows: int = 100,
+                 normalize_timings: bool = True):
+        """
+        Initialize the gate.
+
+        Args:
+            baseline_folder: Folder with one baseline_<size>.json per size
+            work_folder: Folder for generated data and tool output
+            sizes: Synthetic match counts to check (defaults to [10_000])
+            time_tolerance: Allowed relative slowdown per stage (0.5 = 50% slower)
+            memory_tolerance: Allowed relative growth of peak memory per stage
+            min_duration_s: Slowdowns smaller than this many seconds never fail
+            min_memory_bytes: Memory growth smaller than this never fails
+            repeats: Runs per size; the fastest time and smallest peak are kept
+            seed: Generator seed (baselines are only comparable for equal seeds)
+            finder_rows: Template rows searched by the match finder
+            normalize_timings: Scale baseline times by the calibration ratio
+                before comparing; False compares the recorded seconds directly
+        """
+        if repeats < 1:
+            raise ValueError(f"repeats must be at least 1, got {repeats}")
+        if time_tolerance < 0 or memory_tolerance < 0:
+            raise ValueError("Tolerances must be non-negative")
+
+        self.baseline_folder = baseline_folder
+        self.sizes = sizes or [10_000]
+        self.time_tolerance = time_tolerance
+        self.memory_tolerance = memory_tolerance
+        self.min_duration_s = min_duration_s
+        self.min_memory_bytes = min_memory_bytes
+        self.repeats = repeats
+        self.seed = seed
+        self.finder_rows = finder_rows
+        self.normalize_timings = normalize_timings
+        self.benchmark = PipelineBenchmark(work_folder, seed=seed, finder_rows=finder_rows, track_memory=True)
+
+    def _baseline_path(self, matches: int) -> str:
+        """Path of the baseline file for one size."""
+        return os.path.join(self.baseline_folder, f"baseline_{matches}.json")
+
+    @staticmethod
+    def _hash_file(file_path: str) -> Optional[str]:
+        """SHA-256 of a file, or None if it does not exist."""
+        if not os.path.exists(file_path):
+            return None
+
+        with open(file_path, 'rb') as handle:
+            return hashlib.sha256(handle.read()).hexdigest()
+
+    def calibrate(self) -> float:
+        """
+        Time a fixed pandas workload that stands in for the machine's speed.
+
+        The workload builds, sorts, groups and writes a seeded frame, the same
+        kinds of work the tools spend their time on.
+
+        Returns:
+            Duration of one run, in seconds
+        """
+        rng = np.random.default_rng(0)
+
+        start = time.perf_counter()
+        frame = pd.DataFrame({
+            'team': rng.integers(0, 500, self.CALIBRATION_ROWS).astype(str),
+            'date': pd.Timestamp('2014-08-01') + pd.to_timedelta(rng.integers(0, 2000, self.CALIBRATION_ROWS), unit='D'),
+            'xg': rng.random(self.CALIBRATION_ROWS) * 3
+        })
+        frame = frame.sort_values(['team', 'date'])
+        frame.groupby('team')['xg'].agg(['mean', 'sum', 'count'])
+        frame.to_csv(os.devnull, index=False)
+
+        return time.perf_counter() - start
+
+    def measure(self, matches: int) -> Dict:
+        """
+        Benchmark one size several times and summarize it like a baseline file.
+
+        Args:
+            matches: Target number of matches
+
+        Returns:
+            Dictionary with settings, per-stage measurements and output hashes
+        """
+        # Calibrate between benchmark runs so both see the same machine state
+        size_runs, calibrations = [], []
+        for _ in range(self.repeats):
+            size_runs.append(self.benchmark.run_size(matches))
+            calibrations.append(self.calibrate())
+
+        runs = pd.concat(size_runs, ignore_index=True)
+        runs['key'] = runs['tool'] + '.' + runs['stage']
+
+        stages = {}
+        for key, stage_runs in runs.groupby('key', sort=False):
+            peak = stage_runs['peak_memory_bytes'].dropna()
+            stages[key] = {
+                'duration_s': round(float(stage_runs['duration_s'].min()), 6),
+                'peak_memory_bytes': int(peak.min()) if len(peak) else None,
+                'rows_out': None if pd.isna(stage_runs['rows_out'].iloc[0]) else int(stage_runs['rows_out'].iloc[0])
+            }
+
+        output_folder = self.benchmark.output_folder(matches)
+        outputs = {name: self._hash_file(os.path.join(output_folder, name)) for name in self.OUTPUT_FILES}
+
+        return {
+            'matches': int(runs['matches'].iloc[0]),
+            'seed': self.seed,
+            'finder_rows': self.finder_rows,
+            'repeats': self.repeats,
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'calibration_s': round(min(calibrations), 6),
+            'stages': stages,
+            'outputs': outputs
+        }
+
+    def update_baselines(self) -> List[str]:
+        """
+        Measure every size and overwrite its baseline file.
+
+        Use after an intentional performance or output change; commit the files.
+
+        Returns:
+            Paths of the written baseline files
+        """
+        os.makedirs(self.baseline_folder, exist_ok=True)
+        written = []
+
+        for matches in self.sizes:
+            baseline = self.measure(matches)
+            baseline_path = self._baseline_path(matches)
+            with open(baseline_path, 'w', encoding='utf-8') as handle:
+                json.dump(baseline, handle, indent=2)
+                handle.write('\n')
+            written.append(baseline_path)
+            print(f"Baseline written to: {baseline_path}")
+
+        return written
+
+    def _compare_stage(self, key: str, baseline: Optional[Dict], current: Dict, speed_factor: float = 1.0) -> Dict:
+        """
+        Compare one stage with its baseline.
+
+        Args:
+            key: Tool and stage name
+            baseline: Baseline measurement, or None for a stage added since
+            current: Current measurement
+            speed_factor: Current calibration time over the baseline's; the
+                baseline time is multiplied by it before comparing
+
+        Returns:
+            Comparison record with a status of 'ok', 'new' or 'regressed'
+        """
+        record = {
+            'stage': key,
+            'baseline_s': None,
+            'current_s': current['duration_s'],
+            'baseline_memory': None,
+            'current_memory': current['peak_memory_bytes'],
+            'status': 'new',
+            'reason': ''
+        }
+        if baseline is None:
+            return record
+
+        expected_s = baseline['duration_s'] * speed_factor
+        record['baseline_s'] = expected_s
+        record['baseline_memory'] = baseline['peak_memory_bytes']
+        reasons = []
+
+        time_limit = expected_s * (1 + self.time_tolerance)
+        if current['duration_s'] > time_limit and current['duration_s'] - expected_s > self.min_duration_s:
+            reasons.append(f"time {current['duration_s'] / expected_s:.2f}x baseline")
+
+        if baseline['peak_memory_bytes'] and current['peak_memory_bytes'] is not None:
+            memory_limit = baseline['peak_memory_bytes'] * (1 + self.memory_tolerance)
+            memory_growth = current['peak_memory_bytes'] - baseline['peak_memory_bytes']
+            if current['peak_memory_bytes'] > memory_limit and memory_growth > self.min_memory_bytes:
+                reasons.append(f"peak memory {current['peak_memory_bytes'] / baseline['peak_memory_bytes']:.2f}x baseline")
+
+        record['status'] = 'regressed' if reasons else 'ok'
+        record['reason'] = ', '.join(reasons)
+        return record
+
+    def check_size(self, matches: int) -> Dict:
+        """
+        Measure one size and compare it with its baseline file.
+
+        Args:
+            matches: Target number of matches
+
+        Returns:
+            Dictionary with 'passed', the stage comparisons and output mismatches
+
+        Raises:
+            FileNotFoundError: If the size has no baseline yet
+        """
+        baseline_path = self._baseline_path(matches)
+        if not os.path.exists(baseline_path):
+            raise FileNotFoundError(f"No baseline for {matches:,} matches: {baseline_path} "
+                                    f"(run with update_baselines() first)")
+
+        with open(baseline_path, encoding='utf-8') as handle:
+            baseline = json.load(handle)
+
+        if baseline['seed'] != self.seed or baseline['finder_rows'] != self.finder_rows:
+            raise ValueError(f"Baseline {baseline_path} was recorded with other settings "
+                             f"(seed {baseline['seed']}, finder_rows {baseline['finder_rows']})")
+
+        current = self.measure(matches)
+
+        speed_factor = 1.0
+        if self.normalize_timings and baseline.get('calibration_s'):
+            speed_factor = current['calibration_s'] / baseline['calibration_s']
+
+        comparisons = pd.DataFrame([
+            self._compare_stage(key, baseline['stages'].get(key), measurement, speed_factor)
+            for key, measurement in current['stages'].items()
+        ])
+        missing_stages = [key for key in baseline['stages'] if key not in current['stages']]
+
+        output_mismatches = [name for name, digest in baseline['outputs'].items()
+                             if current['outputs'].get(name) != digest]
+
+        passed = not (comparisons['status'] == 'regressed').any() and not output_mismatches
+
+        return {
+            'matches': current['matches'],
+            'passed': passed,
+            'speed_factor': speed_factor,
+            'comparisons': comparisons,
+            'missing_stages': missing_stages,
+            'output_mismatches': output_mismatches
+        }
+
+    def _merge_golden_inputs(self, golden_folder: str, output_path: str) -> None:
+        """
+        Run the merger on the inputs of a golden folder.
+
+        Args:
+            golden_folder: Folder with the odds folder, Understat file and aliases
+            output_path: Where to write the integrated dataset
+        """
+        merger = FootballDataMerger()
+
+        aliases_path = os.path.join(golden_folder, self.GOLDEN_ALIASES_FILE)
+        if os.path.exists(aliases_path):
+            with open(aliases_path, encoding='utf-8') as handle:
+                merger.team_index.add_aliases(json.load(handle))
+
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            merger.merge_all_data(os.path.join(golden_folder, self.GOLDEN_ODDS_FOLDER),
+                                  os.path.join(golden_folder, self.GOLDEN_UNDERSTAT_FILE),
+                                  output_path)
+
+    def check_golden(self, golden_folder: str) -> Optional[bool]:
+        """
+        Rebuild the golden integrated dataset and compare it byte for byte.
+
+        Args:
+            golden_folder: Folder with the committed golden inputs and output
+
+        Returns:
+            True if identical, False if different, None if the folder is incomplete
+        """
+        required = [self.GOLDEN_ODDS_FOLDER, self.GOLDEN_UNDERSTAT_FILE, self.GOLDEN_OUTPUT_FILE]
+        if not all(os.path.exists(os.path.join(golden_folder, name)) for name in required):
+            return None
+
+        output_path = os.path.join(self.benchmark.work_folder, 'golden_check.csv')
+        os.makedirs(self.benchmark.work_folder, exist_ok=True)
+        self._merge_golden_inputs(golden_folder, output_path)
+
+        return filecmp.cmp(output_path, os.path.join(golden_folder, self.GOLDEN_OUTPUT_FILE), shallow=False)
+
+    def update_golden(self, golden_folder: str) -> str:
+        """
+        Rewrite the golden output from the committed golden inputs.
+
+        Use after an intentional output change; commit the file.
+
+        Args:
+            golden_folder: Folder with the committed golden inputs
+
+        Returns:
+            Path of the written golden output
+        """
+        output_path = os.path.join(golden_folder, self.GOLDEN_OUTPUT_FILE)
+        self._merge_golden_inputs(golden_folder, output_path)
+        print(f"Golden output written to: {output_path}")
+        return output_path
+
+    def run(self, golden_folder: Optional[str] = None) -> bool:
+        """
+        Run every check and print the gate report.
+
+        Args:
+            golden_folder: Folder with the golden inputs and output
+
+        Returns:
+            True if no stage regressed and all outputs are identical
+        """
+        print("Starting performance regression gate...")
+        print("="*60)
+
+        size_results = [self.check_size(matches) for matches in self.sizes]
+
+        golden = None
+        if golden_folder:
+            golden = self.check_golden(golden_folder)
+
+        self.generate_gate_report(size_results, golden)
+
+        return all(result['passed'] for result in size_results) and golden is not False
+
+    def generate_gate_report(self, size_results: List[Dict], golden: Optional[bool]) -> None:
+        """
+        Print stage comparisons, output checks and the overall verdict.
+
+        Args:
+            size_results: Results of check_size() per size
+            golden: Result of check_golden()
+        """
+        print("\n" + "="*60)
+        print("PERFORMANCE REGRESSION GATE REPORT")
+        print("="*60)
+        print(f"Tolerances: time +{self.time_tolerance:.0%} (>{self.min_duration_s}s), "
+              f"peak memory +{self.memory_tolerance:.0%} (>{self.min_memory_bytes / (1024 * 1024):.1f} MB)")
+
+        for result in size_results:
+            print(f"\n{result['matches']:,} matches:")
+            if self.normalize_timings:
+                print(f"   Machine speed vs baseline: {result['speed_factor']:.2f}x calibration time "
+                      f"(baseline times scaled to match)")
+            for _, comparison in result['comparisons'].iterrows():
+                baseline_s = '-' if comparison['baseline_s'] is None else f"{comparison['baseline_s']:.3f}s"
+                line = f"   [{comparison['status']:>9}] {comparison['stage']}: {baseline_s} -> {comparison['current_s']:.3f}s"
+                if comparison['reason']:
+                    line += f" ({comparison['reason']})"
+                print(line)
+
+            for key in result['missing_stages']:
+                print(f"   [  missing] {key}: stage no longer recorded")
+
+            if result['output_mismatches']:
+                print(f"   Output changed: {', '.join(result['output_mismatches'])}")
+            else:
+                print(f"   Outputs identical to baseline")
+
+        print(f"\nGolden dataset check:")
+        if golden is None:
+            print(f"   Skipped (golden inputs or golden CSV not available)")
+        else:
+            print(f"   {'Identical' if golden else 'DIFFERENT'} to the golden integrated dataset")
+
+        passed = all(result['passed'] for result in size_results) and golden is not False
+        print(f"\nGate {'PASSED' if passed else 'FAILED'}")
+
+
+def main():
+    """
+    Main execution function for the performance regression gate.
+
+    Pass --update to re-record the baselines and --update-golden to rewrite
+    the golden output after an intentional change. --time-tolerance=<ratio>
+    overrides the allowed slowdown, e.g. --time-tolerance=1.0 on noisy machines.
+    """
+    # Configuration
+    config = {
+        'baseline_folder': os.path.join(REPO_ROOT, 'Python', 'benchmark_baselines'),
+        'work_folder': os.path.join(tempfile.gettempdir(), 'football_regression_gate'),
+        'golden_folder': os.path.join(REPO_ROOT, 'Python', 'benchmark_baselines', 'golden'),
+        'sizes': [10_000],
+        'time_tolerance': 0.5,
+        'memory_tolerance': 0.25,
+        'normalize_timings': True
+    }
+
+    for argument in sys.argv[1:]:
+        if argument.startswith('--time-tolerance='):
+            config['time_tolerance'] = float(argument.split('=', 1)[1])
+
+    gate = PerformanceRegressionGate(
+        config['baseline_folder'],
+        config['work_folder'],
+        sizes=config['sizes'],
+        time_tolerance=config['time_tolerance'],
+        memory_tolerance=config['memory_tolerance'],
+        normalize_timings=config['normalize_timings']
+    )
+
+    try:
+        if '--update-golden' in sys.argv[1:]:
+            gate.update_golden(config['golden_folder'])
+            return 0
+
+        if '--update' in sys.argv[1:]:
+            gate.update_baselines()
+            return 0
+
+        passed = gate.run(config['golden_folder'])
+        return 0 if passed else 1
+
+    except Exception as e:
+        print(f"\nRegression gate failed: {str(e)}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
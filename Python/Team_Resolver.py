@@ -0,0 +1,493 @@
+"""
+Team Name Resolver
+==================
+
+Shared team name mapping and resolution index for the football data tools.
+
+Author: Nazar Petrashchuk
+Created for: Football Analytics Portfolio Project
+
+The betting odds files and Understat spell team names differently ('Man City'
+vs 'Manchester City'). The merger, the missing data finder and the match finder
+all use the same Understat-to-odds mapping, kept here once, and the match finder
+resolves odds names against the Understat vocabulary through TeamNameIndex.
+
+Features:
+- Single Understat-to-odds alias mapping shared by every tool
+- Normalized names and character n-gram postings built once per vocabulary
+- Exact pruning of fuzzy candidates with a vectorized upper bound on the similarity ratio
+- Memoized resolution, so each distinct name is resolved once per run
+"""
+
+import pandas as pd
+import numpy as np
+import re
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Understat team names and their odds data (football-data.co.uk) names
+TEAM_NAME_MAPPING = {
+    'Arsenal': 'Arsenal',
+    'Aston Villa': 'Aston Villa',
+    'Bournemouth': 'Bournemouth',
+    'Brighton': 'Brighton',
+    'Brighton and Hove Albion': 'Brighton',
+    'Burnley': 'Burnley',
+    'Cardiff': 'Cardiff',
+    'Cardiff City': 'Cardiff',
+    'Chelsea': 'Chelsea',
+    'Crystal Palace': 'Crystal Palace',
+    'Everton': 'Everton',
+    'Fulham': 'Fulham',
+    'Huddersfield': 'Huddersfield',
+    'Huddersfield Town': 'Huddersfield',
+    'Hull': 'Hull',
+    'Hull City': 'Hull',
+    'Leicester': 'Leicester',
+    'Leicester City': 'Leicester',
+    'Liverpool': 'Liverpool',
+    'Manchester City': 'Man City',
+    'Manchester United': 'Man United',
+    'Middlesbrough': 'Middlesbrough',
+    'Newcastle United': 'Newcastle',
+    'Norwich': 'Norwich',
+    'Norwich City': 'Norwich',
+    'QPR': 'QPR',
+    'Queens Park Rangers': 'QPR',
+    'Sheffield United': 'Sheffield United',
+    'Southampton': 'Southampton',
+    'Stoke': 'Stoke',
+    'Stoke City': 'Stoke',
+    'Sunderland': 'Sunderland',
+    'Swansea': 'Swansea',
+    'Swansea City': 'Swansea',
+    'Tottenham': 'Tottenham',
+    'Tottenham Hotspur': 'Tottenham',
+    'Watford': 'Watford',
+    'West Bromwich Albion': 'West Brom',
+    'West Brom': 'West Brom',
+    'West Ham': 'West Ham',
+    'West Ham United': 'West Ham',
+    'Wolverhampton Wanderers': 'Wolves',
+    'Wolves': 'Wolves'
+}
+
+
+class TeamNameIndex:
+    """
+    Resolves team names between the odds data and Understat.
+
+    Holds the alias mapping (Understat name -> odds name) and, once a
+    vocabulary of Understat names is set, answers fuzzy lookups of odds names
+    against it. Results equal a full scan that scores every vocabulary name
+    with SequenceMatcher, but candidates sharing the most n-grams are scored
+    first and the rest are skipped as soon as their upper bound cannot win.
+    """
+
+    # Common prefixes/suffixes dropped before fuzzy comparison
+    AFFIX_PATTERN = re.compile(r'\b(FC|AFC|United|City|Town)\b', flags=re.IGNORECASE)
+
+    # Short forms expanded after the affixes are dropped
+    NAME_VARIATIONS = {
+        'Man Utd': 'Manchester United',
+        'Man City': 'Manchester City',
+        'Spurs': 'Tottenham',
+        'Arsenal FC': 'Arsenal',
+        'Chelsea FC': 'Chelsea'
+    }
+
+    # Alias similarity above which a vocabulary name is taken as the mapped team
+    ALIAS_MATCH_THRESHOLD = 0.8
+
+    # Score bonus when one normalized name contains the other
+    SUBSTRING_BOOST = 0.2
+
+    def __init__(self, team_mapping: Optional[Dict[str, str]] = None, ngram_size: int = 2):
+        """
+        Initialize the index.
+
+        Args:
+            team_mapping: Understat-to-odds name mapping (default: TEAM_NAME_MAPPING)
+            ngram_size: Length of the character n-grams used to order fuzzy candidates
+        """
+        if ngram_size < 1:
+            raise ValueError(f"ngram_size must be at least 1, got {ngram_size}")
+
+        self.team_mapping = dict(TEAM_NAME_MAPPING if team_mapping is None else team_mapping)
+        self.ngram_size = ngram_size
+        self.teams = None
+        self.resolutions = {}
+        self._normalized = {}
+        self._build_reverse_mapping()
+        self.set_vocabulary([])
+
+    def _build_reverse_mapping(self) -> None:
+        """Map each odds name to its Understat alias (the last listed alias wins)."""
+        self._reverse_mapping = {odds_name: understat_name for understat_name, odds_name in self.team_mapping.items()}
+        self.resolutions = {}
+
+    def add_aliases(self, aliases: Dict[str, str]) -> None:
+        """
+        Add or override Understat-to-odds aliases.
+
+        Args:
+            aliases: Mapping of Understat names to odds names
+        """
+        self.team_mapping.update(aliases)
+        self._build_reverse_mapping()
+
+    def map_names(self, names: pd.Series) -> pd.Series:
+        """
+        Translate Understat team names to odds names.
+
+        Args:
+            names: Understat team names
+
+        Returns:
+            Odds names, with unmapped names kept as they are
+        """
+        return names.map(self.team_mapping).fillna(names)
+
+    @staticmethod
+    def similarity(str1: str, str2: str) -> float:
+        """
+        Case-insensitive similarity ratio of two names.
+
+        Args:
+            str1: First name
+            str2: Second name
+
+        Returns:
+            SequenceMatcher ratio between 0 and 1
+        """
+        return SequenceMatcher(None, str1.lower(), str2.lower()).ratio()
+
+    def normalize(self, team_name: str) -> str:
+        """
+        Normalize a team name for fuzzy matching.
+
+        Args:
+            team_name: Original team name
+
+        Returns:
+            Name without common affixes, with short forms expanded
+        """
+        if team_name not in self._normalized:
+            normalized = self.AFFIX_PATTERN.sub('', team_name).strip()
+            self._normalized[team_name] = self.NAME_VARIATIONS.get(normalized, normalized)
+
+        return self._normalized[team_name]
+
+    def _ngrams(self, text: str) -> set:
+        """Distinct character n-grams of a lowercased name."""
+        if len(text) < self.ngram_size:
+            return {text} if text else set()
+        return {text[start:start + self.ngram_size] for start in range(len(text) - self.ngram_size + 1)}
+
+    def _char_counts(self, names: List[str]) -> np.ndarray:
+        """Character count matrix (one row per name) over the vocabulary's alphabet."""
+        counts = np.zeros((len(names), len(self._alphabet)), dtype=np.int32)
+        for row, name in enumerate(names):
+            for char, count in Counter(name).items():
+                if char in self._alphabet:
+                    counts[row, self._alphabet[char]] = count
+        return counts
+
+    def _ratio_bounds(self, text: str, counts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """
+        Upper bounds of the SequenceMatcher ratio of a text with every vocabulary name.
+
+        Same formula as SequenceMatcher.quick_ratio(), evaluated for the whole
+        vocabulary at once from the character count matrix.
+        """
+        shared = np.minimum(counts, self._char_counts([text])[0]).sum(axis=1)
+        totals = lengths + len(text)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            bounds = 2.0 * shared / totals
+        return np.where(totals > 0, bounds, 1.0)
+
+    def set_vocabulary(self, teams: Iterable[str]) -> 'TeamNameIndex':
+        """
+        Set the names that lookups resolve to, in order of preference for ties.
+
+        Builds the lowercased and normalized forms, their character count
+        matrices and the n-gram postings once; resolutions of the previous
+        vocabulary are discarded.
+
+        Args:
+            teams: Candidate team names (e.g. the Understat teams)
+
+        Returns:
+            The index itself
+        """
+        teams = list(teams)
+        if teams == self.teams:
+            return self
+
+        self.teams = teams
+        self.resolutions = {}
+        self._lower = [team.lower() for team in teams]
+        self._normalized_lower = [self.normalize(team).lower() for team in teams]
+
+        characters = sorted(set(''.join(self._lower)) | set(''.join(self._normalized_lower)))
+        self._alphabet = {char: column for column, char in enumerate(characters)}
+        self._lower_counts = self._char_counts(self._lower)
+        self._lower_lengths = np.array([len(name) for name in self._lower], dtype=np.int64)
+        self._normalized_counts = self._char_counts(self._normalized_lower)
+        self._normalized_lengths = np.array([len(name) for name in self._normalized_lower], dtype=np.int64)
+
+        self._postings = {}
+        for position, name in enumerate(self._normalized_lower):
+            for gram in self._ngrams(name):
+                self._postings.setdefault(gram, []).append(position)
+
+        return self
+
+    def _shared_ngrams(self, target: str) -> np.ndarray:
+        """Number of distinct n-grams each vocabulary name shares with the target."""
+        shared = np.zeros(len(self.teams), dtype=np.int64)
+        for gram in self._ngrams(target):
+            if gram in self._postings:
+                shared[self._postings[gram]] += 1
+        return shared
+
+    def resolve(self, target_team: str) -> Tuple[str, float]:
+        """
+        Find the vocabulary name that best matches a team name.
+
+        A target with a known Understat alias resolves to the first vocabulary
+        name that is more than ALIAS_MATCH_THRESHOLD similar to that alias, with
+        confidence 1.0. Otherwise the normalized names are scored by similarity
+        plus SUBSTRING_BOOST when one contains the other, and the first name
+        with the highest score wins.
+
+        Args:
+            target_team: Team name to match
+
+        Returns:
+            Tuple of (best_match, confidence_score); ('', 0.0) if nothing matches
+        """
+        if target_team not in self.resolutions:
+            self.resolutions[target_team] = self._resolve(target_team)
+
+        return self.resolutions[target_team]
+
+    def _resolve(self, target_team: str) -> Tuple[str, float]:
+        """Resolve a team name against the vocabulary without memoization."""
+        # Direct mapping check: the first vocabulary name close to the Understat alias
+        if target_team in self._reverse_mapping:
+            alias = self._reverse_mapping[target_team].lower()
+            bounds = self._ratio_bounds(alias, self._lower_counts, self._lower_lengths)
+
+            for position in np.flatnonzero(bounds > self.ALIAS_MATCH_THRESHOLD).tolist():
+                if SequenceMatcher(None, alias, self._lower[position]).ratio() > self.ALIAS_MATCH_THRESHOLD:
+                    return self.teams[position], 1.0
+
+        # Similarity score: scan by descending upper bound (most shared n-grams
+        # first among equal bounds) and stop once no remaining name can win
+        target = self.normalize(target_team).lower()
+        boosts = np.array([self.SUBSTRING_BOOST if target in name or name in target else 0.0
+                           for name in self._normalized_lower])
+        bounds = self._ratio_bounds(target, self._normalized_counts, self._normalized_lengths) + boosts
+        positions = np.arange(len(self.teams))
+        order = np.lexsort((positions, -self._shared_ngrams(target), -bounds))
+
+        best_position = None
+        best_score = 0.0
+
+        for position in order.tolist():
+            bound = bounds[position]
+            if bound < best_score:
+                break
+
+            # A tie only wins for an earlier vocabulary position, as in a sequential scan
+            if bound == best_score and (best_position is None or position > best_position):
+                continue
+
+            score = SequenceMatcher(None, target, self._normalized_lower[position]).ratio() + boosts[position]
+            if score > best_score or (score == best_score and best_position is not None and position < best_position):
+                best_score = float(score)
+                best_position = position
+
+        if best_position is None:
+            return "", 0.0
+
+        return self.teams[best_position], min(best_score, 1.0)
+
+
+class TeamSimilarityMatrix:
+    """
+    Similarity of odds team names to Understat team names, as a NumPy matrix.
+
+    Rows are odds names, columns Understat names. Each cell holds the same
+    value as TeamNameIndex.similarity(understat_name, odds_name) and is
+    computed at most once, when first looked up (or all at once with fill()),
+    so scoring candidates becomes integer-indexed array lookups. A matrix of
+    quick_ratio() upper bounds, cheap to build from character counts, lets
+    callers skip cells that cannot change their decision.
+    """
+
+    def __init__(self, odds_names: Iterable[str], understat_names: Iterable[str]):
+        """
+        Initialize an empty matrix over two vocabularies.
+
+        Args:
+            odds_names: Team names as spelled in the odds data (e.g. template away teams)
+            understat_names: Team names as spelled in Understat
+        """
+        self.odds_names = pd.Index(pd.unique(pd.Series(list(odds_names), dtype=object)))
+        self.understat_names = pd.Index(pd.unique(pd.Series(list(understat_names), dtype=object)))
+        self._odds_codes = {name: code for code, name in enumerate(self.odds_names)}
+        self._understat_codes = {name: code for code, name in enumerate(self.understat_names)}
+        self._odds_lower = [name.lower() for name in self.odds_names]
+        self._understat_lower = [name.lower() for name in self.understat_names]
+
+        # NaN marks cells not computed yet; ratios are never NaN
+        self.matrix = np.full((len(self.odds_names), len(self.understat_names)), np.nan)
+        self.cells_computed = 0
+        self._bound_matrix = None
+
+    def _compute(self, odds_code: int, understat_codes: np.ndarray) -> None:
+        """Fill the cells of one odds name for the given Understat columns."""
+        # The odds name is SequenceMatcher's second sequence, which it indexes
+        # once; only the first sequence changes between the cells of a row
+        matcher = SequenceMatcher(None, '', self._odds_lower[odds_code])
+        for understat_code in understat_codes.tolist():
+            matcher.set_seq1(self._understat_lower[understat_code])
+            self.matrix[odds_code, understat_code] = matcher.ratio()
+        self.cells_computed += len(understat_codes)
+
+    @staticmethod
+    def _char_counts(names: List[str], alphabet: Dict[str, int]) -> np.ndarray:
+        """Character count matrix (one row per name) over an alphabet."""
+        counts = np.zeros((len(names), len(alphabet)), dtype=np.int32)
+        for row, name in enumerate(names):
+            for char, count in Counter(name).items():
+                counts[row, alphabet[char]] = count
+        return counts
+
+    def bound_matrix(self) -> np.ndarray:
+        """
+        Upper bounds of every cell, built once on first use.
+
+        Same formula as SequenceMatcher.quick_ratio(), so each bound is at least
+        the cell's ratio as a float.
+
+        Returns:
+            float64 matrix shaped like the similarity matrix
+        """
+        if self._bound_matrix is None:
+            characters = sorted(set(''.join(self._odds_lower)) | set(''.join(self._understat_lower)))
+            alphabet = {char: column for column, char in enumerate(characters)}
+            understat_counts = self._char_counts(self._understat_lower, alphabet)
+            understat_lengths = np.array([len(name) for name in self._understat_lower], dtype=np.int64)
+
+            bounds = np.empty(self.matrix.shape)
+            for odds_code, counts in enumerate(self._char_counts(self._odds_lower, alphabet)):
+                shared = np.minimum(understat_counts, counts).sum(axis=1)
+                totals = understat_lengths + len(self._odds_lower[odds_code])
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    bounds[odds_code] = np.where(totals > 0, 2.0 * shared / totals, 1.0)
+            self._bound_matrix = bounds
+
+        return self._bound_matrix
+
+    def bounds(self, odds_codes: np.ndarray, understat_codes: np.ndarray) -> np.ndarray:
+        """
+        Upper bounds of the similarities of aligned code pairs.
+
+        Args:
+            odds_codes: Row positions in odds_names
+            understat_codes: Column positions in understat_names
+
+        Returns:
+            float64 array with one bound per pair
+        """
+        return self.bound_matrix()[np.asarray(odds_codes, dtype=np.intp), np.asarray(understat_codes, dtype=np.intp)]
+
+    def computed(self, odds_codes: np.ndarray, understat_codes: np.ndarray) -> np.ndarray:
+        """
+        Similarities of aligned code pairs as far as already computed (NaN otherwise).
+
+        Args:
+            odds_codes: Row positions in odds_names
+            understat_codes: Column positions in understat_names
+
+        Returns:
+            float64 array with one entry per pair
+        """
+        return self.matrix[np.asarray(odds_codes, dtype=np.intp), np.asarray(understat_codes, dtype=np.intp)]
+
+    def fill(self) -> 'TeamSimilarityMatrix':
+        """
+        Compute every cell that has not been computed yet.
+
+        Returns:
+            The matrix itself
+        """
+        for odds_code in range(len(self.odds_names)):
+            self._compute(odds_code, np.flatnonzero(np.isnan(self.matrix[odds_code])))
+        return self
+
+    def lookup(self, odds_codes: np.ndarray, understat_codes: np.ndarray) -> np.ndarray:
+        """
+        Similarities of aligned (odds, Understat) code pairs.
+
+        Args:
+            odds_codes: Row positions in odds_names
+            understat_codes: Column positions in understat_names
+
+        Returns:
+            float64 array with one score per pair
+        """
+        odds_codes = np.asarray(odds_codes, dtype=np.intp)
+        understat_codes = np.asarray(understat_codes, dtype=np.intp)
+        if (odds_codes < 0).any() or (understat_codes < 0).any():
+            raise KeyError("Team name not in the similarity matrix vocabulary")
+
+        missing = np.isnan(self.matrix[odds_codes, understat_codes])
+        if missing.any():
+            cells = np.unique(np.stack([odds_codes[missing], understat_codes[missing]], axis=1), axis=0)
+            rows, starts = np.unique(cells[:, 0], return_index=True)
+            for odds_code, columns in zip(rows.tolist(), np.split(cells[:, 1], starts[1:])):
+                self._compute(odds_code, columns)
+
+        return self.matrix[odds_codes, understat_codes]
+
+    def codes(self, odds_names: Iterable[str], understat_names: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Matrix positions of aligned name sequences (-1 for names outside the vocabularies).
+
+        Args:
+            odds_names: Odds team names
+            understat_names: Understat team names
+
+        Returns:
+            Tuple of (odds_codes, understat_codes)
+        """
+        return (self.odds_names.get_indexer(pd.Index(list(odds_names), dtype=object)),
+                self.understat_names.get_indexer(pd.Index(list(understat_names), dtype=object)))
+
+    def score(self, odds_name: str, understat_name: str) -> float:
+        """
+        Similarity of one odds name to one Understat name.
+
+        Names outside the vocabularies are scored directly without being stored.
+
+        Args:
+            odds_name: Odds team name
+            understat_name: Understat team name
+
+        Returns:
+            SequenceMatcher ratio between 0 and 1
+        """
+        odds_code = self._odds_codes.get(odds_name)
+        understat_code = self._understat_codes.get(understat_name)
+        if odds_code is None or understat_code is None:
+            return TeamNameIndex.similarity(understat_name, odds_name)
+
+        if np.isnan(self.matrix[odds_code, understat_code]):
+            self._compute(odds_code, np.array([understat_code]))
+        return float(self.matrix[odds_code, understat_code])
@@ -0,0 +1,49 @@
+"""
+Shared fixtures for the pipeline tests.
+
+The tools are flat scripts in the Python folder, so the folder is put on the
+import path here. Small synthetic leagues from SyntheticLeagueGenerator stand
+in for the real odds and Understat files.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Benchmark_Suite import SyntheticLeagueGenerator
+
+
+@pytest.fixture(scope='session')
+def synthetic_league(tmp_path_factory):
+    """One synthetic EPL competition over three seasons, with noisy names and dates."""
+    folder = tmp_path_factory.mktemp('synthetic_league')
+    generator = SyntheticLeagueGenerator(seed=7, seasons=3, teams_per_league=8,
+                                         name_noise=0.25, date_drift=0.2, missing_rate=0.1)
+    paths = generator.generate(str(folder))
+    paths['aliases'] = generator.team_aliases()
+    return paths
+
+
+@pytest.fixture(scope='session')
+def finder_template(synthetic_league, tmp_path_factory):
+    """Merged synthetic league and the collection template written from it."""
+    from Data_Merger import FootballDataMerger
+    from Missing_Matches import UnderstatDataFinder
+
+    folder = tmp_path_factory.mktemp('finder_template')
+    integrated_file = str(folder / 'integrated_football_analytics_dataset.csv')
+    template_path = str(folder / 'understat_manual_collection_template.csv')
+
+    merger = FootballDataMerger()
+    merger.team_index.add_aliases(synthetic_league['aliases'])
+    merger.merge_all_data(synthetic_league['odds_folder'], synthetic_league['understat_file'], integrated_file)
+
+    missing_finder = UnderstatDataFinder()
+    missing_matches = missing_finder.find_missing_xg_matches(missing_finder.load_integrated_dataset(integrated_file))
+    missing_finder.create_manual_collection_template(missing_matches, template_path)
+
+    return {'integrated_file': integrated_file, 'template_path': template_path,
+            'understat_file': synthetic_league['understat_file']}
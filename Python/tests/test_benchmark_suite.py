@@ -0,0 +1,76 @@
+"""
+Tests for the synthetic league generator and the scaling benchmark.
+"""
+
+import filecmp
+import glob
+import os
+
+import pandas as pd
+import pytest
+
+from Benchmark_Suite import PipelineBenchmark, SyntheticLeagueGenerator
+
+
+def _generated_files(paths):
+    return sorted(glob.glob(os.path.join(paths['odds_folder'], '*.csv'))) + [paths['understat_file']]
+
+
+def test_equal_seeds_generate_identical_files(tmp_path):
+    settings = {'seed': 5, 'seasons': 2, 'teams_per_league': 6, 'name_noise': 0.5}
+    first = SyntheticLeagueGenerator(**settings).generate(str(tmp_path / 'first'))
+    second = SyntheticLeagueGenerator(**settings).generate(str(tmp_path / 'second'))
+    other_seed = SyntheticLeagueGenerator(**dict(settings, seed=6)).generate(str(tmp_path / 'other'))
+
+    for left, right in zip(_generated_files(first), _generated_files(second)):
+        assert filecmp.cmp(left, right, shallow=False)
+    assert not filecmp.cmp(first['understat_file'], other_seed['understat_file'], shallow=False)
+
+
+def test_generated_files_hold_the_configured_matches(tmp_path):
+    generator = SyntheticLeagueGenerator(seed=5, leagues=2, seasons=2, teams_per_league=6, missing_rate=0.2,
+                                         league_names=['EPL', 'La_liga'])
+    paths = generator.generate(str(tmp_path))
+
+    odds = pd.concat([pd.read_csv(path) for path in _generated_files(paths)[:-1]])
+    understat = pd.read_csv(paths['understat_file'])
+
+    assert len(odds) == generator.match_count == 2 * 2 * 6 * 5
+    assert sorted(odds['Div'].unique()) == ['E0', 'SP1']
+    assert sorted(understat['league'].unique()) == ['EPL', 'La_liga']
+    # One home and one away row per covered match, some matches left out
+    assert (understat['h_a'] == 'h').sum() == (understat['h_a'] == 'a').sum()
+    assert len(understat) < 2 * generator.match_count
+
+
+def test_for_match_count_adds_competitions_to_reach_the_target():
+    generator = SyntheticLeagueGenerator.for_match_count(5_000, seasons=2, teams_per_league=10)
+
+    assert generator.match_count >= 5_000
+    assert generator.leagues == 28
+
+
+@pytest.mark.parametrize('settings', [
+    {'teams_per_league': 5},
+    {'leagues': 0},
+    {'name_noise': 1.5},
+    {'league_names': ['MLS']}
+])
+def test_invalid_settings_are_rejected(settings):
+    with pytest.raises(ValueError):
+        SyntheticLeagueGenerator(**settings)
+
+
+def test_benchmark_times_every_tool_stage(tmp_path):
+    benchmark = PipelineBenchmark(str(tmp_path), seed=3, finder_rows=20, seasons=2, teams_per_league=6)
+
+    results = benchmark.run([60, 120])
+
+    assert set(results['tool']) == {'FootballDataMerger', 'UnderstatDataFinder', 'UnderstatMatchFinder'}
+    assert (results['duration_s'] >= 0).all()
+    for name in ('integrated_football_analytics_dataset.csv', 'understat_manual_collection_template.csv'):
+        assert os.path.exists(os.path.join(benchmark.output_folder(120), name))
+
+    table = benchmark.scaling_table()
+    assert 'scaling_exponent' in table.columns
+    assert len(table) == results.groupby(['tool', 'stage']).ngroups
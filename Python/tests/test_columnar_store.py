@@ -0,0 +1,80 @@
+"""
+Tests for the columnar store and the cache of parsed inputs built on it.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from Columnar_Store import ColumnarCache, ColumnarStore
+
+
+@pytest.fixture
+def typed_frame():
+    return pd.DataFrame({
+        'Date': pd.to_datetime(['2014-08-16', None, '2015-05-24']),
+        'Team1': pd.Categorical(['Arsenal', 'Chelsea', None]),
+        'Referee': pd.Series(['M Dean', None, 'A Taylor'], dtype=object),
+        'G1': np.array([2, 0, 1], dtype=np.int8),
+        'HST': pd.array([5, None, 7], dtype='Int64'),
+        '>2.5': [1.85, np.nan, 2.1],
+        'played': [True, False, True]
+    }, index=pd.Index([10, 11, 12]))
+
+
+@pytest.mark.parametrize('mmap_mode', [None, 'r'])
+def test_round_trip_keeps_values_types_and_index(typed_frame, tmp_path, mmap_mode):
+    ColumnarStore.write(typed_frame, str(tmp_path / 'store'))
+
+    restored = ColumnarStore.read(str(tmp_path / 'store'), mmap_mode=mmap_mode)
+
+    # Memory-mapped columns are np.memmap views; copy them to compare values
+    pd.testing.assert_frame_equal(restored.copy(), typed_frame)
+
+
+def test_column_subsets_are_read_in_requested_order(typed_frame, tmp_path):
+    ColumnarStore.write(typed_frame, str(tmp_path / 'store'))
+
+    subset = ColumnarStore.read(str(tmp_path / 'store'), columns=['>2.5', 'G1'])
+
+    pd.testing.assert_frame_equal(subset, typed_frame[['>2.5', 'G1']])
+    pd.testing.assert_series_equal(ColumnarStore.read_column(str(tmp_path / 'store'), 'Team1'),
+                                   typed_frame['Team1'].reset_index(drop=True))
+    with pytest.raises(KeyError):
+        ColumnarStore.read(str(tmp_path / 'store'), columns=['xG1'])
+
+
+def test_object_columns_must_hold_strings(tmp_path):
+    with pytest.raises(TypeError):
+        ColumnarStore.write(pd.DataFrame({'mixed': ['a', 1]}), str(tmp_path / 'store'))
+
+
+def test_cache_counts_hits_and_misses(typed_frame, tmp_path):
+    cache = ColumnarCache(str(tmp_path / 'cache'))
+
+    assert cache.get('odds_abc') is None
+    assert cache.put('odds_abc', typed_frame)
+    pd.testing.assert_frame_equal(cache.get('odds_abc'), typed_frame)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Frames the store cannot hold are skipped rather than failing the merge
+    assert not cache.put('odds_bad', pd.DataFrame({'mixed': ['a', 1]}))
+    assert cache.get('odds_bad') is None
+
+
+def test_cache_evicts_least_recently_used_entries(typed_frame, tmp_path):
+    cache = ColumnarCache(str(tmp_path / 'cache'))
+    for key in ('first', 'second', 'third'):
+        cache.put(key, typed_frame)
+    entry_size = ColumnarCache._folder_size(os.path.join(cache.cache_dir, 'first'))
+
+    # Make 'first' the oldest, then use 'second' again
+    for age, key in enumerate(('third', 'second', 'first')):
+        os.utime(os.path.join(cache.cache_dir, key), (1_000_000 - age, 1_000_000 - age))
+    cache.get('second')
+
+    cache.max_bytes = 2 * entry_size
+    assert cache.evict() == 1
+    assert sorted(os.listdir(cache.cache_dir)) == ['second', 'third']
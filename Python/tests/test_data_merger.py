@@ -0,0 +1,230 @@
+"""Tests for FootballDataMerger."""
+
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from Benchmark_Suite import SyntheticLeagueGenerator
+from Columnar_Store import ColumnarStore
+from Data_Merger import FootballDataMerger
+
+
+ODDS_ROWS = {
+    'Div': ['E0', 'E0'],
+    'Date': ['24/08/2017', '26/08/2017'],
+    'HomeTeam': ['Kingsbury', 'Selby'],
+    'AwayTeam': ['Selby', 'Kingsbury'],
+    'FTHG': [1, 2], 'FTAG': [0, 2], 'FTR': ['H', 'D'],
+    'HS': [10, 12], 'AS': [8, 9], 'HST': [4, 5], 'AST': [2, 3],
+    'BbAvH': [1.9, 2.1], 'BbAvD': [3.4, 3.3], 'BbAvA': [4.2, 3.6],
+    'BbAv>2.5': [1.8, 1.9], 'BbAv<2.5': [2.0, 1.95]
+}
+
+
+def _understat_rows(home_xg, away_xg, home_xpts, away_xpts):
+    """Understat per-game rows of the two ODDS_ROWS fixtures."""
+    rows = []
+    for date, home, away, scored, missed in (('2017-08-24', 'Kingsbury', 'Selby', 1, 0),
+                                             ('2017-08-26', 'Selby', 'Kingsbury', 2, 2)):
+        for side, team, goals_for, goals_against, xg, xpts in (('h', home, scored, missed, home_xg, home_xpts),
+                                                               ('a', away, missed, scored, away_xg, away_xpts)):
+            rows.append({'league': 'EPL', 'year': 2017, 'h_a': side, 'xG': xg, 'xGA': 1.0,
+                         'npxG': xg, 'npxGA': 1.0, 'scored': goals_for, 'missed': goals_against,
+                         'xpts': xpts, 'date': f'{date} 00:00:00', 'team': team})
+    return pd.DataFrame(rows)
+
+
+def _write_inputs(folder, understat):
+    odds_folder = folder / 'odds'
+    odds_folder.mkdir()
+    pd.DataFrame(ODDS_ROWS).to_csv(odds_folder / '17-18.csv', index=False)
+    understat.to_csv(folder / 'understat_per_game.csv', index=False)
+    return str(odds_folder), str(folder / 'understat_per_game.csv')
+
+
+def test_xg_rounding_matches_row_by_row_merge(tmp_path):
+    # Values on a .5 boundary, where round() on floats and np.round disagree:
+    # the row-by-row merge rounded home values with round() and away values with np.round
+    odds_folder, understat_file = _write_inputs(tmp_path, _understat_rows(
+        home_xg=1.725, away_xg=0.465, home_xpts=2.695, away_xpts=1.885))
+
+    result = FootballDataMerger().merge_all_data(odds_folder, understat_file, str(tmp_path / 'out.csv'))
+
+    assert result['xG1'].tolist() == [1.73, 1.73]
+    assert result['xG2'].tolist() == [0.46, 0.46]
+    assert result['xpts1'].tolist() == [2.69, 2.69]
+    assert result['xpts2'].tolist() == [1.88, 1.88]
+    assert result['xpts_diff2'].tolist() == [1.88, 0.88]
+
+
+def test_typed_dataset_swap_keeps_the_old_store_when_it_fails(tmp_path, monkeypatch):
+    odds_folder, understat_file = _write_inputs(tmp_path, _understat_rows(1.2, 0.8, 2.1, 0.7))
+    merger = FootballDataMerger()
+    final_data = merger.merge_all_data(odds_folder, understat_file, str(tmp_path / 'out.csv'))
+    typed_folder = tmp_path / 'typed'
+
+    merger.save_typed_dataset(final_data, str(typed_folder))
+    merger.save_typed_dataset(final_data.iloc[:1], str(typed_folder))
+    assert len(ColumnarStore.read(str(typed_folder))) == 1
+
+    real_replace = os.replace
+
+    def replace_failing_on_new_store(source, destination):
+        if os.path.basename(source).startswith('.tmp_'):
+            raise OSError("disk full")
+        real_replace(source, destination)
+
+    monkeypatch.setattr(os, 'replace', replace_failing_on_new_store)
+    with pytest.raises(OSError):
+        merger.save_typed_dataset(final_data, str(typed_folder))
+
+    assert len(ColumnarStore.read(str(typed_folder))) == 1
+    assert not [name for name in os.listdir(tmp_path) if name.startswith('.')]
+
+
+def test_dates_outside_the_detected_format_are_still_parsed():
+    # The detection sample only holds 2-digit years; later rows use 4-digit years
+    dates = pd.Series([f'{day:02d}/08/17' for day in range(1, 29)] * 2 + ['02/09/2017', '16.09.2017'])
+
+    parsed, method = FootballDataMerger()._parse_file_dates(dates, 'mixed-layout')
+
+    assert parsed.notna().all()
+    assert parsed.iloc[-2:].tolist() == [pd.Timestamp('2017-09-02'), pd.Timestamp('2017-09-16')]
+    assert parsed.iloc[0] == pd.Timestamp('2017-08-01')
+    assert 'format %d/%m/%y' in method and '2 dates parsed individually' in method
+
+
+def test_unparseable_dates_are_counted():
+    dates = pd.Series(['24/08/17'] * 60 + ['not a date'])
+
+    parsed, method = FootballDataMerger()._parse_file_dates(dates, 'bad-value')
+
+    assert parsed.isna().sum() == 1 and pd.isna(parsed.iloc[-1])
+    assert '1 dates parsed individually (1 could not be parsed)' in method
+
+
+def test_league_workers_keep_the_caller_settings(tmp_path):
+    merger = FootballDataMerger(date_tolerance_days=2, load_workers=3, projected_reads=True,
+                                cache_dir=str(tmp_path / 'cache'), track_memory=True,
+                                metrics_path=str(tmp_path / 'metrics.jsonl'), profile_dir=str(tmp_path / 'profiles'),
+                                profile_stages=['merge_league'], profile_mode='cprofile')
+
+    worker = merger._spawn_worker()
+
+    for setting in ('date_tolerance_days', 'load_workers', 'projected_reads', 'track_memory',
+                    'metrics_path', 'profile_dir', 'profile_stages', 'profile_mode'):
+        assert getattr(worker, setting) == getattr(merger, setting)
+    assert worker.cache is merger.cache
+    assert worker.stage_metrics is merger.stage_metrics
+    assert worker.team_index is merger.team_index
+
+
+def test_merge_all_leagues_partitions_by_league_and_season(tmp_path):
+    # Every season file holds both divisions under the same season label
+    generator = SyntheticLeagueGenerator(seed=3, leagues=2, seasons=2, teams_per_league=6,
+                                         league_names=['EPL', 'La_liga'])
+    paths = generator.generate(str(tmp_path / 'inputs'))
+    merger = FootballDataMerger(metrics_path=str(tmp_path / 'metrics.jsonl'))
+    merger.team_index.add_aliases(generator.team_aliases())
+
+    summary = merger.merge_all_leagues(paths['odds_folder'], paths['understat_file'],
+                                       str(tmp_path / 'out'), max_workers=2)
+
+    assert sorted(zip(summary['league'], summary['season'])) == [
+        ('EPL', '14-15'), ('EPL', '15-16'), ('La_liga', '14-15'), ('La_liga', '15-16')]
+    assert (summary['matches'] == 30).all()
+    for partition in summary.itertuples():
+        written = pd.read_csv(partition.path)
+        assert len(written) == partition.matches
+        assert partition.path.endswith(f"{partition.league}/{partition.season}.csv")
+
+    with open(tmp_path / 'metrics.jsonl', encoding='utf-8') as handle:
+        records = [json.loads(line) for line in handle]
+    assert sorted(record['league'] for record in records if record['stage'] == 'merge_league') == ['EPL', 'La_liga']
+
+
+AGGREGATE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                              'Data', 'understat 2014_20', 'understat.com.csv')
+
+
+def test_team_season_dimension_finds_key_columns_by_name(tmp_path):
+    expected = FootballDataMerger().load_team_season_dimension(AGGREGATE_FILE)
+
+    # Named key columns moved to the end of the file give the same dimension
+    aggregates = pd.read_csv(AGGREGATE_FILE)
+    aggregates = aggregates.rename(columns={'Unnamed: 0': 'league', 'Unnamed: 1': 'season'})
+    aggregates = aggregates[[*aggregates.columns[2:], 'season', 'league']]
+    aggregates.to_csv(tmp_path / 'reordered.csv', index=False)
+
+    reordered = FootballDataMerger().load_team_season_dimension(str(tmp_path / 'reordered.csv'))
+
+    pd.testing.assert_frame_equal(reordered, expected)
+
+
+def test_team_season_dimension_rejects_missing_key_columns(tmp_path):
+    aggregates = pd.read_csv(AGGREGATE_FILE).rename(columns={'Unnamed: 0': 'league'})
+    aggregates.drop(columns='Unnamed: 1').to_csv(tmp_path / 'no_season.csv', index=False)
+
+    with pytest.raises(ValueError, match='no season column'):
+        FootballDataMerger().load_team_season_dimension(str(tmp_path / 'no_season.csv'))
+
+
+def test_team_season_dimension_rejects_non_year_seasons(tmp_path):
+    # A blank-header export whose second blank column holds something other than years
+    aggregates = pd.read_csv(AGGREGATE_FILE)
+    aggregates['Unnamed: 1'] = aggregates['team']
+    aggregates.to_csv(tmp_path / 'shifted.csv', index=False)
+
+    with pytest.raises(ValueError, match='must hold season start years'):
+        FootballDataMerger().load_team_season_dimension(str(tmp_path / 'shifted.csv'))
+
+
+def _row_by_row_lookup(understat_data):
+    """The original pairing: first qualifying away row in file order, later fixtures overwrite."""
+    home_games = understat_data[understat_data['h_a'] == 'h']
+    away_games = understat_data[understat_data['h_a'] == 'a']
+
+    lookup = {}
+    for _, home_row in home_games.iterrows():
+        away_match = away_games[
+            (away_games['date'] == home_row['date']) &
+            (away_games['scored'] == home_row['missed']) &
+            (away_games['missed'] == home_row['scored'])
+        ]
+        if not away_match.empty:
+            away_row = away_match.iloc[0]
+            key = (home_row['date'], home_row['team_mapped'], away_row['team_mapped'])
+            lookup[key] = (home_row['xG'], away_row['xG'], home_row['xpts'], away_row['xpts'])
+    return lookup
+
+
+def test_home_away_pairing_matches_row_by_row_lookup():
+    day, next_day = pd.Timestamp('2017-08-24'), pd.Timestamp('2017-08-25')
+    rows = [
+        # Two 1-0 games on one day: both home rows see two qualifying away rows
+        (day, 'h', 'Ashford', 1, 0, 1.1, 2.1), (day, 'a', 'Bramley', 0, 1, 0.4, 0.6),
+        (day, 'h', 'Carlton', 1, 0, 1.3, 2.3), (day, 'a', 'Dunmore', 0, 1, 0.5, 0.7),
+        # The same fixture listed twice on one day, with different values
+        (next_day, 'h', 'Ashford', 2, 2, 1.5, 1.1), (next_day, 'a', 'Carlton', 2, 2, 1.2, 1.0),
+        (next_day, 'h', 'Ashford', 2, 2, 1.6, 1.2), (next_day, 'a', 'Carlton', 2, 2, 1.3, 0.9),
+        # An away row without a home row and an unpaired home row
+        (next_day, 'a', 'Eastwick', 0, 3, 0.2, 0.1), (next_day, 'h', 'Fairford', 4, 1, 2.2, 2.6),
+    ]
+    understat = pd.DataFrame(rows, columns=['date', 'h_a', 'team', 'scored', 'missed', 'xG', 'xpts'])
+    understat = understat.assign(team_mapped=understat['team'], xGA=1.0, npxG=understat['xG'], year=2017)
+
+    merger = FootballDataMerger()
+    lookup = merger.create_understat_lookup(understat)
+    expected = _row_by_row_lookup(understat)
+
+    dates, home_teams, away_teams = (pd.Series(values) for values in zip(*expected))
+    expected_keys = merger._build_match_keys(dates, home_teams, away_teams)
+    assert sorted(lookup['match_key']) == sorted(expected_keys)
+
+    actual = lookup.set_index('match_key')[['home_xG', 'away_xG', 'home_xpts', 'away_xpts']]
+    for match_key, values in zip(expected_keys, expected.values()):
+        assert tuple(actual.loc[match_key]) == values
+    # Both 1-0 home rows and both rows of the listed-twice fixture had two candidates
+    assert merger.merge_statistics['ambiguous_pairings'] == 4
@@ -0,0 +1,107 @@
+"""
+Tests for the memory-mapped integrated dataset reader.
+"""
+
+import io
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from Data_Merger import FootballDataMerger
+from Integrated_Dataset import IntegratedDataset
+from Missing_Matches import UnderstatDataFinder
+
+
+@pytest.fixture(scope='module')
+def merged_dataset(synthetic_league, tmp_path_factory):
+    """Synthetic merge written as CSV and typed copy, with the CSV rows read back."""
+    output_path = str(tmp_path_factory.mktemp('integrated_dataset') / 'integrated.csv')
+    merger = FootballDataMerger()
+    merger.team_index.add_aliases(synthetic_league['aliases'])
+    merger.merge_all_data(synthetic_league['odds_folder'], synthetic_league['understat_file'],
+                          output_path, output_format='both')
+    return output_path, pd.read_csv(output_path)
+
+
+def _seasons_of(csv_rows):
+    dates = pd.to_datetime(csv_rows['Date'], format='%d.%m.%Y')
+    start_years = dates.dt.year - (dates.dt.month < IntegratedDataset.SEASON_START_MONTH)
+    return start_years.map(IntegratedDataset.season_label)
+
+
+def test_select_matches_filtering_the_csv(merged_dataset):
+    output_path, csv_rows = merged_dataset
+    dataset = IntegratedDataset.open(output_path)
+    seasons = _seasons_of(csv_rows)
+    team = csv_rows['Team1'].iloc[0]
+
+    assert len(dataset) == len(csv_rows)
+    assert dataset.columns == csv_rows.columns.tolist()
+    assert dataset.seasons() == sorted(seasons.unique())
+
+    selected = dataset.select(seasons=['15-16'], teams=[team, 'Not a team'])
+    expected = csv_rows[(seasons == '15-16') & ((csv_rows['Team1'] == team) | (csv_rows['Team2'] == team))]
+    assert len(selected) > 0
+    pd.testing.assert_frame_equal(IntegratedDataset.as_csv_layout(selected), expected, check_dtype=False)
+
+
+def test_slice_returns_contiguous_rows(merged_dataset):
+    output_path, csv_rows = merged_dataset
+    dataset = IntegratedDataset.open(output_path, mmap_mode=None)
+
+    rows = dataset.slice(10, 20, columns=['Date', 'Team1', 'xG1'])
+
+    pd.testing.assert_frame_equal(IntegratedDataset.as_csv_layout(rows),
+                                  csv_rows[['Date', 'Team1', 'xG1']].iloc[10:20], check_dtype=False)
+
+
+def test_stale_typed_copy_is_not_opened(merged_dataset, tmp_path):
+    output_path, csv_rows = merged_dataset
+    stale_path = str(tmp_path / 'integrated.csv')
+    shutil.copytree(IntegratedDataset.columnar_path(output_path), IntegratedDataset.columnar_path(stale_path))
+    csv_rows.to_csv(stale_path, index=False)
+    schema_mtime = os.path.getmtime(os.path.join(IntegratedDataset.columnar_path(stale_path), 'schema.json'))
+    os.utime(stale_path, (schema_mtime + 10, schema_mtime + 10))
+
+    assert not IntegratedDataset.is_current(stale_path)
+    with pytest.raises(FileNotFoundError):
+        IntegratedDataset.open(stale_path)
+    with pytest.raises(FileNotFoundError):
+        IntegratedDataset.open(str(tmp_path / 'no_copy.csv'))
+
+
+def test_missing_data_finder_reads_the_typed_copy_only_when_asked(merged_dataset):
+    output_path, csv_rows = merged_dataset
+    finder = UnderstatDataFinder()
+
+    pd.testing.assert_frame_equal(finder.load_integrated_dataset(output_path), csv_rows)
+
+    typed_rows = finder.load_integrated_dataset(output_path, use_columnar=True)
+    assert isinstance(typed_rows['Team1'].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(IntegratedDataset.as_csv_layout(typed_rows), csv_rows, check_dtype=False)
+
+
+def test_csv_layout_keeps_missing_categories_missing():
+    typed = pd.DataFrame({
+        'Date': pd.to_datetime(['2015-08-09', '2015-08-10', None]),
+        'Team1': pd.Categorical(['Ashford', 'Carlton', 'Ilford']),
+        'R': pd.Categorical(['H', None, 'D']),
+        'S1': np.array([12, 9, 4], dtype=np.int8)
+    })
+
+    layout = IntegratedDataset.as_csv_layout(typed)
+
+    assert layout['R'].dtype == object
+    assert layout['R'].isna().tolist() == [False, True, False]
+    assert layout['R'].tolist()[::2] == ['H', 'D']
+    assert layout['Date'].isna().tolist() == [False, False, True]
+    assert layout['S1'].dtype == float
+
+    # The same rows written and read back as CSV
+    written = typed.assign(Date=typed['Date'].dt.strftime('%d.%m.%Y'))
+    from_csv = pd.read_csv(io.StringIO(written.to_csv(index=False)))
+    assert layout['R'].isna().equals(from_csv['R'].isna())
+    assert layout['R'].dropna().tolist() == from_csv['R'].dropna().tolist()
@@ -0,0 +1,62 @@
+"""
+Tests for the single-pass integration report.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from Integration_Report import ReportAccumulator
+
+
+@pytest.fixture(scope='module')
+def integrated_rows(finder_template):
+    return pd.read_csv(finder_template['integrated_file'])
+
+
+def test_report_matches_direct_computation(integrated_rows):
+    report = ReportAccumulator()
+    report.update(integrated_rows)
+    report = report.finalize(files_processed=3)
+
+    has_xg = integrated_rows['xG1'] > 0
+    years = pd.to_datetime(integrated_rows['Date'], format='%d.%m.%Y').dt.year
+
+    assert report.total_matches == len(integrated_rows)
+    assert report.total_columns == len(integrated_rows.columns)
+    assert report.matches_with_xg == int(has_xg.sum())
+    assert report.complete_records == len(integrated_rows.dropna())
+    assert report.missing_cells == int(integrated_rows.isna().sum().sum())
+    assert report.year_totals == years.value_counts().to_dict()
+    assert report.year_with_xg == years[has_xg].value_counts().to_dict()
+    assert report.average_goals == pytest.approx((integrated_rows['G1'] + integrated_rows['G2']).mean())
+    assert report.home_win_rate == pytest.approx((integrated_rows['R'] == 'H').mean() * 100)
+    assert report.draw_rate + report.home_win_rate + report.away_win_rate == pytest.approx(100)
+
+    coverage = report.year_coverage()
+    assert coverage['Total'].sum() == len(integrated_rows)
+    assert coverage['WithXG'].sum() == report.matches_with_xg
+
+
+def test_partitions_add_up_to_the_whole(integrated_rows):
+    whole = ReportAccumulator()
+    whole.update(integrated_rows)
+
+    parts = ReportAccumulator()
+    for part in np.array_split(np.arange(len(integrated_rows)), 4):
+        parts.update(integrated_rows.iloc[part])
+
+    whole, parts = whole.finalize(1), parts.finalize(1)
+    assert parts.total_xg == pytest.approx(whole.total_xg)
+    parts.total_xg = whole.total_xg
+    assert parts == whole
+
+
+def test_empty_dataset_reports_zero_rates():
+    report = ReportAccumulator()
+    report.update(pd.DataFrame(columns=['Date', 'G1', 'G2', 'R', 'xG1', 'xG2']))
+    report = report.finalize(0)
+
+    assert report.total_matches == 0
+    assert report.coverage_rate == 0.0
+    assert report.average_goals == 0.0
@@ -0,0 +1,128 @@
+"""
+Tests for the Understat match search: its game index and the search modes.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import Found_Missing_Mathes
+from Found_Missing_Mathes import UnderstatGameIndex, UnderstatMatchFinder
+
+
+@pytest.fixture
+def search_inputs(finder_template):
+    finder = UnderstatMatchFinder()
+    template = finder.load_missing_template(finder_template['template_path'])
+    understat_data = finder.load_understat_data(finder_template['understat_file'])
+    return template, understat_data
+
+
+def test_game_index_leaves_out_rows_without_team(search_inputs):
+    template, understat_data = search_inputs
+    with_missing_team = understat_data.copy()
+    with_missing_team.loc[with_missing_team.index[5], 'team'] = np.nan
+
+    index = UnderstatGameIndex(with_missing_team)
+
+    assert index.dropped_rows == 1
+    assert len(index) == len(understat_data) - 1
+    assert all(isinstance(name, str) for name in index.vocabulary)
+    assert (index.team_code_array >= 0).all()
+
+    without_row = understat_data.drop(index=understat_data.index[5])
+    expected = UnderstatMatchFinder().search_matches_in_understat(template, without_row)
+    for search in ('search_matches_in_understat', 'search_matches_batch'):
+        found = getattr(UnderstatMatchFinder(), search)(template, with_missing_team)
+        pd.testing.assert_frame_equal(found, expected)
+
+
+def test_rows_without_team_names_have_no_candidates(search_inputs):
+    template, understat_data = search_inputs
+    expected = UnderstatMatchFinder().search_matches_in_understat(template, understat_data)
+    blanked = expected['Template_Index'].iloc[:2].tolist()
+
+    with_missing_teams = template.copy()
+    with_missing_teams.loc[with_missing_teams['Index'] == blanked[0], 'AwayTeam'] = np.nan
+    with_missing_teams.loc[with_missing_teams['Index'] == blanked[1], 'HomeTeam'] = np.nan
+    expected = expected[~expected['Template_Index'].isin(blanked)].reset_index(drop=True)
+
+    for search in ('search_matches_in_understat', 'search_matches_batch'):
+        found = getattr(UnderstatMatchFinder(), search)(with_missing_teams, understat_data)
+        pd.testing.assert_frame_equal(found.reset_index(drop=True), expected)
+
+
+def test_worker_shard_search_matches_batch_search(search_inputs, tmp_path, monkeypatch):
+    template, understat_data = search_inputs
+    finder = UnderstatMatchFinder()
+    expected = finder.search_matches_batch(template, understat_data)
+
+    index_folder = str(tmp_path / 'index')
+    UnderstatGameIndex(understat_data).write(index_folder)
+    monkeypatch.setattr(Found_Missing_Mathes, '_worker_indexes', {})
+    Found_Missing_Mathes._init_search_worker(finder.team_mapping, finder.match_confidence_threshold)
+
+    for batch in (True, False):
+        found = Found_Missing_Mathes._search_shard((index_folder, template, batch))
+        pd.testing.assert_frame_equal(found, expected)
+
+
+def test_template_records_the_league(search_inputs):
+    template, _ = search_inputs
+    assert (template['League'] == 'EPL').all()
+
+
+@pytest.mark.parametrize('shard_by', ['date', 'league'])
+def test_parallel_search_matches_single_process_search(search_inputs, shard_by):
+    template, understat_data = search_inputs
+    expected = UnderstatMatchFinder().search_matches_batch(template, understat_data)
+
+    found = UnderstatMatchFinder().search_matches_parallel(template, understat_data, workers=2, shard_by=shard_by)
+
+    pd.testing.assert_frame_equal(found, expected)
+
+
+def test_league_sharding_without_league_column_shards_by_date(search_inputs, capsys):
+    template, understat_data = search_inputs
+    template = template.drop(columns='League')
+    expected = UnderstatMatchFinder().search_matches_batch(template, understat_data)
+
+    found = UnderstatMatchFinder().search_matches_parallel(template, understat_data, workers=2, shard_by='league')
+
+    assert 'sharding by date instead' in capsys.readouterr().out
+    pd.testing.assert_frame_equal(found, expected)
+
+
+def test_league_sharding_with_missing_league_values(search_inputs, capsys):
+    template, understat_data = search_inputs
+    template = template.copy()
+    template.loc[template.index[::12], 'League'] = np.nan
+    expected = UnderstatMatchFinder().search_matches_batch(template, understat_data)
+
+    found = UnderstatMatchFinder().search_matches_parallel(template, understat_data, workers=2, shard_by='league')
+
+    assert 'template rows have no League' in capsys.readouterr().out
+    assert expected['Template_Index'].isin(template.loc[template['League'].isna(), 'Index']).any()
+    pd.testing.assert_frame_equal(found, expected)
+
+
+@pytest.mark.parametrize('threshold', [0.7, 0.0])
+def test_batch_search_matches_row_search(search_inputs, threshold):
+    template, understat_data = search_inputs
+    results = {}
+    for search in ('search_matches_in_understat', 'search_matches_batch'):
+        finder = UnderstatMatchFinder()
+        finder.match_confidence_threshold = threshold
+        results[search] = getattr(finder, search)(template, understat_data)
+
+    assert len(results['search_matches_in_understat'])
+    pd.testing.assert_frame_equal(results['search_matches_batch'], results['search_matches_in_understat'])
+
+
+def test_parallel_batch_search_matches_row_search(search_inputs):
+    template, understat_data = search_inputs
+    expected = UnderstatMatchFinder().search_matches_in_understat(template, understat_data)
+
+    found = UnderstatMatchFinder().search_matches_parallel(template, understat_data, workers=2, batch=True)
+
+    pd.testing.assert_frame_equal(found, expected)
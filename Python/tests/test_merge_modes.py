@@ -0,0 +1,155 @@
+"""
+Every merge mode and loader setting against the default merge.
+
+The default FootballDataMerger run (batch lookup, sequential full reads, one
+CSV) is the reference; the other modes must write the same bytes, or the
+same rows where their output is laid out differently.
+"""
+
+import glob
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from Benchmark_Suite import SyntheticLeagueGenerator
+from Data_Merger import FootballDataMerger
+from Integrated_Dataset import IntegratedDataset
+
+
+def _merge(inputs, output_path, settings=None, **merge_options):
+    merger = FootballDataMerger(**(settings or {}))
+    merger.team_index.add_aliases(inputs['aliases'])
+    merger.merge_all_data(inputs['odds_folder'], inputs['understat_file'], str(output_path), **merge_options)
+    return merger
+
+
+def _read_bytes(path):
+    with open(path, 'rb') as handle:
+        return handle.read()
+
+
+@pytest.fixture(scope='module')
+def default_output(synthetic_league, tmp_path_factory):
+    output_path = tmp_path_factory.mktemp('default_merge') / 'integrated.csv'
+    _merge(synthetic_league, output_path)
+    return output_path
+
+
+@pytest.mark.parametrize('settings', [
+    {'projected_reads': True},
+    {'load_workers': 3},
+    {'projected_reads': True, 'load_workers': 3},
+    {'track_memory': True}
+], ids=['projected', 'load_workers', 'projected_load_workers', 'track_memory'])
+def test_loader_settings_write_the_default_output(synthetic_league, default_output, tmp_path, settings):
+    output_path = tmp_path / 'integrated.csv'
+    _merge(synthetic_league, output_path, settings)
+
+    assert _read_bytes(output_path) == _read_bytes(default_output)
+
+
+def test_streaming_writes_the_default_output(synthetic_league, default_output, tmp_path):
+    output_path = tmp_path / 'integrated.csv'
+    merger = _merge(synthetic_league, output_path, streaming=True)
+
+    assert _read_bytes(output_path) == _read_bytes(default_output)
+
+    # Partition sums of xG may differ from the one-pass sum in the last bits
+    reference = _merge(synthetic_league, tmp_path / 'default.csv').integration_report
+    streamed = merger.integration_report
+    assert streamed.total_xg == pytest.approx(reference.total_xg)
+    streamed.total_xg = reference.total_xg
+    assert streamed == reference
+
+
+def test_cached_inputs_write_the_default_output(synthetic_league, default_output, tmp_path):
+    settings = {'cache_dir': str(tmp_path / 'cache')}
+
+    cold = _merge(synthetic_league, tmp_path / 'cold.csv', settings)
+    warm = _merge(synthetic_league, tmp_path / 'warm.csv', settings)
+
+    assert cold.cache.hits == 0
+    assert warm.cache.hits > 0
+    assert _read_bytes(tmp_path / 'cold.csv') == _read_bytes(default_output)
+    assert _read_bytes(tmp_path / 'warm.csv') == _read_bytes(default_output)
+
+
+def test_incremental_merge_matches_a_full_merge_after_changes(synthetic_league, default_output, tmp_path):
+    inputs = dict(synthetic_league, odds_folder=str(tmp_path / 'odds'))
+    shutil.copytree(synthetic_league['odds_folder'], inputs['odds_folder'])
+    output_path = tmp_path / 'incremental.csv'
+
+    _merge(inputs, output_path, incremental=True)
+    assert _read_bytes(output_path) == _read_bytes(default_output)
+
+    # Drop the last fixtures of one season and remove another season
+    season_files = sorted(glob.glob(os.path.join(inputs['odds_folder'], '*.csv')))
+    with open(season_files[1]) as handle:
+        lines = handle.readlines()
+    with open(season_files[1], 'w') as handle:
+        handle.writelines(lines[:-5])
+    os.remove(season_files[-1])
+
+    merger = _merge(inputs, output_path, incremental=True)
+    _merge(inputs, tmp_path / 'full.csv')
+
+    assert merger.merge_statistics['rebuilt_partitions'] < len(season_files)
+    assert _read_bytes(output_path) == _read_bytes(tmp_path / 'full.csv')
+
+
+def test_incremental_merge_returns_the_rows_it_wrote(synthetic_league, tmp_path):
+    output_path = str(tmp_path / 'incremental.csv')
+
+    # The first run rebuilds every partition, the second copies them all as text
+    for _ in range(2):
+        merger = FootballDataMerger()
+        merger.team_index.add_aliases(synthetic_league['aliases'])
+        result = merger.merge_all_data(synthetic_league['odds_folder'], synthetic_league['understat_file'],
+                                       output_path, incremental=True)
+
+        pd.testing.assert_frame_equal(result, pd.read_csv(output_path))
+    assert merger.merge_statistics['rebuilt_partitions'] == 0
+
+
+def test_columnar_output_holds_the_default_rows(synthetic_league, default_output, tmp_path):
+    output_path = tmp_path / 'integrated.csv'
+    _merge(synthetic_league, output_path, output_format='both')
+
+    assert _read_bytes(output_path) == _read_bytes(default_output)
+
+    dataset = IntegratedDataset.open(str(output_path))
+    typed_rows = IntegratedDataset.as_csv_layout(dataset.to_frame())
+    csv_rows = pd.read_csv(default_output)
+    pd.testing.assert_frame_equal(typed_rows, csv_rows, check_dtype=False)
+
+
+def test_multi_league_partitions_hold_the_default_rows(synthetic_league, default_output, tmp_path):
+    merger = FootballDataMerger()
+    merger.team_index.add_aliases(synthetic_league['aliases'])
+    summary = merger.merge_all_leagues(synthetic_league['odds_folder'], synthetic_league['understat_file'],
+                                       str(tmp_path / 'leagues'), leagues=['EPL'])
+
+    partitions = pd.concat([pd.read_csv(path) for path in summary['path']], ignore_index=True)
+    partitions = partitions.sort_values('Index').reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(partitions, pd.read_csv(default_output))
+
+
+def test_parallel_league_merge_matches_serial_merge(tmp_path):
+    generator = SyntheticLeagueGenerator(seed=3, leagues=2, seasons=2, teams_per_league=6,
+                                         league_names=['EPL', 'La_liga'])
+    paths = generator.generate(str(tmp_path / 'inputs'))
+
+    outputs = {}
+    for max_workers in (1, 2):
+        merger = FootballDataMerger()
+        merger.team_index.add_aliases(generator.team_aliases())
+        output_folder = tmp_path / f"workers_{max_workers}"
+        summary = merger.merge_all_leagues(paths['odds_folder'], paths['understat_file'],
+                                           str(output_folder), max_workers=max_workers)
+        outputs[max_workers] = {os.path.relpath(path, output_folder): _read_bytes(path) for path in summary['path']}
+
+    assert set(league for league, _ in (name.split(os.sep) for name in outputs[1])) == {'EPL', 'La_liga'}
+    assert outputs[2] == outputs[1]
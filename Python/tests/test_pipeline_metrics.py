@@ -0,0 +1,93 @@
+"""
+Tests for per-stage pipeline metrics and profiling.
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from Pipeline_Metrics import PipelineMetrics
+
+
+def test_nested_stages_record_parents_rows_and_details():
+    metrics = PipelineMetrics()
+
+    with metrics.stage('merge_odds_files') as outer:
+        with metrics.stage('read_file', rows_in=10, file='14-15.csv') as inner:
+            inner['rows_out'] = 8
+        outer['rows_out'] = 8
+
+    records = {record['stage']: record for record in metrics.records}
+    assert records['read_file']['parent'] == 'merge_odds_files'
+    assert records['read_file']['file'] == '14-15.csv'
+    assert (records['read_file']['rows_in'], records['read_file']['rows_out']) == (10, 8)
+    assert records['merge_odds_files']['parent'] is None
+    assert records['merge_odds_files']['duration_s'] >= records['read_file']['duration_s']
+    assert metrics.to_frame()['stage'].tolist() == ['read_file', 'merge_odds_files']
+
+
+def test_worker_thread_stages_attach_to_the_owner_stage():
+    metrics = PipelineMetrics(track_memory=True)
+    metrics.start_memory_tracking()
+
+    def load(name):
+        with metrics.stage('load_file', file=name):
+            return name
+
+    try:
+        with metrics.stage('merge_odds_files'):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                list(executor.map(load, ['a.csv', 'b.csv', 'c.csv']))
+    finally:
+        metrics.stop_memory_tracking()
+
+    loads = [record for record in metrics.records if record['stage'] == 'load_file']
+    assert len(loads) == 3
+    assert {record['parent'] for record in loads} == {'merge_odds_files'}
+    # Peak memory is only attributed on the owner thread
+    assert all(record['peak_memory_bytes'] is None for record in loads)
+    assert metrics.records[-1]['peak_memory_bytes'] is not None
+
+
+def test_stage_is_recorded_when_it_fails():
+    metrics = PipelineMetrics()
+
+    with pytest.raises(ValueError):
+        with metrics.stage('parse_dates'):
+            raise ValueError("bad date")
+
+    assert metrics.records[0]['stage'] == 'parse_dates'
+    assert metrics.records[0]['duration_s'] is not None
+
+
+def test_records_are_appended_as_json_lines(tmp_path):
+    output_path = str(tmp_path / 'metrics.jsonl')
+    for _ in range(2):
+        metrics = PipelineMetrics()
+        with metrics.stage('save_output'):
+            pass
+        metrics.write_jsonl(output_path)
+
+    with open(output_path, encoding='utf-8') as handle:
+        lines = [json.loads(line) for line in handle]
+    assert [line['stage'] for line in lines] == ['save_output', 'save_output']
+    assert lines[0]['run_id'] != lines[1]['run_id']
+
+
+def test_profiles_are_written_for_selected_stages(tmp_path):
+    metrics = PipelineMetrics(profile_dir=str(tmp_path), profile_stages=['parse_dates'], profile_mode='cprofile')
+
+    with metrics.stage('parse_dates'):
+        sorted(range(1000))
+    with metrics.stage('save_output'):
+        pass
+
+    run_folder = metrics.write_profiles()
+    assert sorted(os.listdir(run_folder)) == ['parse_dates.prof', 'parse_dates_profile.txt']
+
+
+def test_unknown_profile_mode_is_rejected():
+    with pytest.raises(ValueError):
+        PipelineMetrics(profile_mode='perf')
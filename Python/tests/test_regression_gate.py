@@ -0,0 +1,72 @@
+"""
+Tests for the regression gate's comparisons and its golden check.
+"""
+
+import json
+import os
+import shutil
+
+from Regression_Gate import PerformanceRegressionGate
+
+GOLDEN_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             'benchmark_baselines', 'golden')
+
+
+def _gate(tmp_path, **settings):
+    return PerformanceRegressionGate(str(tmp_path / 'baselines'), str(tmp_path / 'work'), **settings)
+
+
+def _stage(duration_s):
+    return {'duration_s': duration_s, 'peak_memory_bytes': None, 'rows_out': None}
+
+
+def test_slower_machine_scales_the_baseline_time(tmp_path):
+    gate = _gate(tmp_path, time_tolerance=0.5)
+
+    # 2x slower than the baseline, on a machine that is 2x slower overall
+    record = gate._compare_stage('tool.stage', _stage(1.0), _stage(2.0), speed_factor=2.0)
+    assert record['status'] == 'ok'
+    assert record['baseline_s'] == 2.0
+
+    record = gate._compare_stage('tool.stage', _stage(1.0), _stage(2.0))
+    assert record['status'] == 'regressed'
+
+
+def test_time_tolerance_is_configurable(tmp_path):
+    record = _gate(tmp_path, time_tolerance=1.5)._compare_stage('tool.stage', _stage(1.0), _stage(2.0))
+    assert record['status'] == 'ok'
+
+
+def test_committed_golden_output_is_reproduced(tmp_path):
+    assert _gate(tmp_path).check_golden(GOLDEN_FOLDER) is True
+
+
+def test_golden_check_reports_changed_output(tmp_path):
+    golden_copy = tmp_path / 'golden'
+    shutil.copytree(GOLDEN_FOLDER, golden_copy)
+    output_path = golden_copy / PerformanceRegressionGate.GOLDEN_OUTPUT_FILE
+    output_path.write_text(output_path.read_text().replace('Ashford', 'Ashfort', 1))
+
+    assert _gate(tmp_path).check_golden(str(golden_copy)) is False
+
+
+def test_golden_check_is_skipped_without_inputs(tmp_path):
+    assert _gate(tmp_path).check_golden(str(tmp_path / 'missing')) is None
+
+
+def test_gate_passes_its_own_baseline_and_catches_changed_output(tmp_path):
+    gate = _gate(tmp_path, sizes=[120], repeats=1, finder_rows=20, time_tolerance=10.0)
+    gate.benchmark.generator_settings = {'seasons': 2, 'teams_per_league': 6}
+    baseline_path, = gate.update_baselines()
+
+    assert gate.check_size(120)['passed']
+
+    with open(baseline_path, encoding='utf-8') as handle:
+        baseline = json.load(handle)
+    baseline['outputs']['found_understat_matches.csv'] = '0' * 64
+    with open(baseline_path, 'w', encoding='utf-8') as handle:
+        json.dump(baseline, handle)
+
+    result = gate.check_size(120)
+    assert not result['passed']
+    assert result['output_mismatches'] == ['found_understat_matches.csv']
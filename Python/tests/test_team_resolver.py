@@ -0,0 +1,103 @@
+"""
+Tests for the shared team name index and the away team similarity matrix,
+against the scan-every-name matching they replace.
+"""
+
+import glob
+import os
+import re
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from Team_Resolver import TeamNameIndex, TeamSimilarityMatrix
+
+DATA_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'Data')
+
+
+@pytest.fixture(scope='module')
+def shipped_names():
+    """Odds team names and Understat EPL team names from the shipped data."""
+    odds_files = glob.glob(os.path.join(DATA_FOLDER, 'Odds EPL 2014-20', '*.csv'))
+    odds_names = pd.concat([pd.read_csv(path, usecols=['HomeTeam', 'AwayTeam']) for path in odds_files])
+    odds_names = sorted(set(odds_names['HomeTeam'].dropna()) | set(odds_names['AwayTeam'].dropna()))
+
+    aggregates = pd.read_csv(os.path.join(DATA_FOLDER, 'understat 2014_20', 'understat.com.csv'))
+    understat_names = aggregates.loc[aggregates['Unnamed: 0'] == 'EPL', 'team'].unique().tolist()
+    return odds_names, understat_names
+
+
+def _reference_similarity(str1, str2):
+    return SequenceMatcher(None, str1.lower(), str2.lower()).ratio()
+
+
+def _reference_normalize(team_name):
+    normalized = re.sub(r'\b(FC|AFC|United|City|Town)\b', '', team_name, flags=re.IGNORECASE).strip()
+    variations = {'Man Utd': 'Manchester United', 'Man City': 'Manchester City', 'Spurs': 'Tottenham',
+                  'Arsenal FC': 'Arsenal', 'Chelsea FC': 'Chelsea'}
+    return variations.get(normalized, normalized)
+
+
+def _reference_resolve(team_mapping, target_team, available_teams):
+    """The original per-name scan of the match finder."""
+    normalized_target = _reference_normalize(target_team)
+    best_match, best_score = "", 0.0
+    reverse_mapping = {v: k for k, v in team_mapping.items()}
+
+    for team in available_teams:
+        normalized_team = _reference_normalize(team)
+        if target_team in reverse_mapping and _reference_similarity(reverse_mapping[target_team], team) > 0.8:
+            return team, 1.0
+
+        score = _reference_similarity(normalized_target, normalized_team)
+        if (normalized_target.lower() in normalized_team.lower()
+                or normalized_team.lower() in normalized_target.lower()):
+            score += 0.2
+        if score > best_score:
+            best_match, best_score = team, score
+
+    return best_match, min(best_score, 1.0)
+
+
+def test_resolve_matches_the_name_scan(shipped_names):
+    odds_names, understat_names = shipped_names
+    index = TeamNameIndex().set_vocabulary(understat_names)
+
+    for target in odds_names + ['Wolverhampton', 'Sheffield Utd', 'Nowhere Rovers']:
+        assert index.resolve(target) == _reference_resolve(index.team_mapping, target, understat_names), target
+
+
+def test_added_aliases_resolve_with_full_confidence():
+    index = TeamNameIndex()
+    index.add_aliases({'Ashford United': 'Ashford'})
+
+    assert index.set_vocabulary(['Bramley', 'Ashford United']).resolve('Ashford') == ('Ashford United', 1.0)
+    assert index.map_names(pd.Series(['Ashford United', 'Bramley'])).tolist() == ['Ashford', 'Bramley']
+
+
+def test_similarity_matrix_scores_equal_sequence_matcher(shipped_names):
+    odds_names, understat_names = shipped_names
+    matrix = TeamSimilarityMatrix(odds_names, understat_names)
+
+    odds_codes, understat_codes = matrix.codes(odds_names[:5], understat_names[:5])
+    np.testing.assert_array_equal(
+        matrix.lookup(odds_codes, understat_codes),
+        [_reference_similarity(understat, odds) for odds, understat in zip(odds_names[:5], understat_names[:5])]
+    )
+
+    full = matrix.fill().matrix
+    for row, odds in enumerate(odds_names):
+        for column, understat in enumerate(understat_names):
+            assert full[row, column] == _reference_similarity(understat, odds)
+    assert (matrix.bound_matrix() >= full).all()
+    assert matrix.score('Not a team', understat_names[0]) == _reference_similarity(understat_names[0], 'Not a team')
+
+
+def test_similarity_matrix_rejects_unknown_codes():
+    matrix = TeamSimilarityMatrix(['Arsenal'], ['Arsenal'])
+    odds_codes, understat_codes = matrix.codes(['Chelsea'], ['Arsenal'])
+
+    with pytest.raises(KeyError):
+        matrix.lookup(odds_codes, understat_codes)